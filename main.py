@@ -110,15 +110,18 @@ class MainWindow(QtWidgets.QMainWindow):
         if config is not None:
             self.config = config
         else:
-            self.config = Config()
+            self.config = Config.instance()
 
         self.config.ensure_directories()
-        self.db = DatabaseManager(self.config.get("database_path"))
+        self.db = DatabaseManager(
+            self.config.get("database_path"),
+            journal_mode=self.config.get("db_journal_mode", "DELETE"),
+        )
         self.config.load_from_database(self.db)
         DebugManager.sync_from_config(self.config)
 
         self.ingestion = IngestionCore(self.db, self.config.get_all())
-        self.processor_manager = ProcessorManager(self.config.get_all())
+        self.processor_manager = ProcessorManager(self.config.get_all_readonly())
         self.nuke_bridge = NukeBridge(mock_mode=self.config.get("nuke_mock_mode"))
         self.nuke_integration = NukeIntegration(
             self.nuke_bridge, self.db,
@@ -979,8 +982,9 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         lists = self.db.get_lists_by_stack(stack_id)
         all_elements = []
+        by_list = self.db.get_elements_by_lists([lst["list_id"] for lst in lists])
         for lst in lists:
-            all_elements.extend(self.db.get_elements_by_list(lst["list_id"]))
+            all_elements.extend(by_list[lst["list_id"]])
         self.media_display.current_list_id = None
         self.media_display.current_elements = all_elements
         self.media_display.current_tag_filter = []
@@ -1405,7 +1409,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.statusBar().showMessage("Toolset registered successfully")
 
     def on_settings_changed(self):
-        self.processor_manager = ProcessorManager(self.config.get_all())
+        self.processor_manager = ProcessorManager(self.config.get_all_readonly())
         self.statusBar().showMessage("Settings updated")
 
         # Final-review Finding 2: a label/synonym/smart-collection edit in
@@ -1463,6 +1467,7 @@ class MainWindow(QtWidgets.QMainWindow):
             shutdown_preview_queue()
         if _API_SERVER_AVAILABLE:
             shutdown_api_server()
+        self.db.close()
         super(MainWindow, self).closeEvent(event)
 
     def showEvent(self, event):
@@ -1523,7 +1528,7 @@ def main():
         pass
 
     app = QtWidgets.QApplication(sys.argv)
-    config = Config()
+    config = Config.instance()
     DebugManager.sync_from_config(config)
     config.ensure_directories()
 
@@ -6,6 +6,8 @@ Nuke-specific panel launcher for StaX asset management system
 
 import os
 import sys
+import logging
+import traceback
 
 import dependency_bootstrap
 
@@ -72,6 +74,11 @@ if current_dir not in sys.path:
         logger.info("Added to sys.path: {}".format(current_dir))
     print("[nuke_launcher]   [OK] Added: {}".format(current_dir))
 
+# Resolved once at import so panel construction never re-joins/abspaths them.
+STAX_ROOT = os.path.abspath(current_dir)
+_ICON_PATH = os.path.join(STAX_ROOT, 'resources', 'logo.png')
+_STYLESHEET_PATH = os.path.join(STAX_ROOT, 'resources', 'style.qss')
+
 ffpyplayer_pkg = os.path.join(current_dir, 'dependencies', 'ffpyplayer')
 if os.path.isdir(ffpyplayer_pkg):
     print("[nuke_launcher]   [OK] ffpyplayer directory detected: {}".format(ffpyplayer_pkg))
@@ -118,6 +125,17 @@ except Exception as e:
         logger.exception("Failed to import IngestionCore")
     raise
 
+try:
+    from src.ingest_worker import IngestWorker
+    if logger:
+        logger.info("Imported: src.ingest_worker.IngestWorker")
+    print("[nuke_launcher]   [OK] IngestWorker")
+except Exception as e:
+    print("[nuke_launcher]   [ERROR] CRITICAL: Failed to import IngestWorker: {}".format(e))
+    if logger:
+        logger.exception("Failed to import IngestWorker")
+    raise
+
 try:
     from src.nuke_bridge import NukeBridge, NukeIntegration
     if logger:
@@ -206,6 +224,10 @@ if logger:
 # commands must go through get_stax_panel() instead (issue H5).
 _STAX_PANEL_INSTANCE = None
 
+# Nuke pane returned by the first registerWidgetAsPanel(); later opens just
+# re-add it instead of walking Nuke's panel registry again.
+_NUKE_PANEL = None
+
 
 class StaXPanel(QtWidgets.QWidget):
     """
@@ -235,7 +257,7 @@ class StaXPanel(QtWidgets.QWidget):
         print("[StaXPanel.__init__] Initializing core components...")
         
         try:
-            self.config = Config()
+            self.config = Config.instance()
             print("[StaXPanel.__init__]   [OK] Config initialized")
             if logger:
                 logger.info("Config initialized")
@@ -270,7 +292,8 @@ class StaXPanel(QtWidgets.QWidget):
         try:
             db_path = self.config.get('database_path')
             print("[StaXPanel.__init__] Database path: {}".format(db_path))
-            self.db = DatabaseManager(db_path)
+            self.db = DatabaseManager(
+                db_path, journal_mode=self.config.get('db_journal_mode', 'DELETE'))
             print("[StaXPanel.__init__]   [OK] DatabaseManager initialized")
             if logger:
                 logger.info("DatabaseManager initialized with path: {}".format(db_path))
@@ -312,7 +335,7 @@ class StaXPanel(QtWidgets.QWidget):
             raise
         
         try:
-            self.processor_manager = ProcessorManager(self.config.get_all())
+            self.processor_manager = ProcessorManager(self.config.get_all_readonly())
             print("[StaXPanel.__init__]   [OK] ProcessorManager initialized")
             if logger:
                 logger.info("ProcessorManager initialized")
@@ -342,6 +365,9 @@ class StaXPanel(QtWidgets.QWidget):
         # User authentication
         self.current_user = None
         self.is_admin = False
+
+        # Coalesces back-to-back gallery refresh requests (_request_refresh)
+        self._refresh_pending = False
         print("[StaXPanel.__init__]   [OK] User authentication variables set")
         
         # Set window properties
@@ -359,7 +385,7 @@ class StaXPanel(QtWidgets.QWidget):
         
         # Set application icon
         try:
-            icon_path = os.path.join(os.path.dirname(__file__), 'resources', 'logo.png')
+            icon_path = _ICON_PATH
             if os.path.exists(icon_path):
                 self.setWindowIcon(QtGui.QIcon(icon_path))
                 print("[StaXPanel.__init__]   [OK] Window icon set")
@@ -661,8 +687,9 @@ class StaXPanel(QtWidgets.QWidget):
         
         lists = self.db.get_lists_by_stack(stack_id)
         all_elements = []
+        by_list = self.db.get_elements_by_lists([lst['list_id'] for lst in lists])
         for lst in lists:
-            all_elements.extend(self.db.get_elements_by_list(lst['list_id']))
+            all_elements.extend(by_list[lst['list_id']])
         
         self.media_display.current_list_id = None
         self.media_display.current_elements = all_elements
@@ -775,58 +802,84 @@ class StaXPanel(QtWidgets.QWidget):
         if not files:
             return
         
-        # Ask for target list
-        dialog = SelectListDialog(self.db, self)
+        # Ask for target list (dialog is reused; its tree is refreshed per open)
+        dialog = getattr(self, '_select_list_dialog', None)
+        if dialog is None:
+            dialog = self._select_list_dialog = SelectListDialog(self.db, self)
+        else:
+            dialog.load_lists()
         if dialog.exec_():
             target_list_id = dialog.get_selected_list()
             if target_list_id:
                 self.perform_ingestion(files, target_list_id)
     
     def perform_ingestion(self, files, target_list_id):
-        """Perform ingestion of files."""
-        progress = QtWidgets.QProgressDialog("Ingesting files...", "Cancel", 0, len(files), self)
+        """Ingest files on a background IngestWorker so Nuke's UI stays live."""
+        jobs = [(f, target_list_id) for f in files]
+        progress = QtWidgets.QProgressDialog("Ingesting files...", "Cancel", 0, len(jobs), self)
         progress.setWindowModality(QtCore.Qt.WindowModal)
-        
-        success_count = 0
-        error_count = 0
-        
-        for i, filepath in enumerate(files):
-            if progress.wasCanceled():
-                break
-            
-            progress.setValue(i)
-            progress.setLabelText("Ingesting: {}".format(os.path.basename(filepath)))
-            
-            result = self.ingestion.ingest_file(
-                filepath,
-                target_list_id,
-                copy_policy=self.config.get('default_copy_policy')
-            )
-            
-            if result['success']:
-                success_count += 1
-            else:
-                error_count += 1
-        
-        progress.setValue(len(files))
-        
-        # Show result
-        QtWidgets.QMessageBox.information(
-            self,
-            "Ingestion Complete",
-            "Ingested {} files successfully.\n{} errors.".format(success_count, error_count)
+        progress.setMinimumDuration(0)
+
+        # One DB transaction per batch instead of one commit per file; copies
+        # and 3D conversions run before each batch's transaction opens.
+        worker = IngestWorker(
+            self.db, self.config.get_all(), jobs,
+            copy_policy=self.config.get('default_copy_policy'),
+            batch_size=100,
         )
-        
+        self._ingest_worker = worker            # keep a reference alive
+
+        worker.progress.connect(
+            lambda done, total, label: self._on_ingest_progress(progress, done, total, label)
+        )
+        progress.canceled.connect(worker.cancel)
+        worker.ingest_finished.connect(
+            lambda s, k, e: self._on_perform_ingestion_done(progress, s, k, e)
+        )
+        worker.ingest_failed.connect(
+            lambda msg: self._on_perform_ingestion_failed(progress, msg)
+        )
+
+        worker.start()
+        progress.exec_()
+
+    # Relabelling the dialog for every file repaints its QLabel; every Nth
+    # file (plus the first and last) is enough to show where the job is.
+    _INGEST_LABEL_EVERY = 25
+
+    def _on_ingest_progress(self, progress, done, total, label):
+        progress.setValue(done - 1)
+        if done == 1 or done == total or done % self._INGEST_LABEL_EVERY == 0:
+            progress.setLabelText("Ingesting: {}".format(label))
+
+    def _on_perform_ingestion_done(self, progress, success, skipped, errors):
+        progress.reset()
+        msg = "Ingested {} file(s) successfully.".format(success)
+        if skipped:
+            msg += "\n{} skipped (duplicates).".format(skipped)
+        if errors:
+            msg += "\n{} error(s).".format(errors)
+        QtWidgets.QMessageBox.information(self, "Ingestion Complete", msg)
+
         # Refresh current view
-        if self.media_display.current_list_id:
-            self.media_display.load_elements(self.media_display.current_list_id)
+        self._request_refresh()
+
+    def _on_perform_ingestion_failed(self, progress, message):
+        progress.reset()
+        QtWidgets.QMessageBox.critical(self, "Ingestion Error", message)
     
     def ingest_library(self):
         """Open Library Ingest dialog to bulk-ingest folder structures."""
-        dialog = IngestLibraryDialog(self.db, self.ingestion, self.config, self)
+        dialog = getattr(self, '_ingest_library_dialog', None)
+        if dialog is None:
+            dialog = self._ingest_library_dialog = IngestLibraryDialog(
+                self.db, self.ingestion, self.config, self)
+        else:
+            dialog.reset()
         if dialog.exec_():
             # Refresh stacks/lists after library ingestion
             self.stacks_panel.load_data()
+            self._request_refresh()
     
     def register_toolset(self):
         """Open Register Toolset dialog to save selected Nuke nodes as a toolset."""
@@ -837,26 +890,43 @@ class StaXPanel(QtWidgets.QWidget):
         dialog = RegisterToolsetDialog(self.db, self.nuke_integration, self.config, self)
         if dialog.exec_():
             # Refresh media display to show new toolset
-            if hasattr(self.media_display, 'current_list_id') and self.media_display.current_list_id:
-                self.media_display.load_elements(self.media_display.current_list_id)
+            self._request_refresh()
             self.show_status("Toolset registered successfully")
+
+    # Window in which successive refresh requests collapse into one reload.
+    _REFRESH_DEBOUNCE_MS = 150
+
+    def _request_refresh(self):
+        """Schedule a single reload of the current list's elements."""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        QtCore.QTimer.singleShot(self._REFRESH_DEBOUNCE_MS, self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_pending = False
+        list_id = getattr(self.media_display, 'current_list_id', None)
+        if list_id:
+            self.media_display.load_elements(list_id)
     
     def show_history(self):
         """Show history dialog."""
-        dialog = QtWidgets.QDialog(self)
-        dialog.setWindowTitle("Ingestion History")
-        dialog.resize(800, 500)
-        
-        dialog_layout = QtWidgets.QVBoxLayout(dialog)
-        history_panel = HistoryPanel(self.db)
-        dialog_layout.addWidget(history_panel)
-        
-        # Close button
-        close_btn = QtWidgets.QPushButton("Close")
-        close_btn.clicked.connect(dialog.accept)
-        dialog_layout.addWidget(close_btn)
+        dialog = getattr(self, '_history_dialog', None)
+        if dialog is None:
+            dialog = self._history_dialog = QtWidgets.QDialog(self)
+            dialog.setWindowTitle("Ingestion History")
+            dialog.resize(800, 500)
+            
+            dialog_layout = QtWidgets.QVBoxLayout(dialog)
+            self._history_panel = HistoryPanel(self.db)
+            dialog_layout.addWidget(self._history_panel)
+            
+            # Close button
+            close_btn = QtWidgets.QPushButton("Close")
+            close_btn.clicked.connect(dialog.accept)
+            dialog_layout.addWidget(close_btn)
         
-        history_panel.load_history()
+        self._history_panel.load_history()
         dialog.exec_()
     
     def show_settings(self):
@@ -876,7 +946,11 @@ class StaXPanel(QtWidgets.QWidget):
                 )
                 return
         
+        # Built fresh on every open, unlike the other panel dialogs:
+        # SettingsPanel reads config only in __init__, so a reused one would
+        # keep unsaved edits from the last open and miss changes made since.
         dialog = QtWidgets.QDialog(self)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
         dialog.setWindowTitle("Settings")
         dialog.resize(900, 600)
         
@@ -898,7 +972,7 @@ class StaXPanel(QtWidgets.QWidget):
     def on_settings_changed(self):
         """Handle settings change."""
         # Reload processor manager
-        self.processor_manager = ProcessorManager(self.config.get_all())
+        self.processor_manager = ProcessorManager(self.config.get_all_readonly())
         self.show_status("Settings updated")
 
         # Final-review Finding 2: a label/synonym/smart-collection edit in
@@ -944,35 +1018,40 @@ def get_stax_panel():
     return _STAX_PANEL_INSTANCE
 
 
+def _log(msg, level=logging.INFO, exc_info=False):
+    """Send a launcher message to the StaX logger, or stdout without one.
+
+    Nuke routes stdout into the Script Editor, where every print() re-lays
+    out the text widget; with a logger available nothing is printed.
+    exc_info=True attaches the active exception's traceback, as
+    logger.exception() does.
+    """
+    if logger:
+        logger.log(level, msg, exc_info=exc_info)
+    else:
+        print(msg)
+        if exc_info:
+            traceback.print_exc()
+
+
+def _debug_enabled():
+    """True when verbose launcher diagnostics are worth formatting."""
+    return logger is not None and logger.isEnabledFor(logging.DEBUG)
+
+
 def show_stax_panel():
     """
     Show StaX panel in Nuke.
     This function is called from menu.py.
     """
-    print("\n" + "="*80)
-    print("[show_stax_panel] Function called")
-    print("="*80)
-    if logger:
-        logger.info("="*80)
-        logger.info("show_stax_panel() function called")
-        logger.info("="*80)
-    
-    # Apply stylesheet
-    print("[show_stax_panel] Getting QApplication instance...")
+    _log("show_stax_panel() called (NUKE_MODE={})".format(NUKE_MODE))
+
     try:
         app = QtWidgets.QApplication.instance()
-        if app:
-            print("[show_stax_panel]   [OK] QApplication instance found")
-            if logger:
-                logger.info("QApplication instance found")
-        else:
-            print("[show_stax_panel]   [WARN] No QApplication instance found")
-            if logger:
-                logger.warning("No QApplication instance found")
+        if not app:
+            _log("No QApplication instance found", logging.WARNING)
     except Exception as e:
-        print("[show_stax_panel]   [ERROR] Failed to get QApplication instance: {}".format(e))
-        if logger:
-            logger.exception("Failed to get QApplication instance")
+        _log("Failed to get QApplication instance: {}".format(e), logging.ERROR, exc_info=True)
         raise
     
     if app and not NUKE_MODE:
@@ -984,117 +1063,77 @@ def show_stax_panel():
                 from src.font_manager import apply_ui_font
             apply_ui_font(app)
         except Exception as _font_exc:
-            print("[show_stax_panel]   [WARN] Failed to apply UI font: {}".format(_font_exc))
+            _log("Failed to apply UI font: {}".format(_font_exc), logging.WARNING)
 
         # Only apply stylesheet in standalone mode
         # Skip in Nuke to avoid Qt compatibility issues
-        print("[show_stax_panel] Loading stylesheet (standalone mode)...")
-        stylesheet_path = os.path.join(os.path.dirname(__file__), 'resources', 'style.qss')
-        print("[show_stax_panel] Stylesheet path: {}".format(stylesheet_path))
+        stylesheet_path = _STYLESHEET_PATH
+        if _debug_enabled():
+            _log("Stylesheet path: {}".format(stylesheet_path), logging.DEBUG)
         
-        if os.path.exists(stylesheet_path):
-            print("[show_stax_panel]   [OK] Stylesheet file exists")
+        try:
+            # Shared loader: reads as UTF-8 (style.qss has box-drawing
+            # characters cp1252 can't decode) and rewrites every
+            # url(:/icons/...) reference.
+            try:
+                from qss_loader import read_stylesheet
+            except ImportError:
+                from src.qss_loader import read_stylesheet
             try:
-                # Shared loader: reads as UTF-8 (style.qss has box-drawing
-                # characters cp1252 can't decode) and rewrites every
-                # url(:/icons/...) to an absolute path, not just the two
-                # checkbox icons this call site used to special-case.
-                try:
-                    from qss_loader import read_stylesheet
-                except ImportError:
-                    from src.qss_loader import read_stylesheet
-                try:
-                    from ui.widget_polish import install_widget_polish
-                except ImportError:
-                    from src.ui.widget_polish import install_widget_polish
-
-                stylesheet = read_stylesheet(stylesheet_path)
+                from ui.widget_polish import install_widget_polish
+            except ImportError:
+                from src.ui.widget_polish import install_widget_polish
+
+            # read_stylesheet is cached on (path, mtime); skipping an
+            # identical setStyleSheet also avoids re-polishing every widget
+            # when the panel is re-opened.
+            stylesheet = read_stylesheet(stylesheet_path)
+            if app.styleSheet() != stylesheet:
                 app.setStyleSheet(stylesheet)
-                install_widget_polish(app)
-                print("[show_stax_panel]   [OK] Stylesheet applied ({} chars)".format(len(stylesheet)))
-                if logger:
-                    logger.info("Stylesheet applied: {} ({} characters)".format(stylesheet_path, len(stylesheet)))
-            except Exception as e:
-                print("[show_stax_panel]   [WARN] Failed to load stylesheet: {}".format(e))
-                if logger:
-                    logger.warning("Failed to load stylesheet: {}".format(e))
-        else:
-            print("[show_stax_panel]   [WARN] Stylesheet file not found: {}".format(stylesheet_path))
-            if logger:
-                logger.warning("Stylesheet file not found: {}".format(stylesheet_path))
-    elif NUKE_MODE:
-        print("[show_stax_panel] NUKE_MODE: Skipping stylesheet (using Nuke's default styling)")
-        if logger:
-            logger.info("Skipped stylesheet in Nuke mode")
-    
-    # Create and show panel
-    print("[show_stax_panel] Checking NUKE_MODE: {}".format(NUKE_MODE))
-    if logger:
-        logger.info("NUKE_MODE = {}".format(NUKE_MODE))
+            install_widget_polish(app)
+            if _debug_enabled():
+                _log("Stylesheet applied: {} ({} characters)".format(
+                    stylesheet_path, len(stylesheet)), logging.DEBUG)
+        except (IOError, OSError):
+            _log("Stylesheet file not found: {}".format(stylesheet_path), logging.WARNING)
+        except Exception as e:
+            _log("Failed to load stylesheet: {}".format(e), logging.WARNING)
     
     if NUKE_MODE:
-        print("[show_stax_panel] Using nukescripts.panels.registerWidgetAsPanel...")
         # Use nukescripts.panels for proper Nuke integration
+        global _NUKE_PANEL
         try:
-            print("[show_stax_panel] Calling registerWidgetAsPanel('nuke_launcher.StaXPanel', 'StaX Asset Manager', 'uk.co.thefoundry.StaXPanel')...")
-            panel = nukescripts.panels.registerWidgetAsPanel(
-                'nuke_launcher.StaXPanel',
-                'StaX Asset Manager',
-                'uk.co.thefoundry.StaXPanel'
-            )
-            print("[show_stax_panel]   [OK] Panel registered")
-            if logger:
-                logger.info("Panel registered: nuke_launcher.StaXPanel")
-            
-            print("[show_stax_panel] Adding panel to pane...")
+            panel = _NUKE_PANEL
+            if panel is None:
+                panel = nukescripts.panels.registerWidgetAsPanel(
+                    'nuke_launcher.StaXPanel',
+                    'StaX Asset Manager',
+                    'uk.co.thefoundry.StaXPanel'
+                )
+                _NUKE_PANEL = panel
+                _log("Panel registered")
             panel.addToPane()
-            print("[show_stax_panel]   [OK] Panel added to pane")
-            if logger:
-                logger.info("Panel added to pane successfully")
-            
-            print("[show_stax_panel] [OK] Panel shown successfully")
-            print("="*80 + "\n")
-            if logger:
-                logger.info("show_stax_panel() completed successfully")
-                logger.separator()
-                
+            _log("Panel added to pane")
         except Exception as e:
-            print("[show_stax_panel]   [ERROR] CRITICAL: Failed to register panel: {}".format(e))
-            if logger:
-                logger.exception("Failed to register panel with nukescripts")
-            
-            print("[show_stax_panel] Falling back to standalone dialog...")
+            _NUKE_PANEL = None
+            _log("Failed to register panel with nukescripts: {}".format(e), logging.ERROR, exc_info=True)
+            _log("Falling back to standalone dialog", logging.WARNING)
             try:
                 panel = StaXPanel()
                 panel.show()
-                print("[show_stax_panel]   [OK] Fallback dialog shown")
-                if logger:
-                    logger.info("Fallback: Showed StaXPanel as standalone dialog")
             except Exception as fallback_error:
-                print("[show_stax_panel]   [ERROR] CRITICAL: Fallback also failed: {}".format(fallback_error))
-                if logger:
-                    logger.exception("Fallback dialog creation failed")
+                _log("Fallback dialog creation failed: {}".format(fallback_error), logging.ERROR, exc_info=True)
                 raise
     else:
         # Running outside Nuke - show as dialog
-        print("[show_stax_panel] Running in standalone mode (NUKE_MODE=False)")
-        if logger:
-            logger.info("Running in standalone mode - showing as dialog")
-        
         try:
             panel = StaXPanel()
-            print("[show_stax_panel]   [OK] StaXPanel created")
             panel.show()
-            print("[show_stax_panel]   [OK] Panel shown as dialog")
-            if logger:
-                logger.info("Panel shown as standalone dialog")
+            _log("Panel shown as standalone dialog")
         except Exception as e:
-            print("[show_stax_panel]   [ERROR] CRITICAL: Failed to create/show panel: {}".format(e))
-            if logger:
-                logger.exception("Failed to create/show panel in standalone mode")
+            _log("Failed to create/show panel in standalone mode: {}".format(e), logging.ERROR, exc_info=True)
             raise
     
-    print("[show_stax_panel] Returning panel object")
     return panel
 
 
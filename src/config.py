@@ -5,17 +5,150 @@ Handles application settings and user preferences
 """
 
 import os
+import sys
 import json
 import errno
+import atexit
 import logging
+import weakref
+import threading
+from collections import ChainMap
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+
+try:
+    import orjson                         # optional: 3-10x faster (de)serialisation
+    _HAS_ORJSON = True
+except ImportError:                       # graceful degradation to stdlib json
+    _HAS_ORJSON = False
+
+try:
+    from src.debug_manager import DebugManager as _DebugManager
+    _set_debug_enabled = _DebugManager.set_enabled
+except Exception:                         # debug manager unavailable: no-op
+    def _set_debug_enabled(value):
+        pass
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(data):
+    """Serialise config to UTF-8 bytes (orjson when available)."""
+    if _HAS_ORJSON:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        except TypeError:                 # orjson.JSONEncodeError: let json try
+            pass
+    return json.dumps(data, indent=4, sort_keys=True).encode('utf-8')
+
+
+def _loads(raw):
+    """Parse config bytes (orjson when available)."""
+    if _HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_bytes(path):
+    """Whole file as bytes via raw os.read (no buffered file object)."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size) if size else b''
+        # Files can grow between fstat() and read(); drain the remainder.
+        while True:
+            more = os.read(fd, 65536)
+            if not more:
+                return data
+            data += more
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=256)
+def _resolve(root_dir, path):
+    """Absolute, normalised form of path (relative paths hang off root_dir)."""
+    if not os.path.isabs(path):
+        return os.path.normpath(os.path.join(root_dir, path))
+    return os.path.normpath(path)
+
+
+# Shared Config per absolute config path, handed out by Config.instance().
+_INSTANCES = {}
+_INSTANCES_LOCK = threading.Lock()
+
+
+# Configs with possibly unsaved (autosave=False) changes are flushed at exit.
+_LIVE_CONFIGS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_configs():
+    for config in list(_LIVE_CONFIGS):
+        config.flush()
+
+
+class _LayeredConfig(ChainMap):
+    """ChainMap whose get() reads a flattened dict, rebuilt after any write.
+
+    A plain ChainMap.get() walks every layer through __contains__; config
+    reads vastly outnumber writes, so one flat dict lookup is cheaper.
+    Config.instance() is shared across threads, so rebuilds and writes are
+    serialised: a rebuild never copies a half-applied write, and a write
+    cannot be lost under a flat dict built just before it.
+    """
+
+    _flat = None
+
+    def __init__(self, *maps):
+        super().__init__(*maps)
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        flat = self._flat
+        if flat is None:
+            with self._lock:
+                flat = self._flat
+                if flat is None:
+                    flat = self._flat = dict(self)
+        return flat.get(key, default)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self._flat = None
+
+    def __delitem__(self, key):
+        with self._lock:
+            super().__delitem__(key)
+            self._flat = None
+
+    def pop(self, key, *default):
+        with self._lock:
+            try:
+                return super().pop(key, *default)
+            finally:
+                self._flat = None
+
+    def popitem(self):
+        with self._lock:
+            try:
+                return super().popitem()
+            finally:
+                self._flat = None
+
+    def clear(self):
+        with self._lock:
+            super().clear()
+            self._flat = None
+
+
 class Config(object):
     """Application configuration manager."""
     
-    DEFAULT_CONFIG = {
+    # Read-only: instances layer their own values over it (see __init__).
+    DEFAULT_CONFIG = MappingProxyType({
         # Database settings
         'database_path': './data/stax.db',
         
@@ -51,10 +184,14 @@ class Config(object):
         # Network/Database settings
         'db_max_retries': 10,
         'db_timeout': 60,
+        # DELETE is the only mode safe on network shares; WAL is faster for
+        # bulk ingest but requires every client to open the DB locally.
+        'db_journal_mode': 'DELETE',
         
         # Performance/Caching settings
         'preview_cache_size': 200,
         'preview_cache_memory_mb': 200,
+        'preview_disk_cache_mb': 500,  # on-disk thumbnail reuse across ingests; 0 disables
         'pagination_enabled': True,
         'items_per_page': 100,  # 50, 100, or 200
         'use_virtual_scrolling': True,
@@ -62,6 +199,7 @@ class Config(object):
         
         # Ingestion defaults
         'default_copy_policy': 'soft',  # 'soft' or 'hard'
+        'copy_workers': 4,  # parallel file copies for hard-copy ingests
         'auto_detect_sequences': True,
         'sequence_pattern': '.####.ext',
         'generate_previews': True,
@@ -72,7 +210,7 @@ class Config(object):
         'post_ingest_processor': None,
         'post_import_processor': None,
         'trusted_processors_dir': None,  # admin-owned dir; None => hooks disabled (SP4/C2)
-        'api_ingest_roots': [],  # allow-list of dirs the REST API may ingest from (SP4/M2)
+        'api_ingest_roots': (),  # allow-list of dirs the REST API may ingest from (SP4/M2)
 
         # GUI settings
         'default_view_mode': 'gallery',  # 'gallery' or 'list'
@@ -91,7 +229,7 @@ class Config(object):
         # User identity (for favorites)
         'machine_name': None,  # Auto-detected if None
         'user_name': None,     # Auto-detected if None
-    }
+    })
     
     def __init__(self, config_path='./config/config.json'):
         """
@@ -101,107 +239,235 @@ class Config(object):
             config_path (str): Path to configuration file
         """
         self.config_path = config_path
+        self._dirty = False  # in-memory changes not yet written (see flush())
+        self._batch_depth = 0  # >0 inside batch(): autosaves are deferred
+        self._last_written = None  # (path, payload) known to be on disk
+        self._ensured_dirs = set()  # created/verified by ensure_directories()
         # Project root (two levels up from this file: src/..)
         self.root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.config = self.DEFAULT_CONFIG.copy()
+        self._root_prefix = os.path.normpath(self.root_dir) + os.sep  # make_relative fast path
+        # Values that differ from (or were loaded over) the defaults; lookups
+        # fall through to DEFAULT_CONFIG without copying it per instance.
+        self._values = {}
+        self._config = _LayeredConfig(self._values, self.DEFAULT_CONFIG)
         
         # Valid sequence pattern choices
         self.sequence_patterns = ['.####.ext', '_####.ext', ' ####.ext', '-####.ext']
 
-        # Check for STOCK_DB environment variable (overrides database_path and previews_path)
-        stock_db_env = os.environ.get('STOCK_DB')
-        if stock_db_env:
-            self.config['database_path'] = stock_db_env
-            # Derive previews path from database path (same directory, 'previews' subfolder)
-            db_dir = os.path.dirname(stock_db_env)
-            self.config['previews_path'] = os.path.join(db_dir, 'previews')
-            self.config['preview_dir'] = os.path.join(db_dir, 'previews')  # Keep backward compatibility
-            logger.info("Using database from STOCK_DB environment variable: %s", stock_db_env)
-            logger.info("Using previews from derived path: %s", self.config['previews_path'])
-        
-        # Auto-detect user identity
-        if self.config['machine_name'] is None:
-            import socket
-            self.config['machine_name'] = socket.gethostname()
-        
-        if self.config['user_name'] is None:
-            self.config['user_name'] = os.environ.get('USERNAME') or os.environ.get('USER')
-        
-        # Load existing config if available
-        if os.path.exists(config_path):
-            self.load()
-            
-            # Re-apply STOCK_DB override after loading config
-            if stock_db_env:
-                self.config['database_path'] = stock_db_env
-                db_dir = os.path.dirname(stock_db_env)
-                self.config['previews_path'] = os.path.join(db_dir, 'previews')
-                self.config['preview_dir'] = os.path.join(db_dir, 'previews')
-        else:
-            # Create default config file
-            self.save()
+        # STOCK_DB environment variable overrides database_path and the
+        # previews paths derived from it; read now, applied after load().
+        self._pending_overrides = self._stock_db_overrides(os.environ.get('STOCK_DB'))
 
-        # Ensure sequence pattern is valid
-        if self.config.get('sequence_pattern') not in self.sequence_patterns:
-            self.config['sequence_pattern'] = '.####.ext'
+        # config.json is read on first access to .config (see _ensure_loaded).
+        self._loaded = False
+        self._loading = False
+        self._load_lock = threading.RLock()
+        _LIVE_CONFIGS.add(self)
 
-        self._apply_debug_mode(self.config.get('debug_mode', True))
+    @classmethod
+    def instance(cls, config_path='./config/config.json'):
+        """Process-wide Config for config_path, created on first request.
+
+        Panels and tools that only need "the" settings should use this
+        instead of Config() so they share one loaded copy.
+        """
+        key = os.path.abspath(config_path)
+        with _INSTANCES_LOCK:
+            inst = _INSTANCES.get(key)
+            if inst is None:
+                inst = _INSTANCES[key] = cls(config_path)
+        return inst
+
+    @property
+    def config(self):
+        """The layered settings mapping; loads config.json on first use."""
+        if not self._loaded:
+            self._ensure_loaded()
+        return self._config
+
+    def _ensure_loaded(self):
+        """Read (or create) config.json and apply STOCK_DB overrides, once.
+
+        A shared Config.instance() can be first touched by several threads:
+        the others wait on the lock until the load has finished instead of
+        reading built-in defaults (e.g. the default database_path). Only the
+        loading thread's own re-entrant reads (load/save go through .config)
+        see the mapping mid-load.
+        """
+        with self._load_lock:
+            if self._loaded or self._loading:
+                return
+            self._loading = True
+            try:
+                # Load existing config if available
+                config_exists = os.path.exists(self.config_path)
+                if config_exists:
+                    self.load()
+                self._config.update(self._pending_overrides)
+                if not config_exists:
+                    # Create default config file
+                    self.save()
+
+                # Ensure sequence pattern is valid
+                if self._config.get('sequence_pattern') not in self.sequence_patterns:
+                    self._config['sequence_pattern'] = '.####.ext'
+
+                self._apply_debug_mode(self._config.get('debug_mode', True))
+                self._loaded = True
+            finally:
+                self._loading = False
     
+    @staticmethod
+    def _stock_db_overrides(stock_db_env):
+        """Config keys forced by the STOCK_DB environment variable (may be empty)."""
+        if not stock_db_env:
+            return {}
+        # Derive previews path from database path (same directory, 'previews' subfolder)
+        previews = os.path.join(os.path.dirname(stock_db_env), 'previews')
+        logger.info("Using database from STOCK_DB environment variable: %s", stock_db_env)
+        logger.info("Using previews from derived path: %s", previews)
+        return {
+            'database_path': stock_db_env,
+            'previews_path': previews,
+            'preview_dir': previews,  # Keep backward compatibility
+        }
+
     def load(self):
         """Load configuration from file."""
         try:
-            with open(self.config_path, 'r') as f:
-                loaded_config = json.load(f)
+            loaded_config = _loads(_read_bytes(self.config_path))
+            # Parsed keys are fresh strings; interning them lets lookups with
+            # the (already interned) literal keys used in code hit dict's
+            # identity fast path instead of comparing characters.
+            loaded_config = {sys.intern(key): value for key, value in loaded_config.items()}
             
             # Merge with defaults (in case new keys were added)
             self.config.update(loaded_config)
+            if len(loaded_config) >= len(self.config):
+                # File already holds every key: an unchanged save() can skip it.
+                self._last_written = (self.config_path, _dumps(dict(self.config)))
             
             logger.info("Configuration loaded from: %s", self.config_path)
         except Exception:
             logger.exception("Failed to load configuration from %s", self.config_path)
     
     def save(self):
-        """Save configuration to file."""
+        """Save configuration to file.
+
+        Written to a temp file in the same directory and swapped in with
+        os.replace(), so a concurrent load() never sees a truncated file.
+        """
+        tmp_path = None
         try:
+            payload = _dumps(dict(self.config))
+            if (self.config_path, payload) == self._last_written:
+                self._dirty = False
+                return
+
             # Ensure config directory exists
             config_dir = os.path.dirname(self.config_path)
-            if config_dir and not os.path.exists(config_dir):
-                os.makedirs(config_dir)
-            
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=4, sort_keys=True)
+            if config_dir:
+                os.makedirs(config_dir, exist_ok=True)
+
+            # Plain open() (not mkstemp) keeps the usual umask permissions.
+            tmp_path = '{}.{}.{}.tmp'.format(
+                self.config_path, os.getpid(), threading.get_ident())
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+            tmp_path = None
+            self._last_written = (self.config_path, payload)
+            self._dirty = False
             
-            logger.info("Configuration saved to: %s", self.config_path)
+            logger.debug("Configuration saved to: %s", self.config_path)
         except Exception:
             logger.exception("Failed to save configuration to %s", self.config_path)
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
     
     def get(self, key, default=None):
         """Get configuration value."""
-        return self.config.get(key, default)
+        value = self.config.get(key, default)
+        if value is None and key in self._IDENTITY_KEYS:
+            value = self._detect_identity(key)
+        return value
+
+    # User identity (favorites, sessions) is detected on first read rather
+    # than in __init__: gethostname() can stall for seconds on slow DNS.
+    _IDENTITY_KEYS = frozenset(('machine_name', 'user_name'))
+
+    def _detect_identity(self, key):
+        """Detect and remember machine_name / user_name (not marked dirty)."""
+        if key == 'machine_name':
+            import socket
+            value = socket.gethostname()
+        else:
+            value = os.environ.get('USERNAME') or os.environ.get('USER')
+        if value is not None:
+            self.config[key] = value
+        return value
     
-    def set(self, key, value):
-        """Set configuration value and save."""
+    def set(self, key, value, autosave=True):
+        """Set configuration value and save (or defer until flush())."""
         self.config[key] = value
-        self.save()
+        self._dirty = True
+        if autosave and not self._batch_depth:
+            self.save()
         if key == 'debug_mode':
             self._apply_debug_mode(value)
     
-    def update(self, updates):
-        """Update multiple configuration values and save."""
+    def update(self, updates, autosave=True):
+        """Update multiple configuration values and save (or defer until flush())."""
         self.config.update(updates)
-        self.save()
+        self._dirty = True
+        if autosave and not self._batch_depth:
+            self.save()
         if 'debug_mode' in updates:
             self._apply_debug_mode(updates.get('debug_mode'))
+
+    def flush(self):
+        """Write deferred (autosave=False) changes, if any, to config.json."""
+        if self._dirty:
+            self.save()
+
+    @contextmanager
+    def batch(self):
+        """Group set()/update() calls into a single config.json write.
+
+        Nested batches only write when the outermost one exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
     
     def reset_to_defaults(self):
         """Reset configuration to defaults."""
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Mutate in place so get_all_readonly() views stay live.
+        self.config.clear()
         self.save()
         self._apply_debug_mode(self.config.get('debug_mode', True))
     
     def get_all(self):
         """Get all configuration as dictionary."""
-        return self.config.copy()
+        return dict(self.config)
+
+    def get_all_readonly(self):
+        """Live read-only view of the configuration (no copy).
+
+        Reflects later set()/update() calls; use get_all() when a detached
+        snapshot is needed (e.g. handing config to a worker thread).
+        """
+        return MappingProxyType(self.config)
     
     def load_from_database(self, db_manager):
         """
@@ -212,8 +478,11 @@ class Config(object):
             db_manager: DatabaseManager instance
         """
         try:
+            # One query for every DB-backed setting
+            stored = db_manager.get_settings(('previews_path', 'blender_path'))
+
             # Get previews_path from database if available
-            previews_path = db_manager.get_setting('previews_path')
+            previews_path = stored.get('previews_path')
             if previews_path:
                 # Only apply if STOCK_DB is not set (environment variable takes precedence)
                 if not os.environ.get('STOCK_DB'):
@@ -221,7 +490,7 @@ class Config(object):
                     self.config['preview_dir'] = previews_path  # Backward compatibility
                     logger.info("Loaded previews_path from database: %s", previews_path)
 
-            blender_setting = db_manager.get_setting('blender_path')
+            blender_setting = stored.get('blender_path')
             if blender_setting is not None and blender_setting != '':
                 self.config['blender_path'] = blender_setting
         except Exception:
@@ -235,17 +504,21 @@ class Config(object):
             db_manager: DatabaseManager instance
         """
         try:
+            updates = {}
             # Only save if not controlled by STOCK_DB environment variable
             if not os.environ.get('STOCK_DB'):
                 previews_path = self.config.get('previews_path')
                 if previews_path:
-                    db_manager.set_setting('previews_path', previews_path)
-                    logger.info("Saved previews_path to database: %s", previews_path)
+                    updates['previews_path'] = previews_path
 
             blender_setting = self.config.get('blender_path')
             if blender_setting is not None:
-                db_manager.set_setting('blender_path', blender_setting or '')
-                logger.info("Saved blender_path to database")
+                updates['blender_path'] = blender_setting or ''
+
+            # One transaction for every DB-backed setting
+            db_manager.set_settings(updates)
+            if updates:
+                logger.info("Saved %s to database", ", ".join(sorted(updates)))
         except Exception:
             logger.warning("Could not save config settings to database", exc_info=True)
     
@@ -274,7 +547,9 @@ class Config(object):
 
         directories.append(os.path.join(root_dir, 'logs'))  # Add logs directory
 
-        seen = set()
+        # Directories already ensured by an earlier call are skipped, so a
+        # repeat call with unchanged paths touches the filesystem not at all.
+        seen = self._ensured_dirs
         for directory in directories:
             if not directory:
                 continue
@@ -282,30 +557,25 @@ class Config(object):
             normalised = os.path.normpath(directory)
             if normalised in seen:
                 continue
-            seen.add(normalised)
 
-            if not os.path.exists(normalised):
-                try:
-                    logger.info("Creating directory: %s", normalised)
-                    os.makedirs(normalised)
-                except OSError as e:
-                    if e.errno != errno.EEXIST:
-                        logger.warning(
-                            "Failed to create directory %s: %s "
-                            "(continuing - it may not be needed immediately)",
-                            normalised, e,
-                        )
-                    # Don't raise - some directories might not be writable in Nuke context
+            # exist_ok makes this a single mkdir attempt per path rather
+            # than an exists() probe followed by makedirs().
+            try:
+                os.makedirs(normalised, exist_ok=True)
+                seen.add(normalised)
+            except OSError as e:
+                logger.warning(
+                    "Failed to create directory %s: %s "
+                    "(continuing - it may not be needed immediately)",
+                    normalised, e,
+                )
+                # Don't raise - some directories might not be writable in Nuke context
 
     def resolve_path(self, path, ensure_dir=False, treat_as_dir=None):
         """Resolve a possibly relative path to an absolute path rooted at project."""
         if not path:
             return None
-        resolved = path
-        if not os.path.isabs(path):
-            resolved = os.path.normpath(os.path.join(self.root_dir, path))
-        else:
-            resolved = os.path.normpath(path)
+        resolved = _resolve(self.root_dir, path)
 
         if ensure_dir:
             directory = resolved
@@ -324,18 +594,20 @@ class Config(object):
         if not path:
             return None
         path = os.path.normpath(path)
+        if path.startswith(self._root_prefix):
+            # Common case: an absolute path under the project root.
+            return path[len(self._root_prefix):].replace('\\', '/')
         try:
             relative = os.path.relpath(path, self.root_dir)
         except ValueError:
-            return path.replace('\\', '/').replace('\\', '/')
+            return path.replace('\\', '/')
         if relative.startswith('..'):
-            return path.replace('\\', '/').replace('\\', '/')
-        return relative.replace('\\', '/').replace('\\', '/')
+            return path.replace('\\', '/')
+        return relative.replace('\\', '/')
 
     def _apply_debug_mode(self, value):
         """Update global debug manager with current setting."""
         try:
-            from src.debug_manager import DebugManager
-            DebugManager.set_enabled(bool(value))
+            _set_debug_enabled(bool(value))
         except Exception:
             pass
@@ -22,6 +22,10 @@ except Exception:
     raise
 
 
+# Blender's TypeError for an unknown operator kwarg, across quoting styles.
+_UNRECOGNIZED_KW_RE = re.compile(r'keyword ["\']?([^"\'\s]+)["\']? unrecognized')
+
+
 def usage_and_exit():
     print("Usage: blender --background --python convert_to_glb.py -- <input_path> <output_path>")
     sys.exit(1)
@@ -35,11 +39,34 @@ def dump_operator_info():
         print("Could not print operator info:", exc)
 
 
+def scene_is_empty():
+    """True when no objects, meshes or materials are loaded yet."""
+    data = bpy.data
+    return not (len(data.objects) or len(data.meshes) or len(data.materials))
+
+
+def supported_export_kwargs():
+    """Property names the installed glTF exporter accepts, or None if unknown."""
+    try:
+        rna = bpy.ops.export_scene.gltf.get_rna_type()
+        return {prop.identifier for prop in rna.properties}
+    except Exception as exc:  # pylint: disable=broad-except
+        print("Could not introspect glTF exporter properties:", exc)
+        return None
+
+
 def try_iterative_export(output_path, kwargs):
     """Attempt export removing unsupported keyword arguments when necessary."""
     attempt = 0
-    active_kwargs = dict(kwargs)
     removed = []
+    supported = supported_export_kwargs()
+    if supported:
+        # Drop kwargs this Blender doesn't know up front instead of paying
+        # one failed operator call per unsupported keyword.
+        removed = sorted(key for key in kwargs if key not in supported)
+        active_kwargs = {key: value for key, value in kwargs.items() if key in supported}
+    else:
+        active_kwargs = dict(kwargs)
 
     while True:
         attempt += 1
@@ -53,9 +80,7 @@ def try_iterative_export(output_path, kwargs):
         except TypeError as type_err:
             message = str(type_err)
             print("TypeError while exporting:", message)
-            match = (re.search(r'keyword "?\'?([A-Za-z0-9_]+)\'?"? unrecognized', message)
-                     or re.search(r'keyword "([^"]+)" unrecognized', message)
-                     or re.search(r"keyword '([^']+)' unrecognized", message))
+            match = _UNRECOGNIZED_KW_RE.search(message)
             if match:
                 bad_kw = match.group(1)
                 if bad_kw in active_kwargs:
@@ -99,7 +124,12 @@ def main():
 
     in_ext = os.path.splitext(input_path)[1].lower()
 
-    bpy.ops.wm.read_factory_settings(use_empty=True)
+    # The factory reset is the costliest step of a conversion; skip it when
+    # Blender was started with an empty scene (nothing would be cleared).
+    if scene_is_empty():
+        print("Scene already empty; skipping factory settings reset.")
+    else:
+        bpy.ops.wm.read_factory_settings(use_empty=True)
 
     try:
         if in_ext == '.fbx':
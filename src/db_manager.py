@@ -6,14 +6,18 @@ Handles SQLite operations with network-aware file locking
 
 import sqlite3
 import os
-import time
 import json
 import hashlib
 import hmac
 import secrets
 import logging
 import re
+import threading
+import functools
+import collections
+import time
 from contextlib import contextmanager
+from urllib.request import pathname2url
 from file_lock import FileLockManager
 from filter_spec import normalize
 from metadata_rules import validate_field_type
@@ -23,6 +27,295 @@ logger = logging.getLogger(__name__)
 
 _PBKDF2_ITERATIONS = 260000
 
+# Per-connection setup, sent as one executescript() instead of one execute()
+# per PRAGMA. journal_mode is filled in per DatabaseManager (DELETE by
+# default: network-share safe, H1; no -wal/-shm sidecars). page_size and
+# auto_vacuum only take effect on a brand-new file (they must precede the
+# first write, which switching to WAL already is) and are no-ops for
+# existing databases.
+_PRAGMA_SQL = (
+    "PRAGMA page_size = 8192;"         # fewer, larger reads for wide element rows
+    "PRAGMA auto_vacuum = INCREMENTAL;"  # freed pages reclaimable via compact()
+    "PRAGMA foreign_keys = ON;"
+    "PRAGMA synchronous = NORMAL;"     # balance between safety and speed
+    "PRAGMA journal_mode = {journal_mode};"
+    "PRAGMA cache_size = -64000;"      # 64MB cache
+    "PRAGMA temp_store = MEMORY;"      # sorts/temp indexes off disk
+    "PRAGMA mmap_size = {mmap_size};"
+)
+
+# Read-only connections (get_connection(write=False)) cannot change the
+# journal mode and never write, so they only get the cache/mmap tuning.
+_RO_PRAGMA_SQL = (
+    "PRAGMA cache_size = -64000;"
+    "PRAGMA temp_store = MEMORY;"
+    "PRAGMA mmap_size = {mmap_size};"
+)
+
+# Default for optional arguments where None is a real value (e.g. clearing
+# a nullable column).
+_UNSET = object()
+
+# Memory-mapped reads skip the pager copy, but a network share that drops
+# out under a mapping faults the whole process (SIGBUS), so mmap is only
+# enabled in the local-disk (WAL) configuration.
+_LOCAL_MMAP_SIZE = 256 * 1024 * 1024
+
+
+# Base schema, sent as one executescript() so first-run setup is a single
+# parse/execute pass instead of one prepare per CREATE statement. Columns
+# and indexes added later live in _apply_migrations.
+_SCHEMA_DDL = """
+-- Table 1: Stacks (Primary Categories)
+CREATE TABLE IF NOT EXISTS stacks (
+    stack_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    path TEXT UNIQUE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Table 2: Lists (Sub-Categories with Hierarchical Support)
+CREATE TABLE IF NOT EXISTS lists (
+    list_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    stack_fk INTEGER NOT NULL,
+    parent_list_fk INTEGER,
+    name TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (stack_fk) REFERENCES stacks(stack_id) ON DELETE CASCADE,
+    FOREIGN KEY (parent_list_fk) REFERENCES lists(list_id) ON DELETE CASCADE
+);
+
+-- Index for parent lookup
+CREATE INDEX IF NOT EXISTS idx_lists_parent ON lists(parent_list_fk);
+
+-- Table 3: Elements (Assets)
+CREATE TABLE IF NOT EXISTS elements (
+    element_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    list_fk INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL CHECK(type IN ('2D', '3D', 'Toolset')),
+    filepath_soft TEXT,
+    filepath_hard TEXT,
+    is_hard_copy BOOLEAN NOT NULL DEFAULT 0,
+    frame_range TEXT,
+    format TEXT,
+    comment TEXT,
+    tags TEXT,
+    preview_path TEXT,
+    gif_preview_path TEXT,
+    video_preview_path TEXT,
+    geometry_preview_path TEXT,
+    is_deprecated BOOLEAN DEFAULT 0,
+    file_size INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (list_fk) REFERENCES lists(list_id) ON DELETE CASCADE
+);
+
+-- Table 4: Favorites (Per-user/machine)
+CREATE TABLE IF NOT EXISTS favorites (
+    favorite_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    element_fk INTEGER NOT NULL,
+    machine_name TEXT NOT NULL,
+    user_name TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (element_fk) REFERENCES elements(element_id) ON DELETE CASCADE,
+    UNIQUE(element_fk, machine_name, user_name)
+);
+
+-- Table 5: Playlists (Shared collaborative lists)
+-- Include creator tracking (created_by, created_on_machine)
+CREATE TABLE IF NOT EXISTS playlists (
+    playlist_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    description TEXT,
+    created_by TEXT,
+    created_on_machine TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Table 6: Playlist Items (Many-to-many)
+-- Use column names expected by code: item_id, order_index, added_at
+CREATE TABLE IF NOT EXISTS playlist_items (
+    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    playlist_fk INTEGER NOT NULL,
+    element_fk INTEGER NOT NULL,
+    order_index INTEGER DEFAULT 0,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (playlist_fk) REFERENCES playlists(playlist_id) ON DELETE CASCADE,
+    FOREIGN KEY (element_fk) REFERENCES elements(element_id) ON DELETE CASCADE,
+    UNIQUE(playlist_fk, element_fk)
+);
+
+-- Table 7: Ingestion History
+CREATE TABLE IF NOT EXISTS ingestion_history (
+    history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    element_fk INTEGER,
+    action TEXT NOT NULL,
+    source_path TEXT,
+    target_list TEXT,
+    status TEXT NOT NULL,
+    message TEXT,
+    ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (element_fk) REFERENCES elements(element_id) ON DELETE SET NULL
+);
+
+-- Table 8: Users and Permissions
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    role TEXT NOT NULL CHECK(role IN ('admin', 'user')) DEFAULT 'user',
+    email TEXT,
+    is_active BOOLEAN DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login TIMESTAMP,
+    must_change_password INTEGER DEFAULT 0
+);
+
+-- Table 9: User Sessions (for tracking logged-in users)
+CREATE TABLE IF NOT EXISTS user_sessions (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_fk INTEGER NOT NULL,
+    machine_name TEXT NOT NULL,
+    login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_active BOOLEAN DEFAULT 1,
+    FOREIGN KEY (user_fk) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Settings table for storing configuration in database
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes for performance
+CREATE INDEX IF NOT EXISTS idx_lists_stack_parent ON lists(stack_fk, parent_list_fk, name);
+CREATE INDEX IF NOT EXISTS idx_elements_type ON elements(type);
+CREATE INDEX IF NOT EXISTS idx_elements_name ON elements(name);
+CREATE INDEX IF NOT EXISTS idx_elements_deprecated ON elements(is_deprecated);
+CREATE INDEX IF NOT EXISTS idx_favorites_element ON favorites(element_fk);
+CREATE INDEX IF NOT EXISTS idx_playlist_items_element ON playlist_items(element_fk);
+CREATE INDEX IF NOT EXISTS idx_history_element ON ingestion_history(element_fk);
+CREATE INDEX IF NOT EXISTS idx_history_status ON ingestion_history(status);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+"""
+
+
+# Bound parameters per IN (...) chunk; SQLite builds before 3.32 cap a
+# statement at 999 variables.
+_MAX_IN_PARAMS = 500
+
+# A list and its ancestors, top-level list first, in one query instead of
+# one SELECT per parent_list_fk hop. The depth cap stops a corrupt
+# parent cycle from recursing forever.
+_LIST_ANCESTORS_CTE = """
+WITH RECURSIVE ancestors(list_id, parent_list_fk, depth) AS (
+    SELECT list_id, parent_list_fk, 0 FROM lists WHERE list_id = ?
+    UNION ALL
+    SELECT l.list_id, l.parent_list_fk, a.depth + 1
+    FROM lists AS l JOIN ancestors AS a ON l.list_id = a.parent_list_fk
+    WHERE a.depth < 255
+)
+"""
+_LIST_ANCESTORS_SQL = _LIST_ANCESTORS_CTE + """
+SELECT lists.* FROM ancestors JOIN lists USING (list_id)
+ORDER BY ancestors.depth DESC
+"""
+# Same walk joined to each list's stack: (stack name, stack path, list name).
+_LIST_PATH_SQL = _LIST_ANCESTORS_CTE + """
+SELECT s.name, s.path, l.name
+FROM ancestors AS a JOIN lists AS l USING (list_id)
+LEFT JOIN stacks AS s ON s.stack_id = l.stack_fk
+ORDER BY a.depth DESC
+"""
+
+
+def _split_tags(tags):
+    return [t.strip() for t in (tags or '').split(',') if t.strip()]
+
+
+def _join_tags(tag_list):
+    """Canonical elements.tags string: case-insensitively sorted, ', '-joined."""
+    return ', '.join(sorted(tag_list, key=str.lower))
+
+
+def _tags_with(tags, tag):
+    """SQL function stax_tags_with: tags plus tag, sorted, or tags unchanged."""
+    tag_list = _split_tags(tags)
+    if tag in tag_list:
+        return tags
+    tag_list.append(tag)
+    return _join_tags(tag_list)
+
+
+def _tags_without(tags, tag):
+    """SQL function stax_tags_without: tags minus tag, or tags unchanged."""
+    tag_list = _split_tags(tags)
+    if tag not in tag_list:
+        return tags
+    tag_list.remove(tag)
+    return _join_tags(tag_list)
+
+
+@functools.lru_cache(maxsize=256)
+def _update_element_sql(columns):
+    """UPDATE statement for a tuple of whitelisted element columns.
+
+    Cached so repeat updates of the same field set reuse one string, which
+    is also the key for the connection's prepared-statement cache.
+    """
+    return "UPDATE elements SET {} WHERE element_id = ?".format(
+        ', '.join("{} = ?".format(column) for column in columns))
+
+
+@functools.lru_cache(maxsize=256)
+def _insert_element_sql(columns):
+    """INSERT statement for a tuple of whitelisted element columns."""
+    return "INSERT INTO elements ({}) VALUES ({})".format(
+        ','.join(columns), ','.join('?' * len(columns)))
+
+
+@functools.lru_cache(maxsize=None)
+def _search_elements_sql(property_name, strict):
+    """SELECT for search_elements; property_name is already whitelisted."""
+    return "SELECT * FROM elements WHERE {} {} ? ORDER BY name".format(
+        property_name, '=' if strict else 'LIKE')
+
+
+def _dict_rows(conn, sql, params=()):
+    """
+    Run sql and return its rows as dicts.
+
+    Hot list paths read plain tuples (row_factory=None on the cursor) and
+    zip them with the column names once, instead of wrapping every row in
+    sqlite3.Row and then copying it with dict(row).
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def _schema_snapshot(cursor):
+    """Map every table name to its set of column names (one round-trip)."""
+    cursor.execute(
+        "SELECT m.name, c.name FROM sqlite_master AS m "
+        "JOIN pragma_table_info(m.name) AS c WHERE m.type = 'table'"
+    )
+    schema = {}
+    for table, column in cursor.fetchall():
+        schema.setdefault(table, set()).add(column)
+    return schema
+
+
+def _column_names(cursor, table):
+    """Column names of table (empty set when the table does not exist)."""
+    cursor.execute("PRAGMA table_info({})".format(table))
+    return {row[1] for row in cursor.fetchall()}
+
 
 def hash_password(password, iterations=_PBKDF2_ITERATIONS, salt=None):
     """Return a self-describing salted PBKDF2 hash: pbkdf2_sha256$iters$salt$hash."""
@@ -37,6 +330,17 @@ def is_legacy_hash(stored):
     return bool(stored) and '$' not in stored and len(stored) == 64
 
 
+def needs_rehash(stored):
+    """True when stored is legacy or uses fewer PBKDF2 rounds than today."""
+    if is_legacy_hash(stored):
+        return True
+    try:
+        scheme, iters, _salt_hex, _hash_hex = stored.split('$')
+        return scheme == 'pbkdf2_sha256' and int(iters) < _PBKDF2_ITERATIONS
+    except (AttributeError, ValueError):
+        return False
+
+
 def verify_password(stored, password):
     """Constant-time verify against a PBKDF2 or a legacy unsalted-sha256 hash."""
     if not stored:
@@ -63,6 +367,14 @@ class DatabaseManager(object):
 
     # Column whitelists — guard against .format()-into-SQL injection (M1).
     SEARCHABLE_ELEMENT_COLUMNS = {"name", "format", "type", "comment", "tags"}
+    # Optional create_element() keyword columns.
+    INSERTABLE_ELEMENT_COLUMNS = frozenset({
+        "filepath_soft", "filepath_hard", "is_hard_copy", "frame_range",
+        "format", "comment", "tags", "preview_path", "gif_preview_path",
+        "video_preview_path", "geometry_preview_path", "is_deprecated",
+        "file_size",
+    })
+
     UPDATABLE_ELEMENT_COLUMNS = {
         "list_fk", "name", "type", "filepath_soft", "filepath_hard",
         "is_hard_copy", "frame_range", "format", "comment", "tags",
@@ -70,6 +382,10 @@ class DatabaseManager(object):
         "geometry_preview_path", "is_deprecated", "file_size", "phash",
     }
 
+    # Columns returned for users; password_hash never leaves the manager.
+    _USER_COLUMNS = ("user_id, username, role, email, is_active, created_at, "
+                     "last_login, must_change_password")
+
     # Label validation and whitelists
     _COLOR_RE = re.compile(r"^#[0-9A-Fa-f]{6}$")
     _LABEL_FIELDS = {"name", "color_hex", "meaning", "sort_order"}
@@ -77,21 +393,83 @@ class DatabaseManager(object):
     # Smart collection field whitelist
     _COLLECTION_FIELDS = {"name", "filter_json", "created_by", "sort_order"}
 
-    def __init__(self, db_path, enable_logging=False, use_file_lock=True):
+    # journal_mode values accepted from config. WAL needs shared memory and
+    # is only safe when every client opens the DB from a local disk (H1).
+    _JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "WAL"}
+    # The pool keeps connections open for the whole session, so
+    # PRAGMA optimize also runs periodically rather than only on close().
+    _OPTIMIZE_EVERY = 1000
+    # Stacks/lists change rarely but the UI reads them constantly. Local
+    # writes invalidate immediately; the TTL bounds how long another
+    # machine's edits on the shared database can go unseen.
+    _TREE_CACHE_TTL = 5.0
+    # get_list_hierarchy entries kept before the cache is reset.
+    _HIERARCHY_CACHE_MAX = 1024
+    # db_path as passed in -> resolved path, for paths whose directory and
+    # schema a manager in this process has already set up.
+    _READY_PATHS = {}
+    _READY_LOCK = threading.Lock()
+
+    def __init__(self, db_path, enable_logging=False, use_file_lock=True,
+                 journal_mode="DELETE"):
         """
         Initialize database manager.
         
         Args:
             db_path (str): Path to SQLite database file
             enable_logging (bool): Enable detailed operation logging
-            use_file_lock (bool): Enable external file locking for network shares
+            use_file_lock (bool): Enable external file locking for network
+                shares (ignored in WAL mode, which locks on its own)
+            journal_mode (str): SQLite journal mode; DELETE unless the
+                database is known to live on a local disk
         """
         self.db_path = db_path
-        self.max_retries = 10  # Increased for network environments
-        self.retry_delay = 0.3  # seconds (exponential backoff)
+        journal_mode = str(journal_mode or "DELETE").upper()
+        if journal_mode not in self._JOURNAL_MODES:
+            logger.warning("Unsupported db_journal_mode %r; using DELETE", journal_mode)
+            journal_mode = "DELETE"
+        self.journal_mode = journal_mode
+        self._pragma_sql = _PRAGMA_SQL.format(
+            journal_mode=journal_mode,
+            mmap_size=_LOCAL_MMAP_SIZE if journal_mode == "WAL" else 0,
+        )
+        self._ro_pragma_sql = _RO_PRAGMA_SQL.format(
+            mmap_size=_LOCAL_MMAP_SIZE if journal_mode == "WAL" else 0,
+        )
         self.enable_logging = enable_logging
-        self.use_file_lock = use_file_lock
+        # WAL coordinates readers and the single writer through its -shm
+        # index, so the external lock would only serialize callers again.
+        self._file_lock_requested = use_file_lock
+        self.use_file_lock = use_file_lock and journal_mode != "WAL"
         self.lock_file_path = db_path + '.lock'  # Lock file next to database
+        # Per-thread state for transaction(): the pinned connection and the
+        # callbacks deferred until it commits.
+        self._local = threading.local()
+        # Per-thread persistent connections reused by get_connection(): one
+        # read-write and one read-only (mode=ro) for write=False callers.
+        # Opened (and PRAGMA-configured) once, dropped on error, closed by close().
+        self._pool = threading.local()
+        # (expires_at, rows) caches for get_all_stacks / get_lists_by_stack
+        self._stack_cache = None
+        self._lists_cache = {}
+        # list_id -> (expires_at, ancestor rows), and (expires_at, tags) for
+        # get_all_tags; same TTL and local invalidation as above.
+        self._hierarchy_cache = {}
+        self._tags_cache = None
+        # Bumped when the caches are cleared; a read that started before a
+        # clear does not store its (possibly pre-commit) rows afterwards.
+        self._tree_generation = 0
+        self._tags_generation = 0
+
+        # Another manager in this process already prepared this path: skip
+        # the directory checks and the schema probe, keeping one stat so a
+        # deleted database file is still recreated.
+        with DatabaseManager._READY_LOCK:
+            ready_path = DatabaseManager._READY_PATHS.get(db_path)
+        if ready_path is not None and os.path.exists(ready_path):
+            self.db_path = ready_path
+            self.lock_file_path = ready_path + '.lock'
+            return
         
         # Ensure database directory exists
         db_dir = os.path.dirname(db_path)
@@ -127,6 +505,10 @@ class DatabaseManager(object):
         # Initialize schema if database doesn't exist
         if not os.path.exists(self.db_path):
             self._create_schema()
+        elif self._schema_is_current():
+            # Already fully migrated: skip the column/table probes entirely
+            self._mark_ready(db_path)
+            return
         else:
             # Apply migrations for existing databases
             self._apply_migrations()
@@ -134,6 +516,12 @@ class DatabaseManager(object):
         # Versioned migrations (phash column, insertion_log table).
         # Idempotent; runs on every start so fresh and existing DBs converge.
         self._run_versioned_migrations()
+        self._mark_schema_current()
+        self._mark_ready(db_path)
+
+    def _mark_ready(self, db_path):
+        with DatabaseManager._READY_LOCK:
+            DatabaseManager._READY_PATHS[db_path] = self.db_path
 
     def _log(self, message):
         """Log message if logging is enabled."""
@@ -143,20 +531,34 @@ class DatabaseManager(object):
     @contextmanager
     def get_connection(self, write=True):
         """
-        Context manager for database connections with file locking and retry logic.
-        Implements external file locking for network-shared databases with exponential backoff.
+        Context manager for database connections with file locking.
+        Waiting on a busy database is left to SQLite's busy handler
+        (timeout=60s on connect), so there is no Python-level retry loop.
         
         Yields:
             sqlite3.Connection: Database connection
             
         Raises:
-            sqlite3.OperationalError: If connection fails after all retries
-        """
+            RuntimeError: If the database stays locked past the busy timeout
+            sqlite3.OperationalError: For other database errors
+        """
+        pinned = getattr(self._local, 'conn', None)
+        if pinned is not None:
+            # Inside transaction(): reuse the pinned connection. The outermost
+            # block owns the file lock, the COMMIT and the close.
+            yield pinned
+            return
+
         conn = None
         last_error = None
         file_lock = None
+        committed = False
         
         try:
+            if write and self.journal_mode == "WAL":
+                # Open (or reuse) the write connection first: if the share
+                # refuses WAL it falls back and turns the file lock back on.
+                self._pooled_connection()
             # Acquire the external file lock only for writes (L6): concurrent
             # read connections no longer serialize behind one global OS lock.
             if self.use_file_lock and write:
@@ -170,70 +572,45 @@ class DatabaseManager(object):
                 file_lock.acquire()
                 self._log("File lock acquired")
             
-            for attempt in range(self.max_retries):
-                try:
-                    self._log("Connection attempt {} of {}".format(attempt + 1, self.max_retries))
-                    
-                    conn = sqlite3.connect(
-                        self.db_path,
-                        timeout=60.0,  # 60 second timeout for network locks
-                        isolation_level='DEFERRED',
-                        check_same_thread=False  # Allow multi-threaded access
+            try:
+                conn = self._pooled_connection(readonly=not write)
+                yield conn
+                conn.commit()
+                committed = True
+                self._log("Transaction committed")
+                if write:
+                    self._maybe_optimize(conn)
+
+            except sqlite3.OperationalError as e:
+                last_error = e
+                error_msg = str(e).lower()
+
+                # SQLite already waited out the busy timeout before raising
+                if 'locked' in error_msg or 'busy' in error_msg:
+                    self._log("Database still locked after busy timeout.")
+                    raise RuntimeError(
+                        "Database locked. "
+                        "Another process may be holding a long transaction. "
+                        "Error: {}".format(str(e))
                     )
-                    conn.row_factory = sqlite3.Row  # Enable dict-like access
-                    
-                    # Enable foreign keys
-                    conn.execute("PRAGMA foreign_keys = ON")
-                    
-                    # Optimize for network file systems
-                    conn.execute("PRAGMA synchronous = NORMAL")  # Balance between safety and speed
-                    conn.execute("PRAGMA journal_mode = DELETE")  # network-share safe (H1); no -wal/-shm sidecars
-                    conn.execute("PRAGMA cache_size = -16000")  # 16MB cache
-                    
-                    self._log("Connection successful")
-                    
-                    yield conn
-                    conn.commit()
-                    self._log("Transaction committed")
-                    break
-                    
-                except sqlite3.OperationalError as e:
-                    last_error = e
-                    error_msg = str(e).lower()
-                    
-                    # Detect lock-related errors
-                    if 'locked' in error_msg or 'busy' in error_msg:
-                        if attempt < self.max_retries - 1:
-                            # Exponential backoff with jitter
-                            delay = self.retry_delay * (2 ** attempt) + (time.time() % 0.1)
-                            self._log("Database locked, retrying in {:.2f}s...".format(delay))
-                            time.sleep(delay)
-                            continue
-                        else:
-                            self._log("Max retries reached. Database still locked.")
-                            raise RuntimeError(
-                                "Database locked after {} retries. "
-                                "Another process may be holding a long transaction. "
-                                "Error: {}".format(self.max_retries, str(e))
-                            )
-                    else:
-                        # Non-lock error, raise immediately
-                        self._log("Database error: {}".format(str(e)))
-                        raise
-                        
-                except Exception as e:
-                    last_error = e
-                    self._log("Unexpected error: {}".format(str(e)))
-                    raise
+                self._log("Database error: {}".format(str(e)))
+                raise
+
+            except Exception as e:
+                last_error = e
+                self._log("Unexpected error: {}".format(str(e)))
+                raise
         
         finally:
-            # Always clean up connection and file lock
-            if conn:
+            # The connection stays open for reuse; a failed block is rolled
+            # back, and a connection that errored is dropped and reopened next time.
+            if conn is not None and not committed:
                 try:
-                    conn.close()
-                    self._log("Connection closed")
+                    conn.rollback()
                 except Exception:
-                    logger.debug("Error closing DB connection", exc_info=True)
+                    logger.debug("Error rolling back DB connection", exc_info=True)
+                if isinstance(last_error, sqlite3.Error):
+                    self._discard_pooled_connection(readonly=not write)
 
             # Release file lock if acquired
             if file_lock:
@@ -243,170 +620,175 @@ class DatabaseManager(object):
                 except Exception:
                     logger.debug("Error releasing file lock", exc_info=True)
     
+    def _pooled_connection(self, readonly=False):
+        """This thread's persistent connection, opened on first use."""
+        if readonly and self.db_path == ':memory:':
+            readonly = False  # a mode=ro URI would open a separate, empty DB
+        slot = 'ro_conn' if readonly else 'conn'
+        conn = getattr(self._pool, slot, None)
+        if conn is None:
+            if readonly:
+                target = 'file:{}?mode=ro'.format(
+                    pathname2url(os.path.abspath(self.db_path)))
+            else:
+                target = self.db_path
+            conn = sqlite3.connect(
+                target,
+                timeout=60.0,  # 60 second timeout for network locks
+                # Writers take the RESERVED lock at BEGIN, so two writers
+                # wait in the busy handler instead of deadlocking on a
+                # SHARED->RESERVED upgrade; readers never open a transaction.
+                isolation_level=None if readonly else 'IMMEDIATE',
+                check_same_thread=False,  # Allow multi-threaded access
+                cached_statements=256,  # the pool keeps prepared statements warm
+                uri=readonly
+            )
+            conn.row_factory = sqlite3.Row  # Enable dict-like access
+            try:
+                # Foreign keys + network-file-system tuning in one call
+                conn.executescript(self._ro_pragma_sql if readonly else self._pragma_sql)
+                if not readonly:
+                    if self.journal_mode == "WAL":
+                        self._check_wal(conn)
+                    conn.create_function("stax_tags_with", 2, _tags_with, deterministic=True)
+                    conn.create_function("stax_tags_without", 2, _tags_without, deterministic=True)
+            except Exception:
+                conn.close()
+                raise
+            setattr(self._pool, slot, conn)
+            self._log("Read-only connection opened" if readonly else "Connection opened")
+        return conn
+
+    def _check_wal(self, conn):
+        """
+        Fall back to TRUNCATE when the file system refused WAL.
+
+        SQLite keeps the old journal mode when WAL is unavailable (e.g.
+        some SMB shares without shared memory); mmap and the disabled
+        file lock are only safe in real WAL mode, so both are reverted.
+        """
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if str(mode).lower() == "wal":
+            return
+        logger.warning("WAL journal mode unavailable for %s (got %r); using TRUNCATE",
+                       self.db_path, mode)
+        self.journal_mode = "TRUNCATE"
+        self._pragma_sql = _PRAGMA_SQL.format(journal_mode="TRUNCATE", mmap_size=0)
+        self._ro_pragma_sql = _RO_PRAGMA_SQL.format(mmap_size=0)
+        self.use_file_lock = self._file_lock_requested
+        conn.executescript("PRAGMA journal_mode = TRUNCATE; PRAGMA mmap_size = 0;")
+
+    def _discard_pooled_connection(self, readonly=False):
+        if readonly and self.db_path == ':memory:':
+            readonly = False
+        slot = 'ro_conn' if readonly else 'conn'
+        conn = getattr(self._pool, slot, None)
+        setattr(self._pool, slot, None)
+        if conn is not None:
+            try:
+                conn.close()
+                self._log("Connection closed")
+            except Exception:
+                logger.debug("Error closing DB connection", exc_info=True)
+
+    def _maybe_optimize(self, conn):
+        """Refresh planner statistics every _OPTIMIZE_EVERY write blocks."""
+        writes = getattr(self._pool, 'writes', 0) + 1
+        self._pool.writes = writes
+        if writes % self._OPTIMIZE_EVERY == 0:
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                logger.debug("PRAGMA optimize failed", exc_info=True)
+
+    def compact(self, pages=1000):
+        """
+        Return up to pages free pages to the filesystem.
+
+        Deletes (e.g. delete_stack cascading to lists/elements) leave free
+        pages behind; on databases created with auto_vacuum=INCREMENTAL this
+        truncates them off the end of the file. A no-op on older databases.
+        """
+        with self.get_connection() as conn:
+            # executescript steps the statement to completion; execute() would
+            # stop after the first step and free a single page.
+            conn.executescript("PRAGMA incremental_vacuum({:d});".format(int(pages)))
+
+    def close(self):
+        """
+        Close the calling thread's persistent connections.
+
+        The read-write connection runs PRAGMA optimize and compact() first
+        so stale ANALYZE statistics are refreshed and free pages reclaimed
+        before the next session. Connections
+        held by other threads are released when those threads exit. Safe to
+        call more than once; the next call to get_connection() reopens the
+        connection.
+        """
+        if getattr(self._pool, 'conn', None) is not None:
+            try:
+                with self.get_connection() as conn:
+                    conn.execute("PRAGMA optimize")
+                self.compact()
+            except Exception:
+                logger.debug("PRAGMA optimize/compact on close failed", exc_info=True)
+        self._discard_pooled_connection(readonly=True)
+        self._discard_pooled_connection()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group several calls into one connection, file lock and COMMIT.
+
+        Every get_connection() made on this thread inside the block reuses
+        the same connection, so a bulk ingest pays for one commit per batch
+        instead of one per row. Nested blocks join the outermost one; an
+        exception rolls the whole block back.
+
+        Yields:
+            sqlite3.Connection: The pinned connection
+        """
+        if getattr(self._local, 'conn', None) is not None:
+            yield self._local.conn
+            return
+
+        callbacks = self._local.callbacks = []
+        try:
+            with self.get_connection() as conn:
+                self._local.conn = conn
+                try:
+                    yield conn
+                finally:
+                    self._local.conn = None
+        finally:
+            self._local.callbacks = None
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Deferred after_commit callback failed")
+
+    def after_commit(self, callback):
+        """
+        Run callback once the enclosing transaction() has committed.
+
+        Outside a transaction the callback runs immediately. Used for work
+        that other threads/connections must not observe before the rows
+        exist (e.g. preview jobs that write back to the element).
+        """
+        callbacks = getattr(self._local, 'callbacks', None)
+        if callbacks is None:
+            callback()
+        else:
+            callbacks.append(callback)
+
     def _create_schema(self):
         """Create database schema with all required tables."""
         with self.get_connection() as conn:
+            conn.executescript(_SCHEMA_DDL)
             cursor = conn.cursor()
             
-            # Table 1: Stacks (Primary Categories)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS stacks (
-                    stack_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    path TEXT UNIQUE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Table 2: Lists (Sub-Categories with Hierarchical Support)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS lists (
-                    list_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    stack_fk INTEGER NOT NULL,
-                    parent_list_fk INTEGER,
-                    name TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (stack_fk) REFERENCES stacks(stack_id) ON DELETE CASCADE,
-                    FOREIGN KEY (parent_list_fk) REFERENCES lists(list_id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Create index for parent lookup
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_lists_parent ON lists(parent_list_fk)")
-            
-            # Table 3: Elements (Assets)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS elements (
-                    element_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    list_fk INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    type TEXT NOT NULL CHECK(type IN ('2D', '3D', 'Toolset')),
-                    filepath_soft TEXT,
-                    filepath_hard TEXT,
-                    is_hard_copy BOOLEAN NOT NULL DEFAULT 0,
-                    frame_range TEXT,
-                    format TEXT,
-                    comment TEXT,
-                    tags TEXT,
-                    preview_path TEXT,
-                    gif_preview_path TEXT,
-                    video_preview_path TEXT,
-                    geometry_preview_path TEXT,
-                    is_deprecated BOOLEAN DEFAULT 0,
-                    file_size INTEGER,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (list_fk) REFERENCES lists(list_id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Table 4: Favorites (Per-user/machine)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS favorites (
-                    favorite_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    element_fk INTEGER NOT NULL,
-                    machine_name TEXT NOT NULL,
-                    user_name TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (element_fk) REFERENCES elements(element_id) ON DELETE CASCADE,
-                    UNIQUE(element_fk, machine_name, user_name)
-                )
-            """)
-            
-            # Table 5: Playlists (Shared collaborative lists)
-            # Include creator tracking (created_by, created_on_machine)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS playlists (
-                    playlist_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    created_by TEXT,
-                    created_on_machine TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Table 6: Playlist Items (Many-to-many)
-            # Use column names expected by code: item_id, order_index, added_at
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS playlist_items (
-                    item_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    playlist_fk INTEGER NOT NULL,
-                    element_fk INTEGER NOT NULL,
-                    order_index INTEGER DEFAULT 0,
-                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (playlist_fk) REFERENCES playlists(playlist_id) ON DELETE CASCADE,
-                    FOREIGN KEY (element_fk) REFERENCES elements(element_id) ON DELETE CASCADE,
-                    UNIQUE(playlist_fk, element_fk)
-                )
-            """)
-            
-            # Table 7: Ingestion History
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ingestion_history (
-                    history_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    element_fk INTEGER,
-                    action TEXT NOT NULL,
-                    source_path TEXT,
-                    target_list TEXT,
-                    status TEXT NOT NULL,
-                    message TEXT,
-                    ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (element_fk) REFERENCES elements(element_id) ON DELETE SET NULL
-                )
-            """)
-            
-            # Table 8: Users and Permissions
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    username TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    role TEXT NOT NULL CHECK(role IN ('admin', 'user')) DEFAULT 'user',
-                    email TEXT,
-                    is_active BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_login TIMESTAMP,
-                    must_change_password INTEGER DEFAULT 0
-                )
-            """)
-            
-            # Table 9: User Sessions (for tracking logged-in users)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_sessions (
-                    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_fk INTEGER NOT NULL,
-                    machine_name TEXT NOT NULL,
-                    login_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active BOOLEAN DEFAULT 1,
-                    FOREIGN KEY (user_fk) REFERENCES users(user_id) ON DELETE CASCADE
-                )
-            """)
-            
-            # Settings table for storing configuration in database
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Create indexes for performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_lists_stack ON lists(stack_fk)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_elements_list ON elements(list_fk)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_elements_type ON elements(type)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_elements_name ON elements(name)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_elements_deprecated ON elements(is_deprecated)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_favorites_element ON favorites(element_fk)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_favorites_user ON favorites(machine_name, user_name)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_playlist_items_playlist ON playlist_items(playlist_fk)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_playlist_items_element ON playlist_items(element_fk)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_element ON ingestion_history(element_fk)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_status ON ingestion_history(status)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_username ON users(username)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user ON user_sessions(user_fk)")
-            
             # Create the initial admin user with a random password if none exist
             cursor.execute("SELECT COUNT(*) as count FROM users")
             if cursor.fetchone()['count'] == 0:
@@ -418,52 +800,65 @@ class DatabaseManager(object):
         """
         Apply database migrations to existing database files.
         Checks for missing columns/tables and adds them.
+
+        FROZEN: this legacy, unversioned pass is skipped once user_version
+        reaches CURRENT_SCHEMA_VERSION (see _schema_is_current), so a check
+        added here would never run on an already-migrated database. New
+        schema changes go in a _migrate_vN step in db_migrations.py.
+
+        Runs as one explicit transaction: Python's sqlite3 only opens a
+        transaction implicitly before DML, so every ALTER/CREATE would
+        otherwise commit on its own. A failure part-way rolls all of it back.
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("BEGIN EXCLUSIVE")
+
+            # Snapshot every table and its columns in one query and probe
+            # with set lookups instead of one failing SELECT per migration.
+            schema = _schema_snapshot(cursor)
+            tables = set(schema)
+            list_cols = schema.get('lists', set())
+            elem_cols = schema.get('elements', set())
+            playlist_cols = schema.get('playlists', set())
+            item_cols = schema.get('playlist_items', set())
+            user_cols = schema.get('users', set())
             
             # Migration 1: Add parent_list_fk to lists table (for hierarchical sub-lists)
-            try:
-                cursor.execute("SELECT parent_list_fk FROM lists LIMIT 1")
+            if 'parent_list_fk' in list_cols:
                 self._log("Migration 1: parent_list_fk already exists")
-            except sqlite3.OperationalError:
+            else:
                 self._log("Migration 1: Adding parent_list_fk column to lists table")
                 cursor.execute("ALTER TABLE lists ADD COLUMN parent_list_fk INTEGER")
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_lists_parent ON lists(parent_list_fk)")
                 self._log("Migration 1: Complete")
             
             # Migration 2: Add gif_preview_path to elements table (for future GIF previews)
-            try:
-                cursor.execute("SELECT gif_preview_path FROM elements LIMIT 1")
+            if 'gif_preview_path' in elem_cols:
                 self._log("Migration 2: gif_preview_path already exists")
-            except sqlite3.OperationalError:
+            else:
                 self._log("Migration 2: Adding gif_preview_path column to elements table")
                 cursor.execute("ALTER TABLE elements ADD COLUMN gif_preview_path TEXT")
                 self._log("Migration 2: Complete")
             
             # Migration 2.5: Add video_preview_path column for sequence video previews
-            try:
-                cursor.execute("SELECT video_preview_path FROM elements LIMIT 1")
+            if 'video_preview_path' in elem_cols:
                 self._log("Migration 2.5: video_preview_path already exists")
-            except sqlite3.OperationalError:
+            else:
                 self._log("Migration 2.5: Adding video_preview_path column to elements table")
                 cursor.execute("ALTER TABLE elements ADD COLUMN video_preview_path TEXT")
                 self._log("Migration 2.5: Complete")
 
             # Migration 3.1: Add geometry_preview_path column for 3D assets
-            try:
-                cursor.execute("SELECT geometry_preview_path FROM elements LIMIT 1")
+            if 'geometry_preview_path' in elem_cols:
                 self._log("Migration 3.1: geometry_preview_path already exists")
-            except sqlite3.OperationalError:
+            else:
                 self._log("Migration 3.1: Adding geometry_preview_path column to elements table")
                 cursor.execute("ALTER TABLE elements ADD COLUMN geometry_preview_path TEXT")
                 self._log("Migration 3.1: Complete")
             
             # Migration 3: Create users table if it doesn't exist
-            cursor.execute("""
-                SELECT name FROM sqlite_master WHERE type='table' AND name='users'
-            """)
-            if not cursor.fetchone():
+            if 'users' not in tables:
                 self._log("Migration 3: Creating users table")
                 cursor.execute("""
                     CREATE TABLE users (
@@ -482,13 +877,11 @@ class DatabaseManager(object):
 
                 # Create the initial admin user with a random password
                 self._seed_initial_admin(cursor)
+                user_cols = _column_names(cursor, 'users')
                 self._log("Migration 3: Complete - Initial admin user created")
             
             # Migration 4: Create user_sessions table if it doesn't exist
-            cursor.execute("""
-                SELECT name FROM sqlite_master WHERE type='table' AND name='user_sessions'
-            """)
-            if not cursor.fetchone():
+            if 'user_sessions' not in tables:
                 self._log("Migration 4: Creating user_sessions table")
                 cursor.execute("""
                     CREATE TABLE user_sessions (
@@ -505,29 +898,21 @@ class DatabaseManager(object):
                 self._log("Migration 4: Complete")
             
             # Migration 5: Ensure playlists table has created_by and created_on_machine
-            try:
-                cursor.execute("SELECT created_by FROM playlists LIMIT 1")
+            if 'created_by' in playlist_cols:
                 self._log("Migration 5: playlists already has created_by")
-            except sqlite3.OperationalError:
+            elif 'playlists' in tables:
                 self._log("Migration 5: Adding created_by and created_on_machine to playlists")
-                try:
-                    cursor.execute("ALTER TABLE playlists ADD COLUMN created_by TEXT")
-                except sqlite3.OperationalError:
-                    pass
-                try:
+                cursor.execute("ALTER TABLE playlists ADD COLUMN created_by TEXT")
+                if 'created_on_machine' not in playlist_cols:
                     cursor.execute("ALTER TABLE playlists ADD COLUMN created_on_machine TEXT")
-                except sqlite3.OperationalError:
-                    pass
                 self._log("Migration 5: Complete")
 
             # Migration 6: Ensure playlist_items uses item_id, order_index, added_at
-            try:
-                cursor.execute("SELECT item_id FROM playlist_items LIMIT 1")
+            if 'item_id' in item_cols:
                 self._log("Migration 6: playlist_items already migrated")
-            except sqlite3.OperationalError:
+            else:
                 # If playlist_items exists but has old column names, attempt to migrate safely
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='playlist_items'")
-                if cursor.fetchone():
+                if 'playlist_items' in tables:
                     self._log("Migration 6: Migrating playlist_items table schema")
                     # Create new temporary table with correct schema
                     cursor.execute("""
@@ -548,8 +933,7 @@ class DatabaseManager(object):
                     ).fetchone()[0]
 
                     # Map older column names if present.
-                    cursor.execute("PRAGMA table_info(playlist_items)")
-                    cols = [r[1] for r in cursor.fetchall()]
+                    cols = item_cols
                     select_cols = []
                     select_cols.append('playlist_fk' if 'playlist_fk' in cols else 'playlist')
                     select_cols.append('element_fk' if 'element_fk' in cols else 'element')
@@ -607,10 +991,7 @@ class DatabaseManager(object):
                     self._log("Migration 6: playlist_items table does not exist; skipping")
 
             # Migration 7: Create settings table if it doesn't exist
-            cursor.execute("""
-                SELECT name FROM sqlite_master WHERE type='table' AND name='settings'
-            """)
-            if not cursor.fetchone():
+            if 'settings' not in tables:
                 self._log("Migration 7: Creating settings table")
                 cursor.execute("""
                     CREATE TABLE settings (
@@ -624,10 +1005,9 @@ class DatabaseManager(object):
                 self._log("Migration 7: settings table already exists")
 
             # Migration 8: add must_change_password to users (SP4/H2)
-            try:
-                cursor.execute("SELECT must_change_password FROM users LIMIT 1")
+            if 'must_change_password' in user_cols:
                 self._log("Migration 8: must_change_password already exists")
-            except sqlite3.OperationalError:
+            else:
                 self._log("Migration 8: Adding must_change_password to users")
                 cursor.execute(
                     "ALTER TABLE users ADD COLUMN must_change_password INTEGER DEFAULT 0"
@@ -636,6 +1016,35 @@ class DatabaseManager(object):
 
             self._log("All migrations applied successfully")
 
+    def _schema_is_current(self):
+        """
+        True when both migration passes already ran against this file.
+
+        PRAGMA user_version is stamped once every migration has succeeded;
+        schema_version is checked alongside it (same round trip) so a DB
+        rolled back by restoring an old schema_version still migrates.
+        Only the versioned runner bumps CURRENT_SCHEMA_VERSION, which is why
+        _apply_migrations() is frozen.
+        """
+        from db_migrations import CURRENT_SCHEMA_VERSION
+        try:
+            with self.get_connection(write=False) as conn:
+                row = conn.execute(
+                    "SELECT (SELECT user_version FROM pragma_user_version), "
+                    "(SELECT MAX(version) FROM schema_version)"
+                ).fetchone()
+        except sqlite3.Error:
+            return False            # e.g. no schema_version table yet
+        stamped, version = row[0], row[1]
+        return (stamped >= CURRENT_SCHEMA_VERSION
+                and version is not None and version >= CURRENT_SCHEMA_VERSION)
+
+    def _mark_schema_current(self):
+        """Stamp PRAGMA user_version after all migrations have succeeded."""
+        from db_migrations import CURRENT_SCHEMA_VERSION
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA user_version = {:d}".format(CURRENT_SCHEMA_VERSION))
+
     def _run_versioned_migrations(self):
         """Run the versioned migration runner (elements.phash, insertion_log)."""
         from db_migrations import run_migrations
@@ -663,7 +1072,9 @@ class DatabaseManager(object):
                 "INSERT INTO stacks (name, path) VALUES (?, ?)",
                 (name, path)
             )
-            return cursor.lastrowid
+            stack_id = cursor.lastrowid
+        self._invalidate_tree_cache()
+        return stack_id
     
     def get_all_stacks(self):
         """
@@ -672,25 +1083,79 @@ class DatabaseManager(object):
         Returns:
             list: List of stack dictionaries
         """
-        with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM stacks ORDER BY name")
-            return [dict(row) for row in cursor.fetchall()]
+        return list(map(dict, self._cached_stacks()))
     
     def get_stack_by_id(self, stack_id):
         """Get stack by ID."""
-        with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM stacks WHERE stack_id = ?", (stack_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        for stack in self._cached_stacks():
+            if stack['stack_id'] == stack_id:
+                return dict(stack)
+        # Not in the cached rows: another client may have created it within
+        # the TTL, so ask the table rather than report it missing.
+        with self.get_connection(write=False) as conn:
+            row = conn.execute("SELECT * FROM stacks WHERE stack_id = ?", (stack_id,)).fetchone()
+        if row is None:
+            return None
+        self.after_commit(self._clear_tree_cache)
+        return dict(row)
     
     def delete_stack(self, stack_id):
         """Delete stack (cascades to lists and elements)."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM stacks WHERE stack_id = ?", (stack_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        self._invalidate_tree_cache()
+        self._invalidate_tags_cache()
+        return deleted
+
+    def _cached_stacks(self):
+        """All stack rows, served from the TTL cache when fresh."""
+        if self._in_transaction():
+            with self.get_connection(write=False) as conn:
+                return _dict_rows(conn, "SELECT * FROM stacks ORDER BY name")
+        cached = self._stack_cache
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        generation = self._tree_generation
+        with self.get_connection(write=False) as conn:
+            rows = _dict_rows(conn, "SELECT * FROM stacks ORDER BY name")
+        if generation == self._tree_generation:
+            self._stack_cache = (now + self._TREE_CACHE_TTL, rows)
+        return rows
+
+    def _in_transaction(self):
+        """
+        True inside transaction() on this thread.
+
+        The pinned connection sees the block's uncommitted rows, so the TTL
+        caches are neither read nor filled there.
+        """
+        return getattr(self._local, 'conn', None) is not None
+
+    def _invalidate_tree_cache(self):
+        """
+        Drop cached stack/list rows after a local write to either table.
+
+        Call after the write's get_connection() block; inside transaction()
+        the drop waits for the COMMIT.
+        """
+        self.after_commit(self._clear_tree_cache)
+
+    def _clear_tree_cache(self):
+        self._tree_generation += 1
+        self._stack_cache = None
+        self._lists_cache = {}
+        self._hierarchy_cache = {}
+
+    def _invalidate_tags_cache(self):
+        """Drop the cached get_all_tags result after a committed tag change."""
+        self.after_commit(self._clear_tags_cache)
+
+    def _clear_tags_cache(self):
+        self._tags_generation += 1
+        self._tags_cache = None
     
     # ======================
     # LIST OPERATIONS
@@ -714,7 +1179,9 @@ class DatabaseManager(object):
                 "INSERT INTO lists (stack_fk, name, parent_list_fk) VALUES (?, ?, ?)",
                 (stack_id, name, parent_list_id)
             )
-            return cursor.lastrowid
+            list_id = cursor.lastrowid
+        self._invalidate_tree_cache()
+        return list_id
     
     def get_lists_by_stack(self, stack_id, parent_list_id=None):
         """
@@ -728,22 +1195,55 @@ class DatabaseManager(object):
         Returns:
             list: List of list dictionaries
         """
+        key = (stack_id, parent_list_id)
+        use_cache = not self._in_transaction()
+        cached = self._lists_cache.get(key) if use_cache else None
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return list(map(dict, cached[1]))
+        generation = self._tree_generation
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
             if parent_list_id is None:
                 # Get top-level lists (no parent)
-                cursor.execute(
+                rows = _dict_rows(
+                    conn,
                     "SELECT * FROM lists WHERE stack_fk = ? AND parent_list_fk IS NULL ORDER BY name",
                     (stack_id,)
                 )
             else:
                 # Get sub-lists of a specific parent
-                cursor.execute(
+                rows = _dict_rows(
+                    conn,
                     "SELECT * FROM lists WHERE stack_fk = ? AND parent_list_fk = ? ORDER BY name",
                     (stack_id, parent_list_id)
                 )
-            return [dict(row) for row in cursor.fetchall()]
+        if use_cache and generation == self._tree_generation:
+            self._lists_cache[key] = (now + self._TREE_CACHE_TTL, rows)
+        return list(map(dict, rows))
     
+    def get_all_lists_for_stack(self, stack_id):
+        """
+        Get a stack's whole list tree in one query.
+
+        Args:
+            stack_id (int): Stack ID
+
+        Returns:
+            dict: parent_list_fk -> child list dictionaries sorted by name.
+                  Top-level lists are under None; use
+                  ``children.get(list_id, [])`` to walk the tree.
+        """
+        with self.get_connection(write=False) as conn:
+            rows = _dict_rows(
+                conn,
+                "SELECT * FROM lists WHERE stack_fk = ? ORDER BY parent_list_fk, name",
+                (stack_id,)
+            )
+        children = collections.defaultdict(list)
+        for row in rows:
+            children[row['parent_list_fk']].append(row)
+        return dict(children)
+
     def get_sub_lists(self, parent_list_id):
         """
         Get all direct sub-lists of a parent list.
@@ -755,12 +1255,11 @@ class DatabaseManager(object):
             list: List of sub-list dictionaries
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            return _dict_rows(
+                conn,
                 "SELECT * FROM lists WHERE parent_list_fk = ? ORDER BY name",
                 (parent_list_id,)
             )
-            return [dict(row) for row in cursor.fetchall()]
     
     def get_list_by_id(self, list_id):
         """Get list by ID."""
@@ -772,57 +1271,56 @@ class DatabaseManager(object):
     
     def get_list_hierarchy(self, list_id):
         """Return list ancestors from top-level to the specified list."""
-        hierarchy = []
-        with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            current_id = list_id
-            while current_id:
-                cursor.execute("SELECT * FROM lists WHERE list_id = ?", (current_id,))
-                row = cursor.fetchone()
-                if not row:
-                    break
-                hierarchy.append(dict(row))
-                current_id = row['parent_list_fk']
-        hierarchy.reverse()
-        return hierarchy
+        if not list_id:
+            return []
+        use_cache = not self._in_transaction()
+        cached = self._hierarchy_cache.get(list_id) if use_cache else None
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return list(map(dict, cached[1]))
+        generation = self._tree_generation
+        with self.get_connection(write=False) as conn:
+            rows = _dict_rows(conn, _LIST_ANCESTORS_SQL, (list_id,))
+        if use_cache and generation == self._tree_generation:
+            if len(self._hierarchy_cache) >= self._HIERARCHY_CACHE_MAX:
+                self._hierarchy_cache = {}
+            self._hierarchy_cache[list_id] = (now + self._TREE_CACHE_TTL, rows)
+        return list(map(dict, rows))
+
+    def _list_path_parts(self, list_id):
+        """(stack_name, stack_path, [list names top-down]) in one query."""
+        if not list_id:
+            return None, None, []
+        with self.get_connection(write=False) as conn:
+            rows = conn.execute(_LIST_PATH_SQL, (list_id,)).fetchall()
+        if not rows:
+            return None, None, []
+        # The top-level list decides the stack, as before.
+        return rows[0][0], rows[0][1], [row[2] for row in rows]
 
     def get_repository_path_for_list(self, list_id):
         """Return the repository path on disk for a list hierarchy."""
-        hierarchy = self.get_list_hierarchy(list_id)
-        if not hierarchy:
-            return None
-
-        top_entry = hierarchy[0]
-        stack = self.get_stack_by_id(top_entry['stack_fk']) if top_entry else None
-        stack_path = stack.get('path') if stack else None
-        if not stack_path:
+        _stack_name, stack_path, names = self._list_path_parts(list_id)
+        if not names or not stack_path:
             return None
-
-        parts = [stack_path] + [entry['name'] for entry in hierarchy]
-        path = parts[0]
-        if len(parts) > 1:
-            path = os.path.join(*parts)
-        return os.path.normpath(path)
+        return os.path.normpath(os.path.join(stack_path, *names))
 
     def get_list_display_path(self, list_id, separator=' / '):
         """Return a human-readable Stack/List path."""
-        hierarchy = self.get_list_hierarchy(list_id)
-        if not hierarchy:
+        stack_name, _stack_path, names = self._list_path_parts(list_id)
+        if not names:
             return ''
-
-        stack = self.get_stack_by_id(hierarchy[0]['stack_fk']) if hierarchy else None
-        names = []
-        if stack and stack.get('name'):
-            names.append(stack['name'])
-        names.extend([entry['name'] for entry in hierarchy])
-        return separator.join(names)
+        return separator.join(([stack_name] if stack_name else []) + names)
 
     def delete_list(self, list_id):
         """Delete list (cascades to elements)."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM lists WHERE list_id = ?", (list_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+        self._invalidate_tree_cache()
+        self._invalidate_tags_cache()
+        return deleted
     
     # ======================
     # ELEMENT OPERATIONS
@@ -849,9 +1347,7 @@ class DatabaseManager(object):
             values = [list_id, name, element_type]
             
             for key, value in kwargs.items():
-                if key in ['filepath_soft', 'filepath_hard', 'is_hard_copy', 
-                          'frame_range', 'format', 'comment', 'tags', 
-                          'preview_path', 'gif_preview_path', 'video_preview_path', 'geometry_preview_path', 'is_deprecated', 'file_size']:
+                if key in self.INSERTABLE_ELEMENT_COLUMNS:
                     fields.append(key)
                     values.append(value)
 
@@ -863,14 +1359,13 @@ class DatabaseManager(object):
             fields.append('updated_at')
             values.append(self._now_iso())
 
-            placeholders = ','.join(['?'] * len(values))
-            field_names = ','.join(fields)
-
-            cursor.execute(
-                "INSERT INTO elements ({}) VALUES ({})".format(field_names, placeholders),
-                values
-            )
-            return cursor.lastrowid
+            cursor.execute(_insert_element_sql(tuple(fields)), values)
+            if kwargs.get('tags'):
+                self._split_pending_tags(conn)
+            element_id = cursor.lastrowid
+        if kwargs.get('tags'):
+            self._invalidate_tags_cache()
+        return element_id
     
     def get_elements_by_list(self, list_id, include_deprecated=False, limit=None, offset=0):
         """
@@ -886,7 +1381,6 @@ class DatabaseManager(object):
             list: List of element dictionaries
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
             query = "SELECT * FROM elements WHERE list_fk = ?"
             params = [list_id]
             
@@ -899,8 +1393,35 @@ class DatabaseManager(object):
                 query += " LIMIT ? OFFSET ?"
                 params.extend([limit, offset])
             
-            cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return _dict_rows(conn, query, params)
+
+    def get_elements_by_lists(self, list_ids, include_deprecated=False):
+        """
+        Get elements for several lists at once.
+
+        Args:
+            list_ids (iterable): List IDs
+            include_deprecated (bool): Include deprecated elements
+
+        Returns:
+            dict: {list_id: [element dicts ordered by name]}; every requested
+                list_id is present, empty lists included
+        """
+        list_ids = list(dict.fromkeys(list_ids))
+        grouped = {list_id: [] for list_id in list_ids}
+        if not list_ids:
+            return grouped
+        deprecated_clause = "" if include_deprecated else " AND is_deprecated = 0"
+        with self.get_connection(write=False) as conn:
+            # Chunked to stay under SQLITE_MAX_VARIABLE_NUMBER on old builds.
+            for start in range(0, len(list_ids), _MAX_IN_PARAMS):
+                chunk = list_ids[start:start + _MAX_IN_PARAMS]
+                query = ("SELECT * FROM elements WHERE list_fk IN ({}){} "
+                         "ORDER BY list_fk, name".format(
+                             ','.join('?' * len(chunk)), deprecated_clause))
+                for element in _dict_rows(conn, query, chunk):
+                    grouped[element['list_fk']].append(element)
+        return grouped
     
     def get_elements_count(self, list_id, include_deprecated=False):
         """
@@ -952,12 +1473,12 @@ class DatabaseManager(object):
             list: List of element dicts.
         """
         with self.get_connection(write=False) as conn:
-            rows = conn.execute(
+            return _dict_rows(
+                conn,
                 "SELECT * FROM elements WHERE is_deprecated = 0 "
                 "ORDER BY created_at DESC, element_id DESC LIMIT ?",
                 (limit,)
-            ).fetchall()
-            return [dict(r) for r in rows]
+            )
 
     def update_element(self, element_id, _actor=None, **kwargs):
         """
@@ -981,15 +1502,13 @@ class DatabaseManager(object):
 
         with self.get_connection() as conn:
             cursor = conn.cursor()
-
-            set_clause = ', '.join(["{} = ?".format(k) for k in updates.keys()])
             values = list(updates.values()) + [element_id]
-
-            cursor.execute(
-                "UPDATE elements SET {} WHERE element_id = ?".format(set_clause),
-                values
-            )
+            cursor.execute(_update_element_sql(tuple(updates)), values)
             updated = cursor.rowcount > 0
+            if 'tags' in updates:
+                self._split_pending_tags(conn)
+        if 'tags' in updates:
+            self._invalidate_tags_cache()
 
         if updated and _actor:
             self.log_activity(_actor, "metadata_edit", "element", element_id,
@@ -1013,6 +1532,7 @@ class DatabaseManager(object):
             cursor = conn.cursor()
             cursor.execute("DELETE FROM elements WHERE element_id = ?", (element_id,))
             deleted = cursor.rowcount > 0
+        self._invalidate_tags_cache()
 
         if deleted and actor:
             self.log_activity(actor, "delete", "element", element_id)
@@ -1126,16 +1646,11 @@ class DatabaseManager(object):
             property_name = "name"
 
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-
             if match_type == 'loose':
-                query = "SELECT * FROM elements WHERE {} LIKE ? ORDER BY name".format(property_name)
-                cursor.execute(query, ('%' + search_text + '%',))
-            else:  # strict
-                query = "SELECT * FROM elements WHERE {} = ? ORDER BY name".format(property_name)
-                cursor.execute(query, (search_text,))
-            
-            return [dict(row) for row in cursor.fetchall()]
+                return _dict_rows(conn, _search_elements_sql(property_name, False),
+                                  ('%' + search_text + '%',))
+            # strict
+            return _dict_rows(conn, _search_elements_sql(property_name, True), (search_text,))
 
     # Tag boundary match: normalize ", " to "," then wrap and LIKE %,tag,%
     # The bound value must be routed through _escape_like() so a literal
@@ -1216,7 +1731,7 @@ class DatabaseManager(object):
             sql += " LIMIT ? OFFSET ?"
             params = params + [limit, offset]
         with self.get_connection(write=False) as conn:
-            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+            return _dict_rows(conn, sql, params)
 
     def count_elements_advanced(self, filter_spec):
         where, params = self._build_filter_where(filter_spec)
@@ -1323,12 +1838,11 @@ class DatabaseManager(object):
             list: History records
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            return _dict_rows(
+                conn,
                 "SELECT * FROM ingestion_history ORDER BY ingested_at DESC LIMIT ?",
                 (limit,)
             )
-            return [dict(row) for row in cursor.fetchall()]
     
     def export_history_to_csv(self, output_path, limit=None):
         """
@@ -1340,20 +1854,24 @@ class DatabaseManager(object):
         """
         import csv
         
-        with self.get_connection() as conn:
+        with self.get_connection(write=False) as conn:
             cursor = conn.cursor()
-            query = "SELECT * FROM ingestion_history ORDER BY ingested_at DESC"
-            if limit:
-                query += " LIMIT {}".format(limit)
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            
-            if rows:
-                with open(output_path, 'wb') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=rows[0].keys())
-                    writer.writeheader()
-                    for row in rows:
-                        writer.writerow(dict(row))
+            # LIMIT -1 is "no limit", so every call shares one statement
+            cursor.execute(
+                "SELECT * FROM ingestion_history ORDER BY ingested_at DESC LIMIT ?",
+                (int(limit) if limit else -1,)
+            )
+            batch = cursor.fetchmany(1000)
+            if not batch:
+                return
+
+            # Stream rows straight from the cursor so memory stays flat
+            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow([column[0] for column in cursor.description])
+                while batch:
+                    writer.writerows(batch)
+                    batch = cursor.fetchmany(1000)
     
     # Favorites management
     
@@ -1371,19 +1889,13 @@ class DatabaseManager(object):
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Check if already favorited
+            # UNIQUE(element_fk, machine_name, user_name) skips duplicates
             cursor.execute(
-                "SELECT favorite_id FROM favorites WHERE element_fk = ? AND user_name = ? AND machine_name = ?",
+                "INSERT OR IGNORE INTO favorites (element_fk, user_name, machine_name) VALUES (?, ?, ?)",
                 (element_id, user_name or '', machine_name or '')
             )
-            if cursor.fetchone():
+            if cursor.rowcount == 0:
                 return None  # Already favorited
-            
-            cursor.execute(
-                "INSERT INTO favorites (element_fk, user_name, machine_name) VALUES (?, ?, ?)",
-                (element_id, user_name or '', machine_name or '')
-            )
             conn.commit()
             return cursor.lastrowid
     
@@ -1440,14 +1952,12 @@ class DatabaseManager(object):
             list: List of element dicts
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+            return _dict_rows(conn, """
                 SELECT e.* FROM elements e
                 INNER JOIN favorites f ON e.element_id = f.element_fk
                 WHERE f.user_name = ? AND f.machine_name = ?
                 ORDER BY f.created_at DESC
             """, (user_name or '', machine_name or ''))
-            return [dict(row) for row in cursor.fetchall()]
     
     # Playlists management
     
@@ -1481,9 +1991,7 @@ class DatabaseManager(object):
             list: List of playlist dicts
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM playlists ORDER BY created_at DESC")
-            return [dict(row) for row in cursor.fetchall()]
+            return _dict_rows(conn, "SELECT * FROM playlists ORDER BY created_at DESC")
     
     def get_playlist_by_id(self, playlist_id):
         """
@@ -1501,24 +2009,30 @@ class DatabaseManager(object):
             row = cursor.fetchone()
             return dict(row) if row else None
     
-    def update_playlist(self, playlist_id, name=None, description=None):
+    def update_playlist(self, playlist_id, name=None, description=_UNSET):
         """
         Update playlist details.
         
         Args:
             playlist_id (int): Playlist ID
             name (str): New name (optional)
-            description (str): New description (optional)
+            description (str): New description (optional; None clears it)
             
         Returns:
             bool: True if updated
         """
+        keep_description = description is _UNSET
+        if not name and keep_description:
+            return False
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            if name:
-                cursor.execute("UPDATE playlists SET name = ? WHERE playlist_id = ?", (name, playlist_id))
-            if description is not None:
-                cursor.execute("UPDATE playlists SET description = ? WHERE playlist_id = ?", (description, playlist_id))
+            cursor.execute(
+                "UPDATE playlists SET name = COALESCE(?, name), "
+                "description = CASE WHEN ? THEN description ELSE ? END "
+                "WHERE playlist_id = ?",
+                (name or None, keep_description,
+                 None if keep_description else description, playlist_id)
+            )
             conn.commit()
             return cursor.rowcount > 0
     
@@ -1555,25 +2069,24 @@ class DatabaseManager(object):
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Check if already in playlist
+            # One statement: skip duplicates (UNIQUE(playlist_fk, element_fk)
+            # serves the NOT EXISTS probe) and append after the current max
+            # order unless an explicit order_index is given.
             cursor.execute(
-                "SELECT item_id FROM playlist_items WHERE playlist_fk = ? AND element_fk = ?",
-                (playlist_id, element_id)
+                """
+                INSERT INTO playlist_items (playlist_fk, element_fk, order_index)
+                SELECT ?, ?, COALESCE(
+                    ?,
+                    (SELECT MAX(order_index) + 1 FROM playlist_items WHERE playlist_fk = ?),
+                    1)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM playlist_items WHERE playlist_fk = ? AND element_fk = ?
+                )
+                """,
+                (playlist_id, element_id, order_index, playlist_id, playlist_id, element_id)
             )
-            if cursor.fetchone():
+            if cursor.rowcount == 0:
                 return None  # Already in playlist
-            
-            # Get max order if not specified
-            if order_index is None:
-                cursor.execute("SELECT MAX(order_index) FROM playlist_items WHERE playlist_fk = ?", (playlist_id,))
-                max_order = cursor.fetchone()[0]
-                order_index = (max_order or 0) + 1
-            
-            cursor.execute(
-                "INSERT INTO playlist_items (playlist_fk, element_fk, order_index) VALUES (?, ?, ?)",
-                (playlist_id, element_id, order_index)
-            )
             conn.commit()
             return cursor.lastrowid
     
@@ -1608,15 +2121,13 @@ class DatabaseManager(object):
             list: List of element dicts with order_index
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+            return _dict_rows(conn, """
                 SELECT e.*, pi.order_index, pi.added_at as playlist_added_at
                 FROM elements e
                 INNER JOIN playlist_items pi ON e.element_id = pi.element_fk
                 WHERE pi.playlist_fk = ?
                 ORDER BY pi.order_index ASC
             """, (playlist_id,))
-            return [dict(row) for row in cursor.fetchall()]
     
     def is_element_in_playlist(self, playlist_id, element_id):
         """
@@ -1649,13 +2160,13 @@ class DatabaseManager(object):
             bool: True if successful
         """
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            for index, element_id in enumerate(element_order):
-                cursor.execute(
-                    "UPDATE playlist_items SET order_index = ? WHERE playlist_fk = ? AND element_fk = ?",
-                    (index, playlist_id, element_id)
-                )
-            conn.commit()
+            # One executemany in the block's single transaction; get_connection
+            # commits, so the whole reorder lands (or rolls back) at once.
+            conn.executemany(
+                "UPDATE playlist_items SET order_index = ? WHERE playlist_fk = ? AND element_fk = ?",
+                [(index, playlist_id, element_id)
+                 for index, element_id in enumerate(element_order)]
+            )
             return True
     
     # ==================== Tag Management Methods ====================
@@ -1663,22 +2174,87 @@ class DatabaseManager(object):
     def get_all_tags(self):
         """
         Get all unique tags used across all elements.
+
+        Spellings differing only in case ("Fire", "fire") are kept apart, as
+        they are stored; within one element they collapse to the first.
         
         Returns:
             list: Sorted list of unique tags
         """
+        use_cache = not self._in_transaction()
+        cached = self._tags_cache if use_cache else None
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return list(cached[1])
+        self._refresh_element_tags()
+        generation = self._tags_generation
         with self.get_connection(write=False) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT DISTINCT tags FROM elements WHERE tags IS NOT NULL AND tags != ''")
-            
-            # Parse comma-separated tags
-            all_tags = set()
-            for row in cursor.fetchall():
-                if row['tags']:
-                    tags = [t.strip() for t in row['tags'].split(',') if t.strip()]
-                    all_tags.update(tags)
-            
-            return sorted(list(all_tags), key=lambda x: x.lower())
+            # element_tags.tag is NOCASE; compare BINARY to keep each spelling
+            cursor.execute(
+                "SELECT DISTINCT tag COLLATE BINARY FROM element_tags "
+                "ORDER BY 1 COLLATE NOCASE, 1")
+            tags = [row[0] for row in cursor.fetchall()]
+        if use_cache and generation == self._tags_generation:
+            self._tags_cache = (now + self._TREE_CACHE_TTL, tags)
+        return list(tags)
+
+    def _refresh_element_tags(self):
+        """
+        Split elements queued in element_tags_pending into element_tags.
+
+        StaX's own write paths split their rows as they write; the queue
+        only holds edits from other clients (raw SQL, older StaX builds),
+        so the common case is an empty queue and one indexed probe. When
+        the database cannot be written (read-only share or file) the index
+        is read as it stands.
+        """
+        with self.get_connection(write=False) as conn:
+            if conn.execute("SELECT 1 FROM element_tags_pending LIMIT 1").fetchone() is None:
+                return
+        try:
+            with self.get_connection() as conn:
+                if not conn.in_transaction:
+                    # Hold the write lock across read-split-dequeue so a tag edit
+                    # queued meanwhile is not dequeued unprocessed.
+                    conn.execute("BEGIN IMMEDIATE")
+                self._split_pending_tags(conn)
+        except (sqlite3.Error, RuntimeError, OSError) as exc:
+            logger.debug("Tag index refresh skipped, reading current index: %s", exc)
+            return
+        self._invalidate_tags_cache()
+
+    @staticmethod
+    def _split_pending_tags(conn):
+        """Split queued elements' tags into element_tags on a write connection."""
+        rows = conn.execute(
+            "SELECT p.element_fk, e.tags FROM element_tags_pending AS p "
+            "LEFT JOIN elements AS e ON e.element_id = p.element_fk"
+        ).fetchall()
+        if not rows:
+            return
+        ids = [(row[0],) for row in rows]
+        conn.executemany("DELETE FROM element_tags WHERE element_fk = ?", ids)
+        conn.executemany(
+            "INSERT OR IGNORE INTO element_tags (tag, element_fk) VALUES (?, ?)",
+            [(tag.strip(), row[0]) for row in rows
+             for tag in (row[1] or '').split(',') if tag.strip()]
+        )
+        conn.executemany("DELETE FROM element_tags_pending WHERE element_fk = ?", ids)
+
+    def index_pending_tags(self, conn):
+        """
+        Index elements.tags written through raw SQL on conn.
+
+        For writers outside DatabaseManager (e.g. sync bundle import) that
+        insert or update elements directly. Call inside their transaction():
+        the get_all_tags cache is dropped once it commits.
+
+        Args:
+            conn (sqlite3.Connection): The transaction's write connection
+        """
+        self._split_pending_tags(conn)
+        self._invalidate_tags_cache()
     
     def search_elements_by_tags(self, tags, match_all=False):
         """
@@ -1691,49 +2267,28 @@ class DatabaseManager(object):
         Returns:
             list: List of matching element dicts
         """
-        if not tags:
+        wanted = {}
+        for tag in tags:
+            tag = tag.strip()
+            if tag:
+                wanted.setdefault(tag.lower(), tag)  # element_tags.tag is NOCASE
+        if not wanted:
             return []
+        self._refresh_element_tags()
+
+        placeholders = ','.join('?' * len(wanted))
+        params = list(wanted.values())
+        if match_all:
+            # Element must carry every tag
+            matches = ("SELECT element_fk FROM element_tags WHERE tag IN ({}) "
+                       "GROUP BY element_fk HAVING COUNT(*) = ?".format(placeholders))
+            params.append(len(wanted))
+        else:
+            matches = "SELECT element_fk FROM element_tags WHERE tag IN ({})".format(placeholders)
 
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-
-            if match_all:
-                # Element must contain all specified tags
-                query = "SELECT * FROM elements WHERE "
-                conditions = []
-                params = []
-                
-                for tag in tags:
-                    conditions.append("(tags LIKE ? OR tags LIKE ? OR tags LIKE ? OR tags = ?)")
-                    # Match: start, middle, end, or exact
-                    params.extend([
-                        tag + ',%',  # At start
-                        '%,' + tag + ',%',  # In middle
-                        '%,' + tag,  # At end
-                        tag  # Exact match (single tag)
-                    ])
-                
-                query += " AND ".join(conditions)
-                cursor.execute(query, params)
-            else:
-                # Element must contain at least one tag
-                query = "SELECT * FROM elements WHERE "
-                conditions = []
-                params = []
-                
-                for tag in tags:
-                    conditions.append("(tags LIKE ? OR tags LIKE ? OR tags LIKE ? OR tags = ?)")
-                    params.extend([
-                        tag + ',%',
-                        '%,' + tag + ',%',
-                        '%,' + tag,
-                        tag
-                    ])
-                
-                query += " OR ".join(conditions)
-                cursor.execute(query, params)
-            
-            return [dict(row) for row in cursor.fetchall()]
+            return _dict_rows(
+                conn, "SELECT * FROM elements WHERE element_id IN ({})".format(matches), params)
     
     def get_elements_by_tag(self, tag):
         """
@@ -1764,23 +2319,15 @@ class DatabaseManager(object):
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT tags FROM elements WHERE element_id = ?", (element_id,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return False
-            
-            current_tags = row['tags'] or ''
-            tag_list = [t.strip() for t in current_tags.split(',') if t.strip()]
-            
-            # Add tag if not already present
-            if tag not in tag_list:
-                tag_list.append(tag)
-                new_tags = ', '.join(sorted(tag_list, key=lambda x: x.lower()))
-                cursor.execute("UPDATE elements SET tags = ? WHERE element_id = ?", (new_tags, element_id))
-                conn.commit()
-            
-            return True
+            # Read-modify-write in one statement; see _tags_with
+            cursor.execute(
+                "UPDATE elements SET tags = stax_tags_with(tags, ?) WHERE element_id = ?",
+                (tag, element_id)
+            )
+            self._split_pending_tags(conn)
+            changed = cursor.rowcount > 0
+        self._invalidate_tags_cache()
+        return changed
     
     def remove_tag_from_element(self, element_id, tag):
         """
@@ -1799,23 +2346,14 @@ class DatabaseManager(object):
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT tags FROM elements WHERE element_id = ?", (element_id,))
-            row = cursor.fetchone()
-            
-            if not row:
-                return False
-            
-            current_tags = row['tags'] or ''
-            tag_list = [t.strip() for t in current_tags.split(',') if t.strip()]
-            
-            # Remove tag if present
-            if tag in tag_list:
-                tag_list.remove(tag)
-                new_tags = ', '.join(sorted(tag_list, key=lambda x: x.lower())) if tag_list else ''
-                cursor.execute("UPDATE elements SET tags = ? WHERE element_id = ?", (new_tags, element_id))
-                conn.commit()
-            
-            return True
+            cursor.execute(
+                "UPDATE elements SET tags = stax_tags_without(tags, ?) WHERE element_id = ?",
+                (tag, element_id)
+            )
+            self._split_pending_tags(conn)
+            changed = cursor.rowcount > 0
+        self._invalidate_tags_cache()
+        return changed
     
     def replace_element_tags(self, element_id, tags):
         """
@@ -1829,17 +2367,17 @@ class DatabaseManager(object):
             bool: True if successful
         """
         if isinstance(tags, list):
-            tag_list = [t.strip() for t in tags if t.strip()]
-            tags_str = ', '.join(sorted(tag_list, key=lambda x: x.lower()))
+            tags_str = _join_tags(t.strip() for t in tags if t.strip())
         else:
-            tag_list = [t.strip() for t in tags.split(',') if t.strip()]
-            tags_str = ', '.join(sorted(tag_list, key=lambda x: x.lower()))
+            tags_str = _join_tags(_split_tags(tags))
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("UPDATE elements SET tags = ? WHERE element_id = ?", (tags_str, element_id))
-            conn.commit()
-            return cursor.rowcount > 0
+            self._split_pending_tags(conn)
+            changed = cursor.rowcount > 0
+        self._invalidate_tags_cache()
+        return changed
     
     # ==================== User Management Methods ====================
     
@@ -1900,7 +2438,8 @@ class DatabaseManager(object):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM users WHERE username = ? AND is_active = 1",
+                "SELECT password_hash, {} FROM users "
+                "WHERE username = ? AND is_active = 1".format(self._USER_COLUMNS),
                 (username,)
             )
             row = cursor.fetchone()
@@ -1911,8 +2450,9 @@ class DatabaseManager(object):
             if not verify_password(stored, password):
                 return None
 
-            # Transparent upgrade of a legacy unsalted hash on successful login.
-            if is_legacy_hash(stored):
+            # Transparent upgrade of a legacy unsalted or low-iteration hash
+            # on successful login.
+            if needs_rehash(stored):
                 try:
                     cursor.execute(
                         "UPDATE users SET password_hash = ? WHERE user_id = ?",
@@ -1926,7 +2466,9 @@ class DatabaseManager(object):
                 (row['user_id'],)
             )
             conn.commit()
-            return dict(row)
+            user = dict(row)
+            del user['password_hash']
+            return user
     
     def get_user_by_id(self, user_id):
         """
@@ -1940,7 +2482,8 @@ class DatabaseManager(object):
         """
         with self.get_connection(write=False) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+            cursor.execute(
+                "SELECT {} FROM users WHERE user_id = ?".format(self._USER_COLUMNS), (user_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
     
@@ -1956,7 +2499,8 @@ class DatabaseManager(object):
         """
         with self.get_connection(write=False) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
+            cursor.execute(
+                "SELECT {} FROM users WHERE username = ?".format(self._USER_COLUMNS), (username,))
             row = cursor.fetchone()
             return dict(row) if row else None
     
@@ -1968,9 +2512,7 @@ class DatabaseManager(object):
             list: List of user dicts
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM users ORDER BY username")
-            return [dict(row) for row in cursor.fetchall()]
+            return _dict_rows(conn, "SELECT {} FROM users ORDER BY username".format(self._USER_COLUMNS))
     
     def update_user(self, user_id, **kwargs):
         """
@@ -2145,6 +2687,48 @@ class DatabaseManager(object):
             conn.commit()
             return True
     
+    def get_settings(self, keys):
+        """
+        Get several settings in one query.
+
+        Args:
+            keys (iterable): Setting keys
+
+        Returns:
+            dict: {key: value} for the keys that exist
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+        with self.get_connection(write=False) as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # plain (key, value) tuples feed dict()
+            return dict(cursor.execute(
+                "SELECT key, value FROM settings WHERE key IN ({})".format(
+                    ", ".join("?" * len(keys))),
+                keys,
+            ))
+
+    def set_settings(self, values):
+        """
+        Set several settings in one transaction.
+
+        Args:
+            values (dict): {key: value}
+
+        Returns:
+            bool: True if successful
+        """
+        if not values:
+            return True
+        with self.get_connection() as conn:
+            conn.executemany(
+                """INSERT OR REPLACE INTO settings (key, value, updated_at)
+                   VALUES (?, ?, CURRENT_TIMESTAMP)""",
+                list(values.items()),
+            )
+            return True
+
     def get_all_settings(self):
         """
         Get all settings from database.
@@ -2154,9 +2738,8 @@ class DatabaseManager(object):
         """
         with self.get_connection(write=False) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT key, value FROM settings")
-            rows = cursor.fetchall()
-            return {row['key']: row['value'] for row in rows}
+            cursor.row_factory = None  # plain (key, value) tuples feed dict()
+            return dict(cursor.execute("SELECT key, value FROM settings"))
 
     # ============================================================
     # Consolidated methods merged from db_manager_additions (C1)
@@ -2176,8 +2759,8 @@ class DatabaseManager(object):
         Returns list[dict] keys: element_id, name, list_name, format, type, count.
         """
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            return _dict_rows(
+                conn,
                 """
                 SELECT e.element_id,
                        e.name,
@@ -2194,13 +2777,12 @@ class DatabaseManager(object):
                 """,
                 (n,),
             )
-            return [dict(row) for row in cursor.fetchall()]
 
     def get_insertions_by_month(self):
         """Insertion counts by calendar month. Returns list[dict] keys: month, count."""
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            return _dict_rows(
+                conn,
                 """
                 SELECT strftime('%Y-%m', inserted_at) AS month,
                        COUNT(*)                        AS count
@@ -2209,13 +2791,12 @@ class DatabaseManager(object):
                 ORDER BY month ASC
                 """
             )
-            return [dict(row) for row in cursor.fetchall()]
 
     def get_insertions_by_user(self):
         """Insertion counts per user. Returns list[dict] keys: username, count, last_active."""
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            return _dict_rows(
+                conn,
                 """
                 SELECT COALESCE(u.username, 'Guest') AS username,
                        COUNT(i.log_id)               AS count,
@@ -2226,7 +2807,6 @@ class DatabaseManager(object):
                 ORDER BY count DESC
                 """
             )
-            return [dict(row) for row in cursor.fetchall()]
 
     def get_total_insertions(self):
         """Total number of rows in insertion_log."""
@@ -2278,12 +2858,11 @@ class DatabaseManager(object):
     def get_elements_with_phash(self):
         """All elements that have a stored phash (SP2 duplicate detection)."""
         with self.get_connection(write=False) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+            return _dict_rows(
+                conn,
                 "SELECT element_id, name, list_fk, format, phash, preview_path "
                 "FROM elements WHERE phash IS NOT NULL AND phash != ''"
             )
-            return [dict(row) for row in cursor.fetchall()]
 
     # ======================
     # SAVED SEARCHES (EP2)
@@ -2636,16 +3215,10 @@ class DatabaseManager(object):
 
     def _list_ancestry(self, list_id, conn):
         """Return ([list_id, parent, grandparent, ...] nearest-first, stack_fk)."""
-        chain, cur_id, stack_fk = [], list_id, None
-        while cur_id is not None:
-            row = conn.execute("SELECT list_id, parent_list_fk, stack_fk FROM lists WHERE list_id = ?",
-                               (cur_id,)).fetchone()
-            if not row:
-                break
-            chain.append(row["list_id"])
-            stack_fk = row["stack_fk"]
-            cur_id = row["parent_list_fk"]
-        return chain, stack_fk
+        rows = conn.execute(_LIST_ANCESTORS_SQL, (list_id,)).fetchall()
+        if not rows:
+            return [], None
+        return [row["list_id"] for row in reversed(rows)], rows[0]["stack_fk"]
 
     def get_effective_metadata(self, element_id):
         with self.get_connection(write=False) as conn:
@@ -2724,6 +3297,9 @@ class DatabaseManager(object):
                 existing = (cur.fetchone()[0] or "")
                 merged = self._merge_tags(existing, tmpl_tags)
                 conn.execute("UPDATE elements SET tags = ? WHERE element_id = ?", (merged, element_id))
+                self._split_pending_tags(conn)
+        if tmpl_tags:
+            self._invalidate_tags_cache()
 
     @staticmethod
     def _merge_tags(existing, added):
@@ -2944,7 +3520,7 @@ class DatabaseManager(object):
             sql += " WHERE is_read = 0"
         sql += " ORDER BY notification_id DESC LIMIT ?"
         with self.get_connection(write=False) as conn:
-            return [dict(r) for r in conn.execute(sql, (limit,)).fetchall()]
+            return _dict_rows(conn, sql, (limit,))
 
     def unread_notification_count(self):
         with self.get_connection(write=False) as conn:
@@ -2977,7 +3553,7 @@ class DatabaseManager(object):
             sql += " WHERE enabled = 1"
         sql += " ORDER BY watch_id"
         with self.get_connection(write=False) as conn:
-            return [dict(r) for r in conn.execute(sql).fetchall()]
+            return _dict_rows(conn, sql)
 
     def update_watch_folder(self, watch_id, **fields):
         updates = {k: v for k, v in fields.items() if k in self._WATCH_FIELDS}
@@ -3300,7 +3876,7 @@ class DatabaseManager(object):
                "ORDER BY at DESC, activity_id DESC LIMIT ?".format(where))
         params.append(limit)
         with self.get_connection(write=False) as conn:
-            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+            return _dict_rows(conn, sql, params)
 
     # ======================
     # SEARCH ANALYTICS (EP9 — search success / zero-result stats)
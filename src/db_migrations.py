@@ -17,7 +17,7 @@ import sqlite3
 log = logging.getLogger(__name__)
 
 # Bump this every time a new _migrate_vN is appended below.
-CURRENT_SCHEMA_VERSION = 25
+CURRENT_SCHEMA_VERSION = 30
 
 # Default color-label palette (EP1). Seed order defines labels.sort_order.
 DEFAULT_LABELS = [
@@ -655,6 +655,152 @@ def _migrate_v25(conn):
     log.info("Migration v25: created search_events table + index")
 
 
+def _migrate_v26(conn):
+    """v25 -> v26: composite lists(stack_fk, parent_list_fk, name) index.
+
+    get_lists_by_stack filters on both columns and sorts by name, so one
+    index range scan replaces an idx_lists_stack lookup + filter + sort.
+    idx_lists_stack is a prefix of the new index and is dropped;
+    idx_lists_parent stays for get_sub_lists and the parent FK cascade.
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_lists_stack_parent "
+        "ON lists(stack_fk, parent_list_fk, name)")
+    conn.execute("DROP INDEX IF EXISTS idx_lists_stack")
+    conn.commit()
+    log.info("Migration v26: replaced idx_lists_stack with idx_lists_stack_parent")
+
+
+def _migrate_v27(conn):
+    """v26 -> v27: normalized element_tags(tag, element_fk) for indexed tag search.
+
+    elements.tags stays the source of truth. Triggers only queue changed
+    elements in element_tags_pending -- SQLite cannot split the comma list
+    inside a trigger -- so writes from any client (raw SQL, bundle import,
+    older StaX builds) are picked up; DatabaseManager splits its own writes
+    immediately and drains the rest of the queue before each tag read.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS element_tags (
+            tag        TEXT NOT NULL COLLATE NOCASE,
+            element_fk INTEGER NOT NULL,
+            PRIMARY KEY (tag, element_fk),
+            FOREIGN KEY (element_fk) REFERENCES elements(element_id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_element_tags_element ON element_tags(element_fk)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS element_tags_pending (
+            element_fk INTEGER PRIMARY KEY
+                REFERENCES elements(element_id) ON DELETE CASCADE
+        )
+        """
+    )
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(elements)")}
+    if "tags" in cols:
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_element_tags_insert
+            AFTER INSERT ON elements
+            WHEN NEW.tags IS NOT NULL AND NEW.tags != ''
+            BEGIN
+                INSERT OR IGNORE INTO element_tags_pending (element_fk) VALUES (NEW.element_id);
+            END
+            """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_element_tags_update
+            AFTER UPDATE OF tags ON elements
+            WHEN NEW.tags IS NOT OLD.tags
+            BEGIN
+                INSERT OR IGNORE INTO element_tags_pending (element_fk) VALUES (NEW.element_id);
+            END
+            """
+        )
+        # Index the existing library here rather than queueing it, so the
+        # first tag read does not need write access to split it.
+        conn.executemany(
+            "INSERT OR IGNORE INTO element_tags (tag, element_fk) VALUES (?, ?)",
+            [(tag.strip(), element_id) for element_id, tags in conn.execute(
+                "SELECT element_id, tags FROM elements WHERE tags IS NOT NULL AND tags != ''")
+             for tag in tags.split(',') if tag.strip()]
+        )
+    conn.commit()
+    log.info("Migration v27: created element_tags + pending-split triggers")
+
+
+def _migrate_v28(conn):
+    """v27 -> v28: composite indexes that serve ORDER BY without a sort.
+
+    elements(list_fk, is_deprecated, name) answers get_elements_by_list's
+    filter and name order in one range scan; playlist_items(playlist_fk,
+    order_index) does the same for get_playlist_elements. Each replaces a
+    single-column index that is now its prefix (playlist_items also keeps
+    the UNIQUE(playlist_fk, element_fk) autoindex).
+    """
+    elem_cols = {r[1] for r in conn.execute("PRAGMA table_info(elements)")}
+    if {"list_fk", "is_deprecated", "name"} <= elem_cols:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_elements_list_dep_name "
+            "ON elements(list_fk, is_deprecated, name)")
+        conn.execute("DROP INDEX IF EXISTS idx_elements_list")
+    item_cols = {r[1] for r in conn.execute("PRAGMA table_info(playlist_items)")}
+    if {"playlist_fk", "order_index"} <= item_cols:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_playlist_items_playlist_order "
+            "ON playlist_items(playlist_fk, order_index)")
+        conn.execute("DROP INDEX IF EXISTS idx_playlist_items_playlist")
+    conn.commit()
+    log.info("Migration v28: added name/order composite indexes for elements and playlist_items")
+
+
+def _migrate_v29(conn):
+    """v28 -> v29: store a missing favorites.user_name as '' instead of NULL.
+
+    The favorite helpers bind user_name = ? with None mapped to '', which
+    seeks the UNIQUE(element_fk, machine_name, user_name) index but never
+    matches NULL, so rows written by older builds were invisible. A NULL
+    row that would collide with an existing '' row is a duplicate and is
+    dropped.
+    """
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(favorites)")}
+    if "user_name" in cols:
+        conn.execute("UPDATE OR IGNORE favorites SET user_name = '' WHERE user_name IS NULL")
+        conn.execute("DELETE FROM favorites WHERE user_name IS NULL")
+    conn.commit()
+    log.info("Migration v29: normalized NULL favorites.user_name to ''")
+
+
+def _migrate_v30(conn):
+    """v29 -> v30: composite indexes for the favorites and session lookups.
+
+    get_favorites filters on (machine_name, user_name) and sorts by
+    created_at; get_active_session filters on (user_fk, machine_name,
+    is_active) and takes the newest login_time. Both become one index
+    range scan with no sort, and replace the prefix indexes
+    idx_favorites_user and idx_sessions_user.
+    """
+    fav_cols = {r[1] for r in conn.execute("PRAGMA table_info(favorites)")}
+    if {"machine_name", "user_name", "created_at"} <= fav_cols:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_favorites_user_created "
+            "ON favorites(machine_name, user_name, created_at)")
+        conn.execute("DROP INDEX IF EXISTS idx_favorites_user")
+    session_cols = {r[1] for r in conn.execute("PRAGMA table_info(user_sessions)")}
+    if {"user_fk", "machine_name", "is_active", "login_time"} <= session_cols:
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_user_machine_active "
+            "ON user_sessions(user_fk, machine_name, is_active, login_time)")
+        conn.execute("DROP INDEX IF EXISTS idx_sessions_user")
+    conn.commit()
+    log.info("Migration v30: added favorites/session composite indexes")
+
+
 # Index N upgrades schema version N-1 -> N.
 _MIGRATIONS = [
     None,          # index 0 — unused placeholder
@@ -683,6 +829,11 @@ _MIGRATIONS = [
     _migrate_v23,  # 22 -> 23
     _migrate_v24,  # 23 -> 24
     _migrate_v25,  # 24 -> 25
+    _migrate_v26,  # 25 -> 26
+    _migrate_v27,  # 26 -> 27
+    _migrate_v28,  # 27 -> 28
+    _migrate_v29,  # 28 -> 29
+    _migrate_v30,  # 29 -> 30
 ]
 
 
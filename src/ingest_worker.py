@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 """Shared background ingestion worker for StaX.
 
-Runs IngestionCore.ingest_file over a flat list of (source_path, list_id)
-jobs off the GUI thread, reporting progress and a final tally via signals.
+Runs IngestionCore.ingest_files_bulk over a flat list of (source_path,
+list_id) jobs off the GUI thread, reporting progress and a final tally via
+signals.
 Replaces the in-loop GUI-thread ingestion and QApplication.processEvents().
 """
 
 import logging
+import os
+from itertools import groupby
+from operator import itemgetter
 
 from PySide2 import QtCore
 
@@ -31,7 +35,8 @@ class IngestWorker(QtCore.QThread):
     ingest_finished = QtCore.Signal(int, int, int)
     ingest_failed   = QtCore.Signal(str)
 
-    def __init__(self, db, config, jobs, copy_policy="soft", parent=None):
+    def __init__(self, db, config, jobs, copy_policy="soft", parent=None,
+                 batch_size=1):
         # NOTE: zero-arg super() (not `super(IngestWorker, self)`) — the
         # old-style form re-resolves the bare name `IngestWorker` as a
         # module-global lookup at call time, so test doubles that do
@@ -42,26 +47,40 @@ class IngestWorker(QtCore.QThread):
         self.config = config          # MUST be a plain dict (Config.get_all())
         self.jobs = list(jobs)
         self.copy_policy = copy_policy
+        # Jobs per DatabaseManager.transaction(); files are copied/converted
+        # before the transaction opens, and file_done is emitted once the
+        # batch has committed.
+        self.batch_size = max(1, int(batch_size))
         self._cancelled = False
 
     def cancel(self):
         self._cancelled = True
 
     def run(self):
-        import os
         success = skipped = errors = 0
         total = len(self.jobs)
         try:
             core = IngestionCore(self.db, self.config)
-            for i, (source_path, list_id) in enumerate(self.jobs, start=1):
-                if self._cancelled:
-                    break
-                label = os.path.basename(source_path)
-                self.progress.emit(i, total, label)
-                result = core.ingest_file(source_path, list_id,
-                                          copy_policy=self.copy_policy)
-                if isinstance(result, dict):
-                    result.setdefault("source_path", source_path)
+            # Each progress emit is queued to the GUI thread and repaints a
+            # modal QProgressDialog; ~100 updates per run is plenty.
+            report_every = max(1, total // 100)
+            offset = 0
+            # ingest_files_bulk targets one list; jobs are grouped by
+            # consecutive list_id and indexed across the whole run.
+            for list_id, group in groupby(self.jobs, key=itemgetter(1)):
+                paths = [source_path for source_path, _ in group]
+
+                def _on_progress(index, count, source_path, base=offset):
+                    if self._cancelled:
+                        return False
+                    i = base + index + 1
+                    if i == 1 or i == total or i % report_every == 0:
+                        self.progress.emit(i, total, os.path.basename(source_path))
+                    return True
+
+                for result in core.ingest_files_bulk(
+                        paths, list_id, batch_size=self.batch_size,
+                        progress_cb=_on_progress, copy_policy=self.copy_policy):
                     self.file_done.emit(result)
                     if result.get("success"):
                         success += 1
@@ -69,8 +88,9 @@ class IngestWorker(QtCore.QThread):
                         skipped += 1
                     else:
                         errors += 1
-                else:
-                    errors += 1
+                offset += len(paths)
+                if self._cancelled:
+                    break
             self.ingest_finished.emit(success, skipped, errors)
         except Exception as exc:               # noqa: BLE001
             log.exception("IngestWorker crashed")
@@ -10,6 +10,7 @@ import shutil
 import hashlib
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from src.ffmpeg_wrapper import get_ffmpeg
 from src.glb_converter import (
     convert_to_glb,
@@ -469,6 +470,35 @@ class IngestionCore(object):
         print("[IngestionCore] Using preview path: {}".format(self.preview_dir))
         self._refresh_sequence_preferences()
 
+    def _after_commit(self, callback):
+        """Run callback once the DB's open transaction() (if any) commits."""
+        defer = getattr(self.db, 'after_commit', None)
+        if callable(defer):
+            defer(callback)
+        else:
+            callback()
+
+    def _copy_files(self, files, target_dir):
+        """
+        Copy files into target_dir, fanning out over a small thread pool.
+
+        Copies are I/O bound, so overlapping them hides per-file latency on
+        SMB/NAS repositories. The first failed copy is re-raised.
+        """
+        # copy2 -> copyfile already takes the zero-copy path on Python 3.8+
+        # (sendfile on Linux, fcopyfile on macOS, 1 MiB readinto on Windows),
+        # and it keeps mtimes, which downstream tools compare against.
+        def _copy(src_file):
+            shutil.copy2(src_file, os.path.join(target_dir, os.path.basename(src_file)))
+
+        workers = min(max(1, int(self.config.get('copy_workers', 4) or 1)), len(files))
+        if workers <= 1:
+            for src_file in files:
+                _copy(src_file)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_copy, files))
+
     def _refresh_sequence_preferences(self):
         """Sync runtime sequence detection settings with current configuration."""
         self.auto_detect_sequences = self.config.get('auto_detect_sequences', True)
@@ -481,7 +511,7 @@ class IngestionCore(object):
     def _log_geometry_progress(self, notes, message):
         if message:
             notes.append(message)
-            print("[GLB] {}".format(message))
+            log.debug("GLB: %s", message)
 
     def _resolve_blender_script_path(self):
         candidate = BLENDER_SCRIPT_PATH if os.path.exists(BLENDER_SCRIPT_PATH) else None
@@ -632,22 +662,40 @@ class IngestionCore(object):
         Returns:
             dict: Result with 'success', 'element_id', 'message'
         """
+        staged = self._stage_file(source_path, target_list_id, copy_policy=copy_policy,
+                                  comment=comment, tags=tags, pre_hook=pre_hook)
+        return self._commit_staged(staged, post_hook=post_hook)
+
+    def _stage_file(self, source_path, target_list_id, copy_policy='soft',
+                    comment=None, tags=None, pre_hook=None):
+        """
+        Filesystem half of ingest_file(): resolve the sequence, run the
+        pre-hook, hard-copy, convert 3D geometry and hash the source.
+
+        Only reads the database, so ingest_files_bulk() can run it outside
+        the batch transaction and keep slow copies and Blender conversions
+        from holding the write lock.
+
+        Returns:
+            dict: Staged record for _commit_staged(); carries 'result' when
+            the file already finished (validation, pre-hook or failure)
+        """
         # Normalize path separators for consistent handling
         source_path = os.path.normpath(source_path)
         
         # Validate source
         if not os.path.exists(source_path):
-            return {'success': False, 'message': 'Source file does not exist'}
+            return {'result': {'success': False, 'message': 'Source file does not exist'}}
         
         # Get target list info
         target_list = self.db.get_list_by_id(target_list_id)
         if not target_list:
-            return {'success': False, 'message': 'Target list not found'}
+            return {'result': {'success': False, 'message': 'Target list not found'}}
         
         # Get stack for repository path
         stack = self.db.get_stack_by_id(target_list['stack_fk'])
         if not stack:
-            return {'success': False, 'message': 'Stack not found'}
+            return {'result': {'success': False, 'message': 'Stack not found'}}
 
         # EP4: auto-tag + derived fields from source path
         _ep4_fields = {}
@@ -714,7 +762,8 @@ class IngestionCore(object):
                     'files': files_to_process
                 })
                 if not hook_result.get('continue', True):
-                    return {'success': False, 'message': hook_result.get('message', 'Pre-hook cancelled')}
+                    return {'result': {'success': False,
+                                       'message': hook_result.get('message', 'Pre-hook cancelled')}}
             
             # Handle copy policy
             is_hard_copy = (copy_policy == 'hard')
@@ -727,10 +776,7 @@ class IngestionCore(object):
                     os.makedirs(target_dir)
                 
                 # Copy files
-                for src_file in files_to_process:
-                    filename = os.path.basename(src_file)
-                    dest_file = os.path.join(target_dir, filename)
-                    shutil.copy2(src_file, dest_file)
+                self._copy_files(files_to_process, target_dir)
                 
                 # Set hard copy path
                 if is_sequence and sequence_info:
@@ -752,7 +798,7 @@ class IngestionCore(object):
                         try:
                             os.makedirs(geometry_dir)
                         except OSError as create_err:
-                            print("[GLB] Failed to create geometry preview directory: {}".format(create_err))
+                            log.warning("Failed to create geometry preview directory: %s", create_err)
                     geometry_filename = "{}_{}.glb".format(target_list_id, element_hash)
                     geometry_preview_path = os.path.normpath(os.path.join(geometry_dir, geometry_filename))
 
@@ -782,11 +828,12 @@ class IngestionCore(object):
                         details = message
                         if geometry_conversion_notes:
                             details = "{} | {}".format(message, ' | '.join(geometry_conversion_notes))
-                        return {'success': False, 'message': '3D conversion failed: {}'.format(details)}
+                        return {'result': {'success': False,
+                                           'message': '3D conversion failed: {}'.format(details)}}
 
-                    print("[GLB] ✓ {}".format(message))
+                    log.info("GLB conversion: %s", message)
                 else:
-                    print("[GLB] Skipping conversion for unsupported extension: {}".format(ext_lower))
+                    log.debug("Skipping GLB conversion for unsupported extension: %s", ext_lower)
 
             # Check if it's a video file
             is_video = file_format.lower() in ['.mp4', '.mov', '.avi', '.mkv', '.mpg', '.mpeg', '.wmv', '.flv']
@@ -803,150 +850,234 @@ class IngestionCore(object):
                 video_preview_path = os.path.normpath(os.path.join(
                     self.preview_dir, "{}_{}.mp4".format(target_list_id, element_hash)))
 
-            # ---- Duplicate detection (before DB insert) ----
-            pending_version_of = None
+            # Hash now; the duplicate lookup itself runs at commit time so a
+            # batch sees the rows inserted earlier in the same transaction.
             phash = None
             if self.config.get('dedup_enabled', True):
                 phash = compute_phash(filepath_soft or source_path)
-                if phash:
-                    policy = self.config.get('duplicate_policy')
-                    if policy is None:
-                        # Preserve legacy behavior when no EP6 policy is set.
-                        policy = 'skip' if self.config.get('dedup_skip_duplicates', False) else 'allow'
-                    if policy in ('skip', 'ask', 'version'):
-                        dupes = find_duplicates(
-                            self.db, phash,
-                            threshold=int(self.config.get('dedup_threshold', 8)))
-                        action = resolve_duplicate_action(policy, dupes)
-                        if action in ('skip', 'ask'):    # unattended 'ask' == skip
-                            self.db.log_ingestion(
-                                action='ingest', source_path=source_path,
-                                target_list=target_list['name'], status='skipped',
-                                message='Duplicate of element {}'.format(
-                                    dupes[0].get('element_id') if dupes else '?'))
-                            return {'success': False, 'reason': 'duplicate_skipped',
-                                    'message': 'Skipped — duplicate of existing asset.'}
-                        if action == 'version' and dupes:
-                            pending_version_of = dupes[0].get('element_id')
-
-            element_id = self.db.create_element(
-                list_id=target_list_id,
-                name=name,
-                element_type=asset_type,
-                filepath_soft=filepath_soft,
-                filepath_hard=filepath_hard,
-                is_hard_copy=is_hard_copy,
-                frame_range=frame_range,
-                format=file_format,
-                comment=comment,
-                tags=tags,
-                preview_path=preview_path,
-                gif_preview_path=gif_preview_path,
-                video_preview_path=video_preview_path,
-                geometry_preview_path=geometry_preview_path,
-                file_size=file_size
-            )
 
-            # ---- Store phash (SP1: update_element_phash) ----
-            if phash and hasattr(self.db, 'update_element_phash'):
-                try:
-                    self.db.update_element_phash(element_id, phash)
-                except Exception as exc:
-                    log.debug("update_element_phash failed for %s: %s", element_id, exc)
+            return {
+                'source_path': source_path,
+                'target_list_id': target_list_id,
+                'target_list_name': target_list['name'],
+                'name': name,
+                'asset_type': asset_type,
+                'file_format': file_format,
+                'file_size': file_size,
+                'frame_range': frame_range,
+                'files_to_process': files_to_process,
+                'is_sequence': is_sequence,
+                'sequence_info': sequence_info,
+                'sequence_pattern_path': sequence_pattern_path,
+                'filepath_soft': filepath_soft,
+                'filepath_hard': filepath_hard,
+                'is_hard_copy': is_hard_copy,
+                'comment': comment,
+                'tags': tags,
+                'ep4_fields': _ep4_fields,
+                'preview_path': preview_path,
+                'gif_preview_path': gif_preview_path,
+                'video_preview_path': video_preview_path,
+                'geometry_preview_path': geometry_preview_path,
+                'phash': phash,
+            }
 
-            # EP4: write auto-tag-derived fields now that element_id is known
-            for _k, _v in _ep4_fields.items():
-                try:
-                    self.db.set_element_metadata(element_id, _k, _v)
-                except Exception:
-                    log.exception("EP4 set field %s failed", _k)
+        except Exception as e:
+            log.exception("Ingestion failed for %s", source_path)
+            return {'source_path': source_path, 'target_list_name': target_list['name'],
+                    'error': 'Ingestion failed: {}'.format(str(e))}
 
-            # ---- Submit async preview job (replaces synchronous generation) ----
-            if self.config.get('generate_previews', True):
-                ffmpeg_pattern = sequence_pattern_path if is_sequence else None
-                first_frame = 1
-                if is_sequence and sequence_info:
-                    first_frame = sequence_info.get('first_frame') \
-                        or sequence_info.get('start_frame') or 1
-                get_preview_queue().submit(PreviewJob(
-                    element_id=element_id,
-                    source_path=filepath_soft or source_path,
-                    output_dir=self.preview_dir,
-                    asset_type=asset_type,
-                    frame_range=frame_range,
-                    config=self.config,
-                    thumb_path=preview_path,
-                    gif_path=gif_preview_path,
-                    video_path=video_preview_path,
-                    is_sequence=bool(is_sequence),
-                    ffmpeg_pattern=ffmpeg_pattern,
-                    first_frame=first_frame,
-                ))
-
-            # Log ingestion
-            self.db.log_ingestion(
-                action='ingest',
-                source_path=source_path,
-                target_list=target_list['name'],
-                status='success',
-                message='Ingested as {}'.format('hard copy' if is_hard_copy else 'soft copy'),
-                element_id=element_id
+    def _commit_staged(self, staged, post_hook=None):
+        """
+        Database half of ingest_file(): duplicate check, element insert,
+        ingestion log and post-ingest hooks for a _stage_file() record.
+
+        Returns:
+            dict: Result with 'success', 'element_id', 'message'
+        """
+        if 'result' in staged:
+            return staged['result']
+
+        source_path = staged['source_path']
+        target_list_name = staged['target_list_name']
+        error_msg = staged.get('error')
+        if error_msg is None:
+            try:
+                return self._insert_staged(staged, post_hook)
+            except Exception as e:
+                error_msg = 'Ingestion failed: {}'.format(str(e))
+                log.exception("Ingestion failed for %s", source_path)
+
+        # Log error
+        self.db.log_ingestion(
+            action='ingest',
+            source_path=source_path,
+            target_list=target_list_name,
+            status='error',
+            message=error_msg
+        )
+
+        return {'success': False, 'message': error_msg}
+
+    def _insert_staged(self, staged, post_hook):
+        """Write one staged file's rows; exceptions propagate to _commit_staged()."""
+        source_path = staged['source_path']
+        target_list_id = staged['target_list_id']
+        name = staged['name']
+        asset_type = staged['asset_type']
+        frame_range = staged['frame_range']
+        is_sequence = staged['is_sequence']
+        sequence_info = staged['sequence_info']
+        filepath_soft = staged['filepath_soft']
+        filepath_hard = staged['filepath_hard']
+        is_hard_copy = staged['is_hard_copy']
+        preview_path = staged['preview_path']
+        gif_preview_path = staged['gif_preview_path']
+        video_preview_path = staged['video_preview_path']
+        geometry_preview_path = staged['geometry_preview_path']
+        phash = staged['phash']
+
+        # ---- Duplicate detection (before DB insert) ----
+        pending_version_of = None
+        if phash:
+            policy = self.config.get('duplicate_policy')
+            if policy is None:
+                # Preserve legacy behavior when no EP6 policy is set.
+                policy = 'skip' if self.config.get('dedup_skip_duplicates', False) else 'allow'
+            if policy in ('skip', 'ask', 'version'):
+                dupes = find_duplicates(
+                    self.db, phash,
+                    threshold=int(self.config.get('dedup_threshold', 8)))
+                action = resolve_duplicate_action(policy, dupes)
+                if action in ('skip', 'ask'):    # unattended 'ask' == skip
+                    self.db.log_ingestion(
+                        action='ingest', source_path=source_path,
+                        target_list=staged['target_list_name'], status='skipped',
+                        message='Duplicate of element {}'.format(
+                            dupes[0].get('element_id') if dupes else '?'))
+                    return {'success': False, 'reason': 'duplicate_skipped',
+                            'message': 'Skipped — duplicate of existing asset.'}
+                if action == 'version' and dupes:
+                    pending_version_of = dupes[0].get('element_id')
+
+        element_id = self.db.create_element(
+            list_id=target_list_id,
+            name=name,
+            element_type=asset_type,
+            filepath_soft=filepath_soft,
+            filepath_hard=filepath_hard,
+            is_hard_copy=is_hard_copy,
+            frame_range=frame_range,
+            format=staged['file_format'],
+            comment=staged['comment'],
+            tags=staged['tags'],
+            preview_path=preview_path,
+            gif_preview_path=gif_preview_path,
+            video_preview_path=video_preview_path,
+            geometry_preview_path=geometry_preview_path,
+            file_size=staged['file_size']
+        )
+
+        # ---- Store phash (SP1: update_element_phash) ----
+        if phash and hasattr(self.db, 'update_element_phash'):
+            try:
+                self.db.update_element_phash(element_id, phash)
+            except Exception as exc:
+                log.debug("update_element_phash failed for %s: %s", element_id, exc)
+
+        # EP4: write auto-tag-derived fields now that element_id is known
+        for _k, _v in staged['ep4_fields'].items():
+            try:
+                self.db.set_element_metadata(element_id, _k, _v)
+            except Exception:
+                log.exception("EP4 set field %s failed", _k)
+
+        # ---- Submit async preview job (replaces synchronous generation) ----
+        if self.config.get('generate_previews', True):
+            ffmpeg_pattern = staged['sequence_pattern_path'] if is_sequence else None
+            first_frame = 1
+            if is_sequence and sequence_info:
+                first_frame = sequence_info.get('first_frame') \
+                    or sequence_info.get('start_frame') or 1
+            preview_job = PreviewJob(
+                element_id=element_id,
+                source_path=filepath_soft or source_path,
+                output_dir=self.preview_dir,
+                asset_type=asset_type,
+                frame_range=frame_range,
+                config=self.config,
+                thumb_path=preview_path,
+                gif_path=gif_preview_path,
+                video_path=video_preview_path,
+                is_sequence=bool(is_sequence),
+                ffmpeg_pattern=ffmpeg_pattern,
+                first_frame=first_frame,
             )
-            
-            # Execute post-ingestion hook
-            if post_hook:
-                post_hook({
-                    'element_id': element_id,
-                    'name': name,
-                    'type': asset_type,
-                    'filepath_soft': filepath_soft,
-                    'filepath_hard': filepath_hard
-                })
+            # Inside a bulk transaction the row is not visible to other
+            # connections yet; hand the job over once it is committed.
+            self._after_commit(lambda: get_preview_queue().submit(preview_job))
+
+        # Log ingestion
+        self.db.log_ingestion(
+            action='ingest',
+            source_path=source_path,
+            target_list=staged['target_list_name'],
+            status='success',
+            message='Ingested as {}'.format('hard copy' if is_hard_copy else 'soft copy'),
+            element_id=element_id
+        )
+        
+        # Execute post-ingestion hook once the element is committed, so a
+        # processor never runs under a bulk batch's write lock or sees an
+        # element_id other connections cannot read yet.
+        if post_hook:
+            hook_info = {
+                'element_id': element_id,
+                'name': name,
+                'type': asset_type,
+                'filepath_soft': filepath_soft,
+                'filepath_hard': filepath_hard
+            }
 
-            # EP7: enqueue AI/color indexing for the new element (additive)
-            if self.ai_index_hook:
+            def _run_post_hook(hook=post_hook, info=hook_info):
                 try:
-                    self.ai_index_hook(element_id)
+                    hook(info)
                 except Exception:
-                    log.exception("ai_index_hook failed for element %s", element_id)
-
-            # ---- Action chain (F040): whitelisted post-ingest steps ----
-            steps = self.config.get('action_chain_steps')
-            if steps:
-                run_action_chain(steps, context={
-                    'db': self.db, 'element_id': element_id, 'config': self.config})
+                    log.exception("post-ingest hook failed for element %s", info['element_id'])
+            self._after_commit(_run_post_hook)
 
-            # ---- Version-link to the duplicate original (EP4 relationships) ----
-            if pending_version_of and hasattr(self.db, 'add_relationship'):
+        # EP7: enqueue AI/color indexing for the new element (additive)
+        if self.ai_index_hook:
+            def _enqueue_ai_index(hook=self.ai_index_hook, eid=element_id):
                 try:
-                    self.db.add_relationship(element_id, pending_version_of, 'variant_of')
-                except Exception as exc:
-                    log.debug("version relationship failed: %s", exc)
+                    hook(eid)
+                except Exception:
+                    log.exception("ai_index_hook failed for element %s", eid)
+            self._after_commit(_enqueue_ai_index)
 
-            return {
-                'success': True,
-                'element_id': element_id,
-                'message': 'Successfully ingested {}'.format(name),
-                'is_sequence': is_sequence,
-                'frame_range': frame_range,
-                'sequence_files': files_to_process if is_sequence else None,
-                'geometry_preview_path': geometry_preview_path
-            }
-            
-        except Exception as e:
-            error_msg = 'Ingestion failed: {}'.format(str(e))
-            log.exception("Ingestion failed for %s", source_path)
+        # ---- Action chain (F040): whitelisted post-ingest steps ----
+        steps = self.config.get('action_chain_steps')
+        if steps:
+            run_action_chain(steps, context={
+                'db': self.db, 'element_id': element_id, 'config': self.config})
 
-            # Log error
-            self.db.log_ingestion(
-                action='ingest',
-                source_path=source_path,
-                target_list=target_list['name'],
-                status='error',
-                message=error_msg
-            )
-            
-            return {'success': False, 'message': error_msg}
+        # ---- Version-link to the duplicate original (EP4 relationships) ----
+        if pending_version_of and hasattr(self.db, 'add_relationship'):
+            try:
+                self.db.add_relationship(element_id, pending_version_of, 'variant_of')
+            except Exception as exc:
+                log.debug("version relationship failed: %s", exc)
+
+        files_to_process = staged['files_to_process']
+        return {
+            'success': True,
+            'element_id': element_id,
+            'message': 'Successfully ingested {}'.format(name),
+            'is_sequence': is_sequence,
+            'frame_range': frame_range,
+            'sequence_files': files_to_process if is_sequence else None,
+            'geometry_preview_path': geometry_preview_path
+        }
     
     def ingest_multiple(self, source_paths, target_list_id, **kwargs):
         """
@@ -977,6 +1108,68 @@ class IngestionCore(object):
                     processed_paths.add(os.path.normpath(seq_file))
         return results
     
+    def ingest_files_bulk(self, source_paths, target_list_id, batch_size=100,
+                          progress_cb=None, **kwargs):
+        """
+        Ingest many files, committing once per batch instead of once per file.
+
+        Each chunk of ``batch_size`` files is staged first (hard copies, 3D
+        conversion and hashing run outside any transaction), then its rows
+        are written inside one DatabaseManager.transaction(), so the write
+        lock is only held for the inserts. Results are yielded after their
+        batch has committed. Frames already claimed by a staged sequence are
+        reported as skipped instead of being ingested again.
+
+        Args:
+            source_paths (list): List of source file paths
+            target_list_id (int): Target list ID
+            batch_size (int): Files per transaction
+            progress_cb (callable): Optional ``cb(index, total, source_path)``
+                called before each file; returning False stops after the
+                current batch is committed
+            **kwargs: Additional arguments for ingest_file
+
+        Yields:
+            dict: Per-file ingestion result, with 'source_path' set
+        """
+        post_hook = kwargs.pop('post_hook', None)
+        paths = [os.path.normpath(p) for p in source_paths]
+        total = len(paths)
+        batch_size = max(1, int(batch_size))
+        claimed_paths = set()
+        stopped = False
+
+        for start in range(0, total, batch_size):
+            staged_batch = []
+            for index in range(start, min(start + batch_size, total)):
+                source_path = paths[index]
+                if progress_cb and progress_cb(index, total, source_path) is False:
+                    stopped = True
+                    break
+                if source_path in claimed_paths:
+                    staged = {'result': {
+                        'success': False, 'reason': 'duplicate_skipped',
+                        'message': 'Skipped — frame of a sequence already in this ingest.'}}
+                else:
+                    staged = self._stage_file(source_path, target_list_id, **kwargs)
+                    if staged.get('is_sequence'):
+                        claimed_paths.update(
+                            os.path.normpath(f) for f in staged['files_to_process'])
+                staged_batch.append((source_path, staged))
+
+            results = []
+            if staged_batch:
+                with self.db.transaction():
+                    for source_path, staged in staged_batch:
+                        result = self._commit_staged(staged, post_hook=post_hook)
+                        result.setdefault('source_path', source_path)
+                        results.append(result)
+
+            for result in results:
+                yield result
+            if stopped:
+                return
+
     def ingest_folder(self, folder_path, target_list_id, recursive=False, **kwargs):
         """
         Ingest all files from a folder.
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk preview cache for StaX
+Reuses generated thumbnails when the same source content is ingested again
+Python 3.9+
+
+Entries live in ``<previews>/cache/<key><ext>``. The key hashes the file
+size plus its first megabyte, together with the render parameters, so a
+re-ingest of an unchanged file (or a copy of it) skips ffmpeg entirely.
+Eviction is least-recently-used by file mtime; hits touch the entry.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+
+log = logging.getLogger(__name__)
+
+CACHE_SUBDIR = 'cache'
+_HEAD_BYTES = 1 << 20
+
+
+def cache_dir_for(previews_dir):
+    """Directory holding cached previews for a previews root."""
+    return os.path.join(previews_dir, CACHE_SUBDIR)
+
+
+def content_key(source_path, *params):
+    """
+    Cheap content key: file size + first MB + render parameters.
+
+    Returns None when the source cannot be read.
+    """
+    try:
+        size = os.path.getsize(source_path)
+        with open(source_path, 'rb') as handle:
+            head = handle.read(_HEAD_BYTES)
+    except (IOError, OSError):
+        return None
+    digest = hashlib.blake2b(head, digest_size=16)
+    digest.update(repr((size,) + tuple(params)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _entry_path(cache_dir, key, dest_path):
+    return os.path.join(cache_dir, key + os.path.splitext(dest_path)[1])
+
+
+def fetch(cache_dir, key, dest_path):
+    """Copy a cached preview to dest_path. Returns True on a hit."""
+    if not key:
+        return False
+    entry = _entry_path(cache_dir, key, dest_path)
+    try:
+        shutil.copyfile(entry, dest_path)
+        os.utime(entry, None)  # mark as recently used
+    except (IOError, OSError):
+        return False
+    return True
+
+
+def store(cache_dir, key, produced_path):
+    """
+    Keep a copy of a freshly generated preview under key.
+
+    Returns the number of bytes added to the cache (0 when nothing was stored).
+    """
+    if not key:
+        return 0
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        shutil.copyfile(produced_path, _entry_path(cache_dir, key, produced_path))
+        return os.path.getsize(produced_path)
+    except (IOError, OSError) as exc:
+        log.debug("Could not cache preview %s: %s", produced_path, exc)
+        return 0
+
+
+def evict(cache_dir, max_mb):
+    """Delete least-recently-used entries until the cache fits in max_mb."""
+    try:
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except (IOError, OSError):
+        return
+    budget = max(0, int(max_mb)) * 1024 * 1024
+    total = sum(size for _mtime, size, _path in entries)
+    for _mtime, size, path in sorted(entries):
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
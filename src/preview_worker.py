@@ -61,6 +61,7 @@ except ImportError:                 # Python 2
 from PySide2 import QtCore
 
 from src.ffmpeg_wrapper import get_ffmpeg
+from src import preview_disk_cache
 
 log = logging.getLogger(__name__)
 
@@ -149,6 +150,8 @@ class PreviewWorker(QtCore.QThread):
         super(PreviewWorker, self).__init__(parent)
         self._queue    = queue.PriorityQueue()
         self._running  = False
+        # Bytes stored into each disk cache since it was last trimmed.
+        self._cache_bytes_added = {}
         self.setObjectName("StaX-PreviewWorker")
         self.daemon = True
 
@@ -236,16 +239,40 @@ class PreviewWorker(QtCore.QThread):
         # ---- Thumbnail (all 2D; ffmpeg reads EXR/DPX/MXF, unlike PIL) ----
         if cfg.get("generate_previews", True) and job.thumb_path:
             ok = False
+            cache_dir = cache_key = None
             try:
-                if job.is_sequence and job.ffmpeg_pattern:
-                    ok = ffmpeg.generate_sequence_thumbnail(
-                        job.ffmpeg_pattern, job.thumb_path,
-                        max_size=max_size, frame_number=job.first_frame,
-                    )
+                cache_mb = int(cfg.get("preview_disk_cache_mb", 500) or 0)
+            except (TypeError, ValueError):
+                cache_mb = 0
+            if cache_mb > 0 and job.output_dir:
+                cache_dir = preview_disk_cache.cache_dir_for(job.output_dir)
+                # Trim on first use and again after every tenth of the budget
+                # written, so a long session cannot outgrow the cap.
+                added = self._cache_bytes_added.get(cache_dir)
+                if added is None or added >= cache_mb * 1024 * 1024 // 10:
+                    preview_disk_cache.evict(cache_dir, cache_mb)
+                    self._cache_bytes_added[cache_dir] = 0
+                cache_key = preview_disk_cache.content_key(
+                    job.source_path, "thumbnail", max_size,
+                    bool(job.is_sequence), job.first_frame)
+            try:
+                if preview_disk_cache.fetch(cache_dir, cache_key, job.thumb_path):
+                    ok = True
                 else:
-                    ok = ffmpeg.generate_thumbnail(
-                        job.source_path, job.thumb_path, max_size=max_size,
-                    )
+                    if job.is_sequence and job.ffmpeg_pattern:
+                        ok = ffmpeg.generate_sequence_thumbnail(
+                            job.ffmpeg_pattern, job.thumb_path,
+                            max_size=max_size, frame_number=job.first_frame,
+                        )
+                    else:
+                        ok = ffmpeg.generate_thumbnail(
+                            job.source_path, job.thumb_path, max_size=max_size,
+                        )
+                    # Only freshly generated thumbnails go back into the cache;
+                    # a hit was just copied out of it.
+                    if ok and cache_key:
+                        self._cache_bytes_added[cache_dir] += preview_disk_cache.store(
+                            cache_dir, cache_key, job.thumb_path)
             except Exception as exc:
                 log.warning("Thumbnail failed for element %s: %s", job.element_id, exc)
             if ok:
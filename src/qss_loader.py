@@ -12,6 +12,12 @@ checkbox icons, which meant any *new* QSS icon silently rendered as nothing.
 `resolve_icon_urls` rewrites them all generically, so adding an icon to the
 stylesheet needs no Python change.
 
+Builds compile ``resources/stax.qrc`` into ``src/stax_resources_rc.py`` with
+pyside2-rcc. When that module imports, the icons are registered with Qt's
+in-memory resource system and the URLs are kept as ``:/icons/...``, so
+QStyleSheetStyle never re-opens the files on uncached ``sizeHint()`` queries.
+Source checkouts without the generated module fall back to the rewrite.
+
 Unknown icon names are left untouched (Qt then draws nothing, exactly as
 before) rather than raising -- a missing decoration must never take the whole
 theme down with it.
@@ -28,6 +34,24 @@ _ICONS_DIR = os.path.join(
 )
 
 
+_ICONS_COMPILED = None
+
+
+def icons_compiled():
+    """True when the pyside2-rcc icon bundle is importable (and registered)."""
+    global _ICONS_COMPILED
+    if _ICONS_COMPILED is None:
+        try:
+            try:
+                import stax_resources_rc  # noqa: F401  registers :/icons/*
+            except ImportError:
+                from src import stax_resources_rc  # noqa: F401
+            _ICONS_COMPILED = True
+        except ImportError:
+            _ICONS_COMPILED = False
+    return _ICONS_COMPILED
+
+
 def icons_dir():
     """Absolute path of the shipped SVG icon directory."""
     return _ICONS_DIR
@@ -46,6 +70,12 @@ def resolve_icon_urls(qss, directory=None):
     return _ICON_URL_RE.sub(_sub, qss)
 
 
+# (path, mtime) -> resolved QSS. Re-opening a panel re-applies the theme
+# without re-reading the file or re-running the icon substitution; editing
+# the file bumps its mtime and forces a fresh read.
+_STYLESHEET_CACHE = {}
+
+
 def read_stylesheet(path):
     """Read a QSS file as UTF-8 and resolve its icon URLs.
 
@@ -54,5 +84,14 @@ def read_stylesheet(path):
     ('charmap' codec can't decode byte 0x90), which silently drops the whole
     stylesheet and leaves the app unstyled. Always decode as UTF-8.
     """
-    with open(path, "r", encoding="utf-8") as handle:
-        return resolve_icon_urls(handle.read())
+    key = (path, os.stat(path).st_mtime)
+    cached = _STYLESHEET_CACHE.get(key)
+    if cached is None:
+        with open(path, "r", encoding="utf-8") as handle:
+            cached = handle.read()
+        if not icons_compiled():
+            cached = resolve_icon_urls(cached)
+        for stale in [k for k in _STYLESHEET_CACHE if k[0] == path]:
+            del _STYLESHEET_CACHE[stale]
+        _STYLESHEET_CACHE[key] = cached
+    return cached
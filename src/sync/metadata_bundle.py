@@ -104,13 +104,13 @@ def import_bundle(db, bundle_path, target_list_id, conflict="timestamp", preview
 
         current = existing.get(name)
         if current is None:
-            with db.get_connection() as conn:
+            with db.transaction() as conn:
                 cols = ["list_fk", "name"] + list(payload.keys()) + ["updated_at"]
                 vals = [target_list_id, name] + list(payload.values()) + [rec.get("updated_at")]
                 placeholders = ", ".join("?" for _ in cols)
                 conn.execute("INSERT INTO elements ({}) VALUES ({})".format(
                     ", ".join(cols), placeholders), vals)
-                conn.commit()
+                db.index_pending_tags(conn)
             summary["added"] += 1
             continue
 
@@ -120,11 +120,11 @@ def import_bundle(db, bundle_path, target_list_id, conflict="timestamp", preview
             # update in place; preserve updated_at from the bundle
             payload_with_ts = dict(payload)
             payload_with_ts["updated_at"] = incoming
-            with db.get_connection() as conn:
+            with db.transaction() as conn:
                 set_clause = ", ".join("{} = ?".format(k) for k in payload_with_ts)
                 conn.execute("UPDATE elements SET {} WHERE element_id = ?".format(set_clause),
                              list(payload_with_ts.values()) + [current["element_id"]])
-                conn.commit()
+                db.index_pending_tags(conn)
             summary["updated"] += 1
         else:
             summary["skipped"] += 1
@@ -1074,7 +1074,19 @@ class SelectListDialog(QtWidgets.QDialog):
         self.tree.setHeaderHidden(True)
         layout.addWidget(self.tree)
         
-        # Load data
+        self.load_lists()
+        
+        # Buttons
+        button_box = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
+        )
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+    
+    def load_lists(self):
+        """(Re)populate the stack/list tree; callers reusing the dialog refresh here."""
+        self.tree.clear()
         stacks = self.db.get_all_stacks()
         for stack in stacks:
             stack_item = QtWidgets.QTreeWidgetItem([stack['name']])
@@ -1089,14 +1101,6 @@ class SelectListDialog(QtWidgets.QDialog):
                 stack_item.addChild(list_item)
             
             stack_item.setExpanded(True)
-        
-        # Buttons
-        button_box = QtWidgets.QDialogButtonBox(
-            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
-        )
-        button_box.accepted.connect(self.accept)
-        button_box.rejected.connect(self.reject)
-        layout.addWidget(button_box)
     
     def get_selected_list(self):
         """Get selected list ID."""
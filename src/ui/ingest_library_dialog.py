@@ -77,9 +77,7 @@ class IngestLibraryDialog(QtWidgets.QDialog):
 
         # Ingest recipe (EP6, F032)
         self.recipe_combo = QtWidgets.QComboBox()
-        self.recipe_combo.addItem("(none)", None)
-        for rec in self.db.get_ingest_recipes():
-            self.recipe_combo.addItem(rec["name"], rec)
+        self._load_recipes()
         options_layout.addRow("Recipe:", self.recipe_combo)
 
         # Max depth
@@ -132,6 +130,21 @@ class IngestLibraryDialog(QtWidgets.QDialog):
         # Store scanned structure
         self.scanned_structure = None
     
+    def _load_recipes(self):
+        self.recipe_combo.clear()
+        self.recipe_combo.addItem("(none)", None)
+        for rec in self.db.get_ingest_recipes():
+            self.recipe_combo.addItem(rec["name"], rec)
+
+    def reset(self):
+        """Clear the previous scan so a reused dialog starts from scratch."""
+        self.folder_path_edit.clear()
+        self.preview_tree.clear()
+        self.scanned_structure = None
+        self.scan_btn.setEnabled(False)
+        self.ingest_btn.setEnabled(False)
+        self._load_recipes()
+
     def select_folder(self):
         """Open folder selection dialog."""
         folder = QtWidgets.QFileDialog.getExistingDirectory(
@@ -1859,43 +1859,46 @@ class SettingsPanel(QtWidgets.QWidget):
     def save_all_settings(self):
         """Save all settings to config and database."""
         # General settings
-        self.config.set('database_path', self.db_path_edit.text())
-        self.config.set('previews_path', self.previews_path_edit.text())
-        self.config.set('user_name', self.user_name_edit.text())
-        self.config.set('debug_mode', self.debug_mode_checkbox.isChecked())
+        self.config.set('database_path', self.db_path_edit.text(), autosave=False)
+        self.config.set('previews_path', self.previews_path_edit.text(), autosave=False)
+        self.config.set('user_name', self.user_name_edit.text(), autosave=False)
+        self.config.set('debug_mode', self.debug_mode_checkbox.isChecked(), autosave=False)
         
         # Ingestion settings
-        self.config.set('default_copy_policy', self.copy_policy.currentText())
-        self.config.set('auto_detect_sequences', self.auto_detect.isChecked())
-        self.config.set('sequence_pattern', self.sequence_pattern_combo.currentText())
+        self.config.set('default_copy_policy', self.copy_policy.currentText(), autosave=False)
+        self.config.set('auto_detect_sequences', self.auto_detect.isChecked(), autosave=False)
+        self.config.set('sequence_pattern', self.sequence_pattern_combo.currentText(), autosave=False)
         if hasattr(self, 'blender_path_edit'):
             blender_override = (self.blender_path_edit.text() or '').strip()
-            self.config.set('blender_path', blender_override or None)
+            self.config.set('blender_path', blender_override or None, autosave=False)
         
         # Preview settings
-        self.config.set('generate_previews', self.gen_previews.isChecked())
-        self.config.set('preview_size', self.preview_size.value())
-        self.config.set('preview_quality', self.preview_quality.value())
-        self.config.set('gif_size', self.gif_size.value())
-        self.config.set('gif_fps', self.gif_fps.value())
-        self.config.set('gif_duration', self.gif_duration.value())
-        self.config.set('gif_full_duration', self.gif_full_duration.isChecked())
-        self.config.set('ffmpeg_threads', self.ffmpeg_threads.value())
-        self.config.set('show_entire_stack_elements', self.show_entire_stack.isChecked())
+        self.config.set('generate_previews', self.gen_previews.isChecked(), autosave=False)
+        self.config.set('preview_size', self.preview_size.value(), autosave=False)
+        self.config.set('preview_quality', self.preview_quality.value(), autosave=False)
+        self.config.set('gif_size', self.gif_size.value(), autosave=False)
+        self.config.set('gif_fps', self.gif_fps.value(), autosave=False)
+        self.config.set('gif_duration', self.gif_duration.value(), autosave=False)
+        self.config.set('gif_full_duration', self.gif_full_duration.isChecked(), autosave=False)
+        self.config.set('ffmpeg_threads', self.ffmpeg_threads.value(), autosave=False)
+        self.config.set('show_entire_stack_elements', self.show_entire_stack.isChecked(), autosave=False)
         
         # Network and performance settings
-        self.config.set('db_max_retries', self.db_retries.value())
-        self.config.set('db_timeout', self.db_timeout.value())
-        self.config.set('preview_cache_size', self.cache_size.value())
-        self.config.set('preview_cache_memory_mb', self.cache_memory.value())
-        self.config.set('pagination_enabled', self.pagination_enabled.isChecked())
-        self.config.set('items_per_page', int(self.items_per_page.currentText()))
-        self.config.set('background_thumbnail_loading', self.background_loading.isChecked())
+        self.config.set('db_max_retries', self.db_retries.value(), autosave=False)
+        self.config.set('db_timeout', self.db_timeout.value(), autosave=False)
+        self.config.set('preview_cache_size', self.cache_size.value(), autosave=False)
+        self.config.set('preview_cache_memory_mb', self.cache_memory.value(), autosave=False)
+        self.config.set('pagination_enabled', self.pagination_enabled.isChecked(), autosave=False)
+        self.config.set('items_per_page', int(self.items_per_page.currentText()), autosave=False)
+        self.config.set('background_thumbnail_loading', self.background_loading.isChecked(), autosave=False)
         
         # Processor hooks
-        self.config.set('pre_ingest_processor', self.pre_ingest.text() or None)
-        self.config.set('post_ingest_processor', self.post_ingest.text() or None)
-        self.config.set('post_import_processor', self.post_import.text() or None)
+        self.config.set('pre_ingest_processor', self.pre_ingest.text() or None, autosave=False)
+        self.config.set('post_ingest_processor', self.post_ingest.text() or None, autosave=False)
+        self.config.set('post_import_processor', self.post_import.text() or None, autosave=False)
+
+        # One config.json write for the whole form instead of one per field
+        self.config.flush()
 
         # Persist database-aware settings
         self.config.save_to_database(self.db)
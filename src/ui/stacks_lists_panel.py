@@ -404,21 +404,23 @@ class StacksListsPanel(QtWidgets.QWidget):
             stack_item.setIcon(0, get_icon('stack', size=18))
             self.tree.addTopLevelItem(stack_item)
             
-            # Load top-level lists for this stack (no parent)
-            lists = self.db.get_lists_by_stack(stack['stack_id'], parent_list_id=None)
-            for lst in lists:
-                list_item = self._create_list_item(lst, stack['stack_id'])
+            # Load the stack's list tree in one query, top-level lists first
+            children = self.db.get_all_lists_for_stack(stack['stack_id'])
+            for lst in children.get(None, []):
+                list_item = self._create_list_item(lst, stack['stack_id'], children)
                 stack_item.addChild(list_item)
             
             stack_item.setExpanded(True)
     
-    def _create_list_item(self, lst, stack_id):
+    def _create_list_item(self, lst, stack_id, children):
         """
         Recursively create list item with sub-lists.
         
         Args:
             lst (dict): List data
             stack_id (int): Parent stack ID
+            children (dict): parent list ID -> sub-lists, from
+                get_all_lists_for_stack
             
         Returns:
             QTreeWidgetItem: Tree item with children
@@ -427,10 +429,9 @@ class StacksListsPanel(QtWidgets.QWidget):
         list_item.setData(0, QtCore.Qt.UserRole, ('list', lst['list_id'], stack_id))
         list_item.setIcon(0, get_icon('list', size=16))
         
-        # Recursively load sub-lists
-        sub_lists = self.db.get_sub_lists(lst['list_id'])
-        for sub_lst in sub_lists:
-            sub_item = self._create_list_item(sub_lst, stack_id)
+        # Recursively add sub-lists
+        for sub_lst in children.get(lst['list_id'], []):
+            sub_item = self._create_list_item(sub_lst, stack_id, children)
             list_item.addChild(sub_item)
         
         return list_item
@@ -101,6 +101,12 @@ class StaXLogger(object):
     def exception(self, message, *args):
         self._log.error(message, *args, exc_info=True)
 
+    def log(self, level, message, *args, **kwargs):
+        self._log.log(level, message, *args, **kwargs)
+
+    def isEnabledFor(self, level):
+        return self._log.isEnabledFor(level)
+
     def separator(self):
         self._log.info("-" * 80)
 
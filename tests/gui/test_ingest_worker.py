@@ -9,6 +9,7 @@ class _FakeCore(object):
 
     def __init__(self, db, config):
         self.config = config
+        self.bulk_calls = []
         _FakeCore.instances.append(self)
 
     def ingest_file(self, source_path, target_list_id, copy_policy='soft'):
@@ -18,6 +19,16 @@ class _FakeCore(object):
             return {"success": False, "reason": "duplicate_skipped"}
         return {"success": True, "element_id": 1}
 
+    def ingest_files_bulk(self, source_paths, target_list_id, batch_size=100,
+                          progress_cb=None, copy_policy='soft'):
+        self.bulk_calls.append((list(source_paths), target_list_id, batch_size))
+        for index, source_path in enumerate(source_paths):
+            if progress_cb and progress_cb(index, len(source_paths), source_path) is False:
+                return
+            result = self.ingest_file(source_path, target_list_id, copy_policy)
+            result.setdefault("source_path", source_path)
+            yield result
+
 
 @pytest.mark.gui
 def test_ingest_worker_tallies_and_emits_finished(qtbot, monkeypatch):
@@ -68,3 +79,40 @@ def test_ingest_worker_passes_dict_config(qtbot, monkeypatch):
         worker.start()
     worker.wait(2000)
     assert _FakeCore.instances[0].config == {"k": "v"}
+
+
+@pytest.mark.gui
+def test_ingest_worker_delegates_to_bulk_ingest_per_list(qtbot, monkeypatch):
+    import ingest_worker
+    _FakeCore.instances = []
+    monkeypatch.setattr(ingest_worker, "IngestionCore", _FakeCore, raising=True)
+
+    jobs = [("/a/ok0.png", 1), ("/a/ok1.png", 1), ("/a/ok2.png", 2)]
+    worker = IngestWorker(db=object(), config={}, jobs=jobs, copy_policy="soft", batch_size=2)
+    seen = []
+    worker.progress.connect(lambda done, total, label: seen.append(done))
+    with qtbot.waitSignal(worker.ingest_finished, timeout=5000) as blocker:
+        worker.start()
+    worker.wait(2000)
+
+    assert blocker.args == [3, 0, 0]
+    assert _FakeCore.instances[0].bulk_calls == [
+        (["/a/ok0.png", "/a/ok1.png"], 1, 2), (["/a/ok2.png"], 2, 2)]
+    assert seen == [1, 2, 3]
+
+
+@pytest.mark.gui
+def test_ingest_worker_throttles_progress_signals(qtbot, monkeypatch):
+    import ingest_worker
+    monkeypatch.setattr(ingest_worker, "IngestionCore", _FakeCore, raising=True)
+
+    jobs = [("/a/ok{}.png".format(i), 1) for i in range(1000)]
+    worker = IngestWorker(db=object(), config={}, jobs=jobs, copy_policy="soft")
+    seen = []
+    worker.progress.connect(lambda done, total, label: seen.append(done))
+    with qtbot.waitSignal(worker.ingest_finished, timeout=5000):
+        worker.start()
+    worker.wait(2000)
+
+    assert seen[0] == 1 and seen[-1] == 1000
+    assert len(seen) <= 101
@@ -0,0 +1,34 @@
+import pytest
+
+from ui.dialogs import SelectListDialog
+from ui.ingest_library_dialog import IngestLibraryDialog
+
+
+@pytest.mark.gui
+def test_select_list_dialog_reload_picks_up_new_lists(qtbot, stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    stax_db.create_list(stack_id, "first")
+    dialog = SelectListDialog(stax_db)
+    qtbot.addWidget(dialog)
+    assert dialog.tree.topLevelItem(0).childCount() == 1
+
+    stax_db.create_list(stack_id, "second")
+    dialog.load_lists()
+    assert dialog.tree.topLevelItemCount() == 1
+    assert dialog.tree.topLevelItem(0).childCount() == 2
+
+
+@pytest.mark.gui
+def test_ingest_library_dialog_reset_clears_previous_scan(qtbot, stax_db, stax_config):
+    dialog = IngestLibraryDialog(stax_db, None, stax_config)
+    qtbot.addWidget(dialog)
+    dialog.folder_path_edit.setText("/library")
+    dialog.scanned_structure = {"S": {"path": "/library/S", "files": [], "lists": {}}}
+    dialog.ingest_btn.setEnabled(True)
+
+    dialog.reset()
+
+    assert dialog.folder_path_edit.text() == ""
+    assert dialog.scanned_structure is None
+    assert not dialog.ingest_btn.isEnabled()
+    assert dialog.recipe_combo.itemText(0) == "(none)"
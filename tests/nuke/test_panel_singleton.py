@@ -32,3 +32,37 @@ def test_get_stax_panel_is_exposed(mock_nuke):
 
     assert hasattr(nuke_launcher, "get_stax_panel")
     assert callable(nuke_launcher.get_stax_panel)
+
+
+@pytest.mark.nuke
+def test_show_stax_panel_registers_nuke_panel_once(mock_nuke, monkeypatch):
+    import types
+    import nuke_launcher
+    import stax_logger
+
+    # _log goes through the real StaXLogger wrapper, as it does in Nuke.
+    assert isinstance(nuke_launcher.logger, stax_logger.StaXLogger)
+
+    registered = []
+    added = []
+
+    class _Pane(object):
+        def addToPane(self):
+            added.append(self)
+
+    def _register(*args):
+        registered.append(args)
+        return _Pane()
+
+    fake_nukescripts = types.SimpleNamespace(
+        panels=types.SimpleNamespace(registerWidgetAsPanel=_register))
+    monkeypatch.setattr(nuke_launcher, "NUKE_MODE", True)
+    monkeypatch.setattr(nuke_launcher, "nukescripts", fake_nukescripts, raising=False)
+    monkeypatch.setattr(nuke_launcher, "_NUKE_PANEL", None)
+
+    first = nuke_launcher.show_stax_panel()
+    second = nuke_launcher.show_stax_panel()
+
+    assert first is second
+    assert len(registered) == 1
+    assert len(added) == 2
@@ -29,3 +29,17 @@ def test_wrong_password_still_rejected(stax_db):
     stax_db.create_user("bob", "correct-horse", role="user")
     assert stax_db.authenticate_user("bob", "correct-horse") is not None
     assert stax_db.authenticate_user("bob", "wrong") is None
+
+
+@pytest.mark.unit
+def test_user_lookups_never_return_the_password_hash(stax_db):
+    stax_db.create_user("alice", "pw", email="a@example.com")
+
+    user = stax_db.authenticate_user("alice", "pw")
+    assert user["username"] == "alice"
+    assert user["email"] == "a@example.com"
+    for found in (user, stax_db.get_user_by_username("alice"),
+                  stax_db.get_user_by_id(user["user_id"]),
+                  *stax_db.get_all_users()):
+        assert "password_hash" not in found
+        assert "role" in found
@@ -1,3 +1,6 @@
+import os
+import time
+
 import pytest
 
 from config import Config
@@ -12,9 +15,305 @@ def test_defaults_present_and_get_all_is_a_copy(stax_config):
     assert stax_config.get("__scratch__") is None
 
 
+@pytest.mark.unit
+def test_get_all_readonly_is_a_live_view(stax_config):
+    view = stax_config.get_all_readonly()
+    with pytest.raises(TypeError):
+        view["__scratch__"] = 1
+    stax_config.set("thumbnail_size", 128)
+    assert view["thumbnail_size"] == 128
+    stax_config.reset_to_defaults()
+    assert view["thumbnail_size"] == Config.DEFAULT_CONFIG["thumbnail_size"]
+
+
 @pytest.mark.unit
 def test_stock_db_env_override(tmp_path, monkeypatch):
     db = str(tmp_path / "shared.db")
     monkeypatch.setenv("STOCK_DB", db)
     cfg = Config(config_path=str(tmp_path / "config.json"))
     assert cfg.get("database_path") == db
+
+
+@pytest.mark.unit
+def test_deferred_set_is_written_on_flush(stax_config):
+    import json
+
+    stax_config.set("thumbnail_size", 64, autosave=False)
+    with open(stax_config.config_path) as f:
+        assert json.load(f)["thumbnail_size"] != 64
+
+    stax_config.flush()
+    with open(stax_config.config_path) as f:
+        assert json.load(f)["thumbnail_size"] == 64
+
+
+@pytest.mark.unit
+def test_save_load_roundtrip_without_orjson(tmp_path, monkeypatch):
+    import config as config_module
+
+    monkeypatch.setattr(config_module, "_HAS_ORJSON", False)
+    monkeypatch.delenv("STOCK_DB", raising=False)
+    path = str(tmp_path / "config.json")
+    cfg = Config(config_path=path)
+    cfg.set("api_ingest_roots", ["/a", "/b"])
+
+    reloaded = Config(config_path=path)
+    assert reloaded.get("api_ingest_roots") == ["/a", "/b"]
+
+
+@pytest.mark.unit
+def test_ensure_directories_creates_once_and_tolerates_existing(tmp_path, monkeypatch):
+    monkeypatch.delenv("STOCK_DB", raising=False)
+    cfg = Config(config_path=str(tmp_path / "config.json"))
+    cfg.config.update({
+        "database_path": str(tmp_path / "data" / "stax.db"),
+        "default_repository_path": str(tmp_path / "repo"),
+        "preview_dir": str(tmp_path / "previews"),
+        "previews_path": str(tmp_path / "previews"),
+    })
+
+    made = []
+    real_makedirs = os.makedirs
+    monkeypatch.setattr(os, "makedirs",
+                        lambda p, *a, **kw: made.append(p) or real_makedirs(p, *a, **kw))
+    cfg.ensure_directories()
+    cfg.ensure_directories()
+
+    assert (tmp_path / "data").is_dir() and (tmp_path / "previews").is_dir()
+    # previews_path == preview_dir is deduplicated, and the repeat call
+    # skips directories the first one already ensured.
+    assert made.count(os.path.normpath(str(tmp_path / "previews"))) == 1
+
+    cfg.config["preview_dir"] = str(tmp_path / "other_previews")
+    cfg.ensure_directories()
+    assert (tmp_path / "other_previews").is_dir()
+
+
+@pytest.mark.unit
+def test_stock_db_env_beats_saved_config(tmp_path, monkeypatch):
+    import json
+
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"database_path": "/saved/stax.db",
+                                "previews_path": "/saved/previews"}))
+    db = str(tmp_path / "shared" / "stax.db")
+    monkeypatch.setenv("STOCK_DB", db)
+    cfg = Config(config_path=str(path))
+    assert cfg.get("database_path") == db
+    assert cfg.get("previews_path") == os.path.join(str(tmp_path / "shared"), "previews")
+    assert cfg.get("preview_dir") == cfg.get("previews_path")
+
+
+@pytest.mark.unit
+def test_defaults_are_shared_read_only_and_not_mutated(tmp_path):
+    cfg = Config(config_path=str(tmp_path / "c.json"))
+    cfg.set("thumbnail_size", 999, autosave=False)
+
+    assert Config.DEFAULT_CONFIG["thumbnail_size"] != 999
+    with pytest.raises(TypeError):
+        Config.DEFAULT_CONFIG["thumbnail_size"] = 1
+    assert type(cfg.get_all()) is dict
+
+    cfg.reset_to_defaults()
+    assert cfg.get("thumbnail_size") == Config.DEFAULT_CONFIG["thumbnail_size"]
+
+
+@pytest.mark.unit
+def test_machine_name_is_detected_lazily_once(tmp_path, monkeypatch):
+    import socket
+
+    calls = []
+
+    def _hostname():
+        calls.append(1)
+        return "ws-042"
+
+    monkeypatch.setattr(socket, "gethostname", _hostname)
+    cfg = Config(config_path=str(tmp_path / "c.json"))
+    assert calls == []
+
+    assert cfg.get("machine_name") == "ws-042"
+    assert cfg.get("machine_name") == "ws-042"
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_batch_writes_config_once(tmp_path, monkeypatch):
+    cfg = Config(config_path=str(tmp_path / "c.json"))
+    cfg.get("preview_size")                          # creates the default file
+    saves = []
+    real_save = cfg.save
+    monkeypatch.setattr(cfg, "save", lambda: (saves.append(1), real_save()))
+
+    with cfg.batch():
+        cfg.set("preview_size", 256)
+        with cfg.batch():
+            cfg.update({"gif_fps": 12, "gif_size": 128})
+        assert saves == []
+
+    assert len(saves) == 1
+    assert Config(config_path=str(tmp_path / "c.json")).get("gif_fps") == 12
+
+
+@pytest.mark.unit
+def test_save_skips_write_when_content_unchanged(tmp_path):
+    path = str(tmp_path / "c.json")
+    cfg = Config(config_path=path)
+    cfg.set("preview_size", 300)
+    os.utime(path, (1000, 1000))
+
+    cfg.set("preview_size", 300)                     # same value again
+    assert os.path.getmtime(path) == 1000
+
+    reloaded = Config(config_path=path)
+    reloaded.save()
+    assert os.path.getmtime(path) == 1000
+
+    reloaded.set("preview_size", 301)
+    assert os.path.getmtime(path) != 1000
+
+
+@pytest.mark.unit
+def test_save_replaces_file_atomically_without_leftovers(tmp_path, monkeypatch):
+    path = str(tmp_path / "c.json")
+    cfg = Config(config_path=path)
+    replaced = []
+    real_replace = os.replace
+    monkeypatch.setattr(os, "replace",
+                        lambda src, dst: (replaced.append((src, dst)), real_replace(src, dst)))
+
+    cfg.set("preview_size", 320)
+
+    assert replaced and replaced[-1][1] == path
+    assert os.listdir(str(tmp_path)) == ["c.json"]
+    assert Config(config_path=path).get("preview_size") == 320
+
+
+@pytest.mark.unit
+def test_get_sees_every_kind_of_write(tmp_path):
+    cfg = Config(config_path=str(tmp_path / "c.json"))
+    assert cfg.get("preview_size") == Config.DEFAULT_CONFIG["preview_size"]
+
+    cfg.set("preview_size", 128, autosave=False)
+    assert cfg.get("preview_size") == 128
+    cfg.update({"preview_size": 64}, autosave=False)
+    assert cfg.get("preview_size") == 64
+    cfg.config["preview_size"] = 32
+    assert cfg.get("preview_size") == 32
+    cfg.reset_to_defaults()
+    assert cfg.get("preview_size") == Config.DEFAULT_CONFIG["preview_size"]
+
+
+@pytest.mark.unit
+def test_layered_get_does_not_cache_over_a_concurrent_write():
+    import threading
+    from config import _LayeredConfig
+
+    rebuilding = threading.Event()
+
+    class _SlowDefaults(dict):
+        def __getitem__(self, key):
+            rebuilding.set()
+            time.sleep(0.05)          # widen the rebuild window
+            return dict.__getitem__(self, key)
+
+    layered = _LayeredConfig({}, _SlowDefaults(preview_size=512))
+    writer = threading.Thread(
+        target=lambda: rebuilding.wait() and layered.__setitem__("preview_size", 64))
+    writer.start()
+    assert layered.get("preview_size") in (512, 64)
+    writer.join()
+    assert layered.get("preview_size") == 64
+
+
+@pytest.mark.unit
+def test_config_json_is_read_on_first_access(tmp_path, monkeypatch):
+    path = str(tmp_path / "c.json")
+    Config(config_path=path).set("preview_size", 222)
+
+    monkeypatch.setenv("STOCK_DB", str(tmp_path / "shared" / "stax.db"))
+    cfg = Config(config_path=path)
+    monkeypatch.delenv("STOCK_DB")
+    os.remove(path)
+    assert not os.path.exists(path)                 # nothing read or written yet
+
+    assert cfg.get("preview_size") == Config.DEFAULT_CONFIG["preview_size"]
+    assert cfg.get("database_path") == str(tmp_path / "shared" / "stax.db")
+    assert os.path.exists(path)
+
+
+@pytest.mark.unit
+def test_other_threads_wait_for_first_load(tmp_path, monkeypatch):
+    import threading
+
+    path = str(tmp_path / "c.json")
+    Config(config_path=path).set("preview_size", 222)
+    monkeypatch.setenv("STOCK_DB", str(tmp_path / "shared" / "stax.db"))
+    cfg = Config(config_path=path)
+
+    loading = threading.Event()
+    real_load = cfg.load
+
+    def _slow_load():
+        loading.set()
+        time.sleep(0.05)
+        real_load()
+    monkeypatch.setattr(cfg, "load", _slow_load)
+
+    seen = []
+    reader = threading.Thread(
+        target=lambda: loading.wait() and seen.append(cfg.get("database_path")))
+    reader.start()
+    assert cfg.get("preview_size") == 222
+    reader.join()
+    assert seen == [str(tmp_path / "shared" / "stax.db")]
+
+
+@pytest.mark.unit
+def test_resolve_path_roots_relative_paths_and_memoises(stax_config):
+    from config import _resolve
+
+    _resolve.cache_clear()
+    rel = stax_config.resolve_path("data/stax.db")
+    assert rel == os.path.normpath(os.path.join(stax_config.root_dir, "data", "stax.db"))
+    assert stax_config.resolve_path("data/stax.db") == rel
+    assert _resolve.cache_info().hits == 1
+    assert stax_config.resolve_path("") is None
+
+
+@pytest.mark.unit
+def test_single_config_class_carries_the_full_defaults():
+    import ast
+    import config as config_module
+
+    with open(config_module.__file__, "rb") as handle:
+        tree = ast.parse(handle.read())
+    defs = [node for node in tree.body
+            if isinstance(node, ast.ClassDef) and node.name == "Config"]
+    assert len(defs) == 1                    # nothing shadows the real class
+    for key in ("debug_mode", "gif_size", "preview_cache_size", "pagination_enabled"):
+        assert key in Config.DEFAULT_CONFIG
+    for method in ("resolve_path", "make_relative", "load_from_database"):
+        assert callable(getattr(Config, method))
+
+
+@pytest.mark.unit
+def test_instance_is_shared_per_config_path(tmp_path, monkeypatch):
+    import config as config_module
+
+    monkeypatch.setattr(config_module, "_INSTANCES", {})
+    path = str(tmp_path / "c.json")
+
+    first = Config.instance(path)
+    assert Config.instance(path) is first
+    assert Config.instance(str(tmp_path / "other.json")) is not first
+
+
+@pytest.mark.unit
+def test_make_relative_under_and_outside_root(stax_config, tmp_path):
+    inside = os.path.join(stax_config.root_dir, "previews", "a.png")
+    assert stax_config.make_relative(inside) == "previews/a.png"
+
+    outside = str(tmp_path / "elsewhere" / "b.png")
+    assert stax_config.make_relative(outside) == os.path.normpath(outside).replace("\\", "/")
+    assert stax_config.make_relative("") is None
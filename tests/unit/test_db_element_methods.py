@@ -37,3 +37,38 @@ def test_phash_roundtrip(stax_db):
     assert len(rows) == 1
     assert rows[0]["element_id"] == eid
     assert rows[0]["phash"] == "abcd1234"
+
+
+@pytest.mark.unit
+def test_get_elements_by_lists_groups_in_one_query(stax_db, monkeypatch):
+    import db_manager
+
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    a = stax_db.create_list(stack_id, "A")
+    b = stax_db.create_list(stack_id, "B")
+    empty = stax_db.create_list(stack_id, "Empty")
+    stax_db.create_element(a, "zeta", "2D")
+    stax_db.create_element(a, "alpha", "2D")
+    stax_db.create_element(b, "old", "2D", is_deprecated=1)
+    monkeypatch.setattr(db_manager, "_MAX_IN_PARAMS", 2)   # force chunking
+
+    grouped = stax_db.get_elements_by_lists([a, b, empty, a])
+    assert list(grouped) == [a, b, empty]
+    assert [e["name"] for e in grouped[a]] == ["alpha", "zeta"]
+    assert grouped[b] == [] and grouped[empty] == []
+    assert [e["name"] for e in
+            stax_db.get_elements_by_lists([b], include_deprecated=True)[b]] == ["old"]
+    assert stax_db.get_elements_by_lists([]) == {}
+
+
+@pytest.mark.unit
+def test_create_element_ignores_unknown_columns(stax_db):
+    import db_manager
+
+    lid, _eid = _seed(stax_db)
+    eid = stax_db.create_element(lid, "e2", "2D", comment="c", bogus="ignored")
+    elem = stax_db.get_element_by_id(eid)
+    assert elem["comment"] == "c"
+    assert "bogus" not in elem
+    stax_db.create_element(lid, "e3", "2D", comment="d")
+    assert db_manager._insert_element_sql.cache_info().hits >= 1
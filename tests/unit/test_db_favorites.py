@@ -23,3 +23,37 @@ def test_favorite_roundtrip_user_machine_order(stax_db):
 
     stax_db.remove_favorite(eid, "alice", "ws01")
     assert stax_db.is_favorite(eid, "alice", "ws01") is False
+
+
+@pytest.mark.unit
+def test_add_favorite_twice_is_one_insert(stax_db):
+    eid = _seed(stax_db)
+    statements = []
+    with stax_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+
+    assert stax_db.add_favorite(eid, "alice", "ws01") is not None
+    assert stax_db.add_favorite(eid, "alice", "ws01") is None
+    assert not [s for s in statements if s.startswith("SELECT")]
+    assert len(stax_db.get_favorites("alice", "ws01")) == 1
+
+
+@pytest.mark.unit
+def test_legacy_null_user_favorites_are_normalized(stax_db):
+    from db_migrations import _migrate_v29
+
+    eid = _seed(stax_db)
+    other = stax_db.create_element(stax_db.get_element_by_id(eid)["list_fk"], "dup", "2D")
+    with stax_db.get_connection() as conn:
+        conn.execute("INSERT INTO favorites (element_fk, user_name, machine_name) "
+                     "VALUES (?, NULL, 'ws01')", (eid,))
+        conn.execute("INSERT INTO favorites (element_fk, user_name, machine_name) "
+                     "VALUES (?, NULL, 'ws01'), (?, '', 'ws01')", (other, other))
+        _migrate_v29(conn)
+        plan = " ".join(str(r[-1]) for r in conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM favorites "
+            "WHERE element_fk = ? AND user_name = ? AND machine_name = ?", (eid, "", "ws01")))
+
+    assert stax_db.is_favorite(eid, None, "ws01") is True
+    assert len(stax_db.get_favorites(None, "ws01")) == 2
+    assert "USING INDEX" in plan
@@ -0,0 +1,28 @@
+import csv
+
+import pytest
+
+
+@pytest.mark.unit
+def test_export_history_to_csv_streams_all_rows(stax_db, tmp_path):
+    for i in range(3):
+        stax_db.log_ingestion("copy", "/src/{}.exr".format(i), "L", "success")
+    out = tmp_path / "history.csv"
+
+    stax_db.export_history_to_csv(str(out))
+
+    with open(str(out), newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert len(rows) == 3
+    assert {row["source_path"] for row in rows} == {"/src/0.exr", "/src/1.exr", "/src/2.exr"}
+
+    stax_db.export_history_to_csv(str(out), limit=2)
+    with open(str(out), newline="", encoding="utf-8") as handle:
+        assert len(list(csv.DictReader(handle))) == 2
+
+
+@pytest.mark.unit
+def test_export_empty_history_writes_nothing(stax_db, tmp_path):
+    out = tmp_path / "history.csv"
+    stax_db.export_history_to_csv(str(out))
+    assert not out.exists()
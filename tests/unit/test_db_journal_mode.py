@@ -6,3 +6,101 @@ def test_journal_mode_is_delete_not_wal(stax_db):
     with stax_db.get_connection() as conn:
         mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
     assert mode.lower() == "delete"
+
+
+@pytest.mark.unit
+def test_journal_mode_opt_in_wal_for_local_disks(tmp_path):
+    from db_manager import DatabaseManager
+
+    db = DatabaseManager(str(tmp_path / "wal.db"), use_file_lock=False, journal_mode="wal")
+    with db.get_connection() as conn:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+        mmap_size = conn.execute("PRAGMA mmap_size").fetchone()[0]
+    assert mode.lower() == "wal"
+    assert temp_store == 2          # MEMORY
+    assert mmap_size > 0            # local disk: memory-mapped reads
+
+
+@pytest.mark.unit
+def test_network_safe_default_does_not_mmap(stax_db):
+    with stax_db.get_connection() as conn:
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 0
+        # sqlite3.connect(timeout=60) already installs SQLite's busy handler.
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 60000
+
+
+@pytest.mark.unit
+def test_unknown_journal_mode_falls_back_to_delete(tmp_path):
+    from db_manager import DatabaseManager
+
+    db = DatabaseManager(str(tmp_path / "x.db"), use_file_lock=False,
+                         journal_mode="OFF; DROP TABLE elements")
+    assert db.journal_mode == "DELETE"
+
+
+@pytest.mark.unit
+def test_wal_mode_skips_external_file_lock(tmp_path):
+    from db_manager import DatabaseManager
+
+    db = DatabaseManager(str(tmp_path / "wal.db"), journal_mode="WAL")
+    assert db.use_file_lock is False
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO settings (key, value) VALUES ('k', 'v')")
+    assert not (tmp_path / "wal.db.lock").exists()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("journal_mode", ["DELETE", "WAL"])
+def test_new_databases_use_8k_pages(tmp_path, journal_mode):
+    from db_manager import DatabaseManager
+
+    db = DatabaseManager(str(tmp_path / "pages.db"), use_file_lock=False,
+                         journal_mode=journal_mode)
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+
+
+@pytest.mark.unit
+def test_compact_reclaims_free_pages(tmp_path):
+    from db_manager import DatabaseManager
+
+    db = DatabaseManager(str(tmp_path / "vac.db"), use_file_lock=False)
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2   # INCREMENTAL
+        conn.execute("CREATE TABLE junk (blob TEXT)")
+        conn.executemany("INSERT INTO junk VALUES (?)", [("x" * 4000,)] * 200)
+    with db.get_connection() as conn:
+        conn.execute("DROP TABLE junk")
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] > 0
+
+    db.compact()
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+@pytest.mark.unit
+def test_pooled_connections_enforce_foreign_keys(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    list_id = stax_db.create_list(stack_id, "L")
+    with stax_db.get_connection() as conn:
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    stax_db.delete_stack(stack_id)
+    assert stax_db.get_list_by_id(list_id) is None     # ON DELETE CASCADE ran
+
+
+@pytest.mark.unit
+def test_refused_wal_falls_back_to_truncate_and_file_lock(tmp_path):
+    import sqlite3
+    from db_manager import DatabaseManager
+
+    db = DatabaseManager(str(tmp_path / "wal.db"), journal_mode="WAL")
+    assert db.use_file_lock is False
+    refused = sqlite3.connect(":memory:")     # reports 'memory', never 'wal'
+    db._check_wal(refused)
+
+    assert db.journal_mode == "TRUNCATE"
+    assert db.use_file_lock is True
+    assert "mmap_size = 0" in db._pragma_sql
+    assert "TRUNCATE" in db._pragma_sql
@@ -0,0 +1,65 @@
+import pytest
+
+
+@pytest.mark.unit
+def test_list_hierarchy_is_top_down_and_one_query(stax_db):
+    stack_id = stax_db.create_stack("Stock", "/lib/stock")
+    top = stax_db.create_list(stack_id, "FX")
+    mid = stax_db.create_list(stack_id, "Fire", parent_list_id=top)
+    leaf = stax_db.create_list(stack_id, "Torches", parent_list_id=mid)
+
+    statements = []
+    with stax_db.get_connection(write=False) as conn:
+        conn.set_trace_callback(statements.append)
+    hierarchy = stax_db.get_list_hierarchy(leaf)
+
+    assert [h["list_id"] for h in hierarchy] == [top, mid, leaf]
+    assert "depth" not in hierarchy[0]
+    assert len([s for s in statements if "lists" in s]) == 1
+    assert stax_db.get_list_display_path(leaf) == "Stock / FX / Fire / Torches"
+
+
+@pytest.mark.unit
+def test_list_hierarchy_of_missing_list_is_empty(stax_db):
+    assert stax_db.get_list_hierarchy(999) == []
+    assert stax_db.get_list_hierarchy(None) == []
+
+
+@pytest.mark.unit
+def test_repository_path_is_resolved_in_one_query(stax_db):
+    import os
+
+    stack_id = stax_db.create_stack("Stock", "/lib/stock")
+    top = stax_db.create_list(stack_id, "FX")
+    leaf = stax_db.create_list(stack_id, "Fire", parent_list_id=top)
+
+    statements = []
+    with stax_db.get_connection(write=False) as conn:
+        conn.set_trace_callback(statements.append)
+    path = stax_db.get_repository_path_for_list(leaf)
+
+    assert path == os.path.normpath("/lib/stock/FX/Fire")
+    assert len(statements) == 1
+    assert stax_db.get_repository_path_for_list(999) is None
+    assert stax_db.get_list_display_path(999) == ""
+
+
+@pytest.mark.unit
+def test_all_lists_for_stack_groups_by_parent(stax_db):
+    stack_id = stax_db.create_stack("Stock", "/lib/stock")
+    other = stax_db.create_stack("Other", "/lib/other")
+    fx = stax_db.create_list(stack_id, "FX")
+    bg = stax_db.create_list(stack_id, "BG")
+    fire = stax_db.create_list(stack_id, "Fire", parent_list_id=fx)
+    dust = stax_db.create_list(stack_id, "Dust", parent_list_id=fx)
+    stax_db.create_list(other, "Elsewhere")
+
+    statements = []
+    with stax_db.get_connection(write=False) as conn:
+        conn.set_trace_callback(statements.append)
+    children = stax_db.get_all_lists_for_stack(stack_id)
+
+    assert [lst["list_id"] for lst in children[None]] == [bg, fx]
+    assert [lst["list_id"] for lst in children[fx]] == [dust, fire]
+    assert children.get(fire, []) == []
+    assert len([s for s in statements if "lists" in s]) == 1
@@ -31,8 +31,12 @@ def _install_legacy_playlist_items(path, rows):
         "INSERT INTO playlist_items (playlist_fk, element_fk, order_index) VALUES (?, ?, ?)",
         rows,
     )
+    # Real legacy files predate the migrated-schema stamp.
+    conn.execute("PRAGMA user_version = 0")
     conn.commit()
     conn.close()
+    # ...and are opened by a fresh process that has not prepared the path.
+    DatabaseManager._READY_PATHS.clear()
 
 
 def _install_legacy_playlist_items_no_timestamp(path, rows):
@@ -52,8 +56,12 @@ def _install_legacy_playlist_items_no_timestamp(path, rows):
         "INSERT INTO playlist_items (playlist_fk, element_fk, order_index) VALUES (?, ?, ?)",
         rows,
     )
+    # Real legacy files predate the migrated-schema stamp.
+    conn.execute("PRAGMA user_version = 0")
     conn.commit()
     conn.close()
+    # ...and are opened by a fresh process that has not prepared the path.
+    DatabaseManager._READY_PATHS.clear()
 
 
 @pytest.mark.unit
@@ -85,6 +93,7 @@ def test_migration6_raises_on_row_count_mismatch(tmp_path):
     src = conn.execute("SELECT COUNT(*) FROM playlist_items").fetchone()[0]
     conn.close()
     assert "playlist_items_old" not in tables
+    assert "playlist_items_new" not in tables   # DDL rolled back with the copy
     assert src == 2
 
 
@@ -22,3 +22,90 @@ def test_run_migrations_is_idempotent(stax_db):
         run_migrations(conn)  # second run
         version = conn.execute("SELECT version FROM schema_version").fetchone()[0]
     assert version == CURRENT_SCHEMA_VERSION
+
+
+@pytest.mark.unit
+def test_reopening_a_migrated_db_skips_migration_probes(stax_db, monkeypatch):
+    from db_manager import DatabaseManager
+    from db_migrations import CURRENT_SCHEMA_VERSION
+
+    with stax_db.get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == CURRENT_SCHEMA_VERSION
+
+    ran = []
+    monkeypatch.setattr(DatabaseManager, "_apply_migrations", lambda self: ran.append("legacy"))
+    monkeypatch.setattr(DatabaseManager, "_run_versioned_migrations",
+                        lambda self: ran.append("versioned"))
+    DatabaseManager._READY_PATHS.clear()     # as seen by a fresh process
+    DatabaseManager(stax_db.db_path, use_file_lock=False)
+    assert ran == []
+
+    # A schema_version behind the code still forces the migration passes.
+    with stax_db.get_connection() as conn:
+        conn.execute("UPDATE schema_version SET version = 1")
+    DatabaseManager._READY_PATHS.clear()     # as seen by a fresh process
+    DatabaseManager(stax_db.db_path, use_file_lock=False)
+    assert ran == ["legacy", "versioned"]
+
+
+@pytest.mark.unit
+def test_same_path_construction_skips_setup_within_a_process(stax_db, monkeypatch):
+    from db_manager import DatabaseManager
+
+    probed = []
+    monkeypatch.setattr(DatabaseManager, "_schema_is_current",
+                        lambda self: probed.append(self) or True)
+    second = DatabaseManager(stax_db.db_path, use_file_lock=False)
+    assert probed == []
+    assert second.db_path == stax_db.db_path
+    assert second.get_all_stacks() == []
+
+
+@pytest.mark.unit
+def test_lists_by_stack_uses_the_composite_index(stax_db):
+    with stax_db.get_connection() as conn:
+        names = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='lists'")}
+        plan = " ".join(str(r[-1]) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM lists "
+            "WHERE stack_fk = ? AND parent_list_fk IS NULL ORDER BY name", (1,)))
+    assert "idx_lists_stack_parent" in names
+    assert "idx_lists_stack" not in names
+    assert "idx_lists_stack_parent" in plan
+    assert "TEMP B-TREE" not in plan         # ORDER BY served by the index
+
+
+@pytest.mark.unit
+def test_element_and_playlist_orders_use_composite_indexes(stax_db):
+    with stax_db.get_connection() as conn:
+        names = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index'")}
+        elements_plan = " ".join(str(r[-1]) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM elements "
+            "WHERE list_fk = ? AND is_deprecated = 0 ORDER BY name", (1,)))
+        items_plan = " ".join(str(r[-1]) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM playlist_items "
+            "WHERE playlist_fk = ? ORDER BY order_index", (1,)))
+    assert {"idx_elements_list_dep_name", "idx_playlist_items_playlist_order"} <= names
+    assert not {"idx_elements_list", "idx_playlist_items_playlist"} & names
+    assert "idx_elements_list_dep_name" in elements_plan
+    assert "idx_playlist_items_playlist_order" in items_plan
+    assert "TEMP B-TREE" not in elements_plan + items_plan
+
+
+@pytest.mark.unit
+def test_favorites_and_sessions_use_composite_indexes(stax_db):
+    with stax_db.get_connection() as conn:
+        names = {r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index'")}
+        favorites_plan = " ".join(str(r[-1]) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM favorites "
+            "WHERE user_name = ? AND machine_name = ? ORDER BY created_at DESC", ("", "ws")))
+        session_plan = " ".join(str(r[-1]) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM user_sessions "
+            "WHERE user_fk = ? AND machine_name = ? AND is_active = 1 "
+            "ORDER BY login_time DESC LIMIT 1", (1, "ws")))
+    assert not {"idx_favorites_user", "idx_sessions_user"} & names
+    assert "idx_favorites_user_created" in favorites_plan
+    assert "idx_sessions_user_machine_active" in session_plan
+    assert "TEMP B-TREE" not in favorites_plan + session_plan
@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.fixture
+def playlist(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    list_id = stax_db.create_list(stack_id, "L")
+    element_ids = [stax_db.create_element(list_id, "e{}".format(i), "2D") for i in range(3)]
+    playlist_id = stax_db.create_playlist("P")
+    for element_id in element_ids:
+        stax_db.add_element_to_playlist(playlist_id, element_id)
+    return playlist_id, element_ids
+
+
+@pytest.mark.unit
+def test_reorder_playlist_items_is_one_batched_update(stax_db, playlist):
+    playlist_id, (a, b, c) = playlist
+    statements = []
+    with stax_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+
+    assert stax_db.reorder_playlist_items(playlist_id, [c, a, b]) is True
+
+    ordered = [e["element_id"] for e in stax_db.get_playlist_elements(playlist_id)]
+    assert ordered == [c, a, b]
+    assert statements.count("COMMIT") == 1
+
+
+@pytest.mark.unit
+def test_add_element_to_playlist_is_one_statement(stax_db, playlist):
+    playlist_id, (a, b, c) = playlist
+    items = stax_db.get_playlist_elements(playlist_id)
+    assert [e["order_index"] for e in items] == [1, 2, 3]
+
+    statements = []
+    with stax_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+
+    assert stax_db.add_element_to_playlist(playlist_id, a) is None
+    assert len([s for s in statements if "playlist_items" in s]) == 1
+
+    other = stax_db.create_playlist("Q")
+    assert stax_db.add_element_to_playlist(other, b, order_index=7) is not None
+    assert stax_db.add_element_to_playlist(other, c) is not None
+    ordered = stax_db.get_playlist_elements(other)
+    assert [(e["element_id"], e["order_index"]) for e in ordered] == [(b, 7), (c, 8)]
+
+
+@pytest.mark.unit
+def test_update_playlist_is_one_statement_and_can_clear_description(stax_db, playlist):
+    playlist_id, _elements = playlist
+    statements = []
+    with stax_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+
+    assert stax_db.update_playlist(playlist_id, name="Renamed", description="notes") is True
+    assert len([s for s in statements if s.startswith("UPDATE playlists")]) == 1
+    assert stax_db.update_playlist(playlist_id, name="Again") is True
+    row = stax_db.get_playlist_by_id(playlist_id)
+    assert (row["name"], row["description"]) == ("Again", "notes")
+
+    assert stax_db.update_playlist(playlist_id, description=None) is True
+    assert stax_db.get_playlist_by_id(playlist_id)["description"] is None
+    assert stax_db.update_playlist(playlist_id) is False
@@ -0,0 +1,35 @@
+import pytest
+
+
+@pytest.mark.unit
+def test_set_and_get_settings_in_bulk(stax_db):
+    assert stax_db.set_settings({"previews_path": "/p", "blender_path": "/b"}) is True
+    assert stax_db.get_settings(["previews_path", "blender_path", "missing"]) == {
+        "previews_path": "/p", "blender_path": "/b"}
+    assert stax_db.get_setting("blender_path") == "/b"
+    assert stax_db.get_settings([]) == {}
+
+
+@pytest.mark.unit
+def test_config_round_trips_db_settings(stax_db, stax_config, tmp_path):
+    from config import Config
+
+    stax_config.set("previews_path", str(tmp_path / "previews"), autosave=False)
+    stax_config.set("blender_path", "/opt/blender", autosave=False)
+    stax_config.save_to_database(stax_db)
+
+    fresh = Config(config_path=str(tmp_path / "fresh.json"))
+    fresh.load_from_database(stax_db)
+    assert fresh.get("previews_path") == str(tmp_path / "previews")
+    assert fresh.get("preview_dir") == str(tmp_path / "previews")
+    assert fresh.get("blender_path") == "/opt/blender"
+
+
+@pytest.mark.unit
+def test_settings_read_as_plain_dicts(stax_db):
+    stax_db.set_settings({"a": "1", "b": "2"})
+    assert stax_db.get_settings(["a", "missing"]) == {"a": "1"}
+    settings = stax_db.get_all_settings()
+    assert settings["a"] == "1" and settings["b"] == "2"
+    with stax_db.get_connection(write=False) as conn:
+        assert conn.row_factory is not None   # only the cursor was switched
@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def tagged(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    list_id = stax_db.create_list(stack_id, "L")
+    fire = stax_db.create_element(list_id, "fire", "2D", tags="fire, smoke, night")
+    smoke = stax_db.create_element(list_id, "smoke", "2D", tags="smoke")
+    return list_id, fire, smoke
+
+
+def _ids(rows):
+    return sorted(row["element_id"] for row in rows)
+
+
+@pytest.mark.unit
+def test_tag_search_matches_any_position_and_is_case_insensitive(stax_db, tagged):
+    _list_id, fire, smoke = tagged
+    assert _ids(stax_db.search_elements_by_tags(["NIGHT"])) == [fire]
+    assert _ids(stax_db.search_elements_by_tags(["smoke"])) == [fire, smoke]
+    assert _ids(stax_db.search_elements_by_tags(["smoke", "night"], match_all=True)) == [fire]
+    assert _ids(stax_db.search_elements_by_tags(["smoke", "Smoke"], match_all=True)) == [fire, smoke]
+    assert stax_db.search_elements_by_tags(["  "]) == []
+    assert stax_db.get_all_tags() == ["fire", "night", "smoke"]
+
+
+@pytest.mark.unit
+def test_tag_index_follows_every_write_path(stax_db, tagged):
+    list_id, fire, smoke = tagged
+    stax_db.remove_tag_from_element(fire, "night")
+    stax_db.add_tag_to_element(smoke, "dust")
+    with stax_db.get_connection() as conn:   # raw SQL, e.g. bundle import
+        conn.execute("INSERT INTO elements (list_fk, name, type, tags) "
+                     "VALUES (?, 'raw', '2D', 'rain,night')", (list_id,))
+    stax_db.delete_element(fire)
+
+    assert stax_db.get_all_tags() == ["dust", "night", "rain", "smoke"]
+    assert [r["name"] for r in stax_db.search_elements_by_tags(["night"])] == ["raw"]
+
+
+@pytest.mark.unit
+def test_tag_search_uses_the_tag_index(stax_db, tagged):
+    stax_db.get_all_tags()
+    with stax_db.get_connection() as conn:
+        plan = " ".join(str(r[-1]) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT element_fk FROM element_tags WHERE tag IN (?, ?)",
+            ("a", "b")))
+        assert conn.execute("SELECT COUNT(*) FROM element_tags_pending").fetchone()[0] == 0
+    assert "SEARCH element_tags" in plan
+
+
+@pytest.mark.unit
+def test_tag_helpers_update_in_one_statement(stax_db, tagged):
+    _list_id, fire, smoke = tagged
+    statements = []
+    with stax_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+
+    assert stax_db.add_tag_to_element(smoke, "Dust") is True
+    assert stax_db.add_tag_to_element(smoke, "smoke") is True   # already there
+    assert stax_db.remove_tag_from_element(fire, "smoke") is True
+    assert not [s for s in statements if s.startswith("SELECT tags")]
+
+    assert stax_db.get_element_by_id(smoke)["tags"] == "Dust, smoke"
+    assert stax_db.get_element_by_id(fire)["tags"] == "fire, night"
+    assert stax_db.add_tag_to_element(999, "x") is False
+    assert stax_db.remove_tag_from_element(999, "x") is False
+
+
+@pytest.mark.unit
+def test_tag_writes_index_without_queueing(stax_db, tagged):
+    list_id, fire, _smoke = tagged
+    stax_db.update_element(fire, tags="ash")
+    stax_db.create_element(list_id, "e", "2D", tags="ember")
+    with stax_db.get_connection(write=False) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM element_tags_pending").fetchone()[0] == 0
+        indexed = {r[0] for r in conn.execute("SELECT tag FROM element_tags")}
+    assert indexed == {"ash", "ember", "smoke"}
+
+
+@pytest.mark.unit
+def test_tag_reads_fall_back_to_index_when_refresh_cannot_write(stax_db, tagged, monkeypatch):
+    list_id, fire, _smoke = tagged
+    with stax_db.get_connection() as conn:   # queued by another client
+        conn.execute("INSERT INTO elements (list_fk, name, type, tags) "
+                     "VALUES (?, 'raw', '2D', 'rain')", (list_id,))
+
+    def _readonly(conn):
+        raise sqlite3.OperationalError("attempt to write a readonly database")
+    monkeypatch.setattr(stax_db, "_split_pending_tags", _readonly)
+
+    assert stax_db.get_all_tags() == ["fire", "night", "smoke"]
+    assert _ids(stax_db.search_elements_by_tags(["night"])) == [fire]
+
+
+@pytest.mark.unit
+def test_all_tags_keeps_case_variants(stax_db, tagged):
+    list_id, _fire, _smoke = tagged
+    stax_db.create_element(list_id, "b", "2D", tags="Fire")
+    assert stax_db.get_all_tags() == ["Fire", "fire", "night", "smoke"]
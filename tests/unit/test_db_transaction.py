@@ -0,0 +1,149 @@
+import sqlite3
+
+import pytest
+
+
+@pytest.mark.unit
+def test_transaction_reuses_one_connection(stax_db, monkeypatch):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    list_id = stax_db.create_list(stack_id, "L")
+
+    opened = []
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect",
+                        lambda *a, **kw: opened.append(a) or real_connect(*a, **kw))
+    with stax_db.transaction():
+        for i in range(5):
+            stax_db.create_element(list_id, "e{}".format(i), "2D")
+        # Reads inside the block see the uncommitted rows.
+        assert stax_db.get_elements_count(list_id) == 5
+    # The thread's pooled connection (opened by create_stack) is reused.
+    assert opened == []
+    assert stax_db.get_elements_count(list_id) == 5
+
+
+@pytest.mark.unit
+def test_transaction_rolls_back_on_error(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    list_id = stax_db.create_list(stack_id, "L")
+
+    with pytest.raises(ValueError):
+        with stax_db.transaction():
+            stax_db.create_element(list_id, "doomed", "2D")
+            raise ValueError("boom")
+    assert stax_db.get_elements_count(list_id) == 0
+
+
+@pytest.mark.unit
+def test_after_commit_is_deferred_inside_transaction(stax_db):
+    calls = []
+    stax_db.after_commit(lambda: calls.append("now"))
+    assert calls == ["now"]
+
+    with stax_db.transaction():
+        stax_db.after_commit(lambda: calls.append("later"))
+        assert calls == ["now"]
+    assert calls == ["now", "later"]
+
+    with pytest.raises(ValueError):
+        with stax_db.transaction():
+            stax_db.after_commit(lambda: calls.append("never"))
+            raise ValueError("boom")
+    assert calls == ["now", "later"]
+
+
+@pytest.mark.unit
+def test_connections_are_pooled_per_thread(stax_db, monkeypatch):
+    import threading
+
+    opened = []
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect",
+                        lambda *a, **kw: opened.append(a) or real_connect(*a, **kw))
+    stax_db.close()
+
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    list_id = stax_db.create_list(stack_id, "L")
+    stax_db.get_list_by_id(list_id)
+    assert len(opened) == 2                  # one read-write + one read-only
+
+    worker = threading.Thread(target=stax_db.get_list_by_id, args=(list_id,))
+    worker.start()
+    worker.join()
+    assert len(opened) == 3                  # other threads get their own
+
+    stax_db.close()
+    assert stax_db.get_list_by_id(list_id)["name"] == "L"
+    assert len(opened) == 4
+
+
+@pytest.mark.unit
+def test_reads_use_a_read_only_connection(stax_db):
+    with stax_db.get_connection(write=False) as conn:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("INSERT INTO settings (key, value) VALUES ('k', 'v')")
+    assert stax_db._pool.ro_conn is not stax_db._pool.conn
+    with stax_db.get_connection() as conn:
+        conn.execute("INSERT INTO settings (key, value) VALUES ('k', 'v')")
+    assert stax_db.get_settings(["k"]) == {"k": "v"}
+
+
+@pytest.mark.unit
+def test_pooled_connection_is_dropped_after_sqlite_error(stax_db):
+    with pytest.raises(sqlite3.Error):
+        with stax_db.get_connection() as conn:
+            conn.execute("SELECT * FROM no_such_table")
+    assert getattr(stax_db._pool, "conn", None) is None
+    assert stax_db.get_all_stacks() == []
+
+
+@pytest.mark.unit
+def test_busy_database_raises_runtime_error_without_python_retries(stax_db, monkeypatch):
+    stax_db.close()
+    real_connect = sqlite3.connect
+    # A 0s busy timeout makes SQLite give up immediately on the held lock.
+    monkeypatch.setattr(sqlite3, "connect",
+                        lambda *a, **kw: real_connect(*a, **dict(kw, timeout=0)))
+
+    blocker = real_connect(stax_db.db_path)
+    blocker.execute("BEGIN EXCLUSIVE")
+    try:
+        with pytest.raises(RuntimeError, match="locked"):
+            stax_db.create_stack("S", "/tmp/S")
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert stax_db.create_stack("S", "/tmp/S")
+
+
+@pytest.mark.unit
+def test_optimize_runs_periodically_and_close_optimizes_and_compacts(stax_db, monkeypatch):
+    statements = []
+    with stax_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+    monkeypatch.setattr(type(stax_db), "_OPTIMIZE_EVERY", 2)
+
+    stax_db.create_stack("A", "/tmp/A")
+    stax_db.create_stack("B", "/tmp/B")
+    assert statements.count("PRAGMA optimize") == 1
+
+    before_close = len(statements)
+    stax_db.close()
+    on_close = statements[before_close:]
+    assert "PRAGMA optimize" in on_close
+    assert any(s.startswith("PRAGMA incremental_vacuum") for s in on_close)
+
+
+@pytest.mark.unit
+def test_writers_begin_immediate_and_readers_stay_in_autocommit(stax_db):
+    statements = []
+    with stax_db.get_connection() as conn:
+        assert conn.isolation_level == "IMMEDIATE"
+        conn.set_trace_callback(statements.append)
+    stax_db.create_stack("S", "/tmp/S")
+    assert "BEGIN IMMEDIATE" in statements
+
+    with stax_db.get_connection(write=False) as conn:
+        assert conn.isolation_level is None
+        conn.execute("SELECT 1")
+        assert not conn.in_transaction
@@ -0,0 +1,141 @@
+"""Stack/list, hierarchy and tag reads are cached and invalidated by local writes."""
+import pytest
+
+
+def _count_selects(db):
+    statements = []
+    with db.get_connection(write=False) as conn:
+        conn.set_trace_callback(statements.append)
+    return lambda table: sum(1 for s in statements
+                             if s.startswith("SELECT * FROM " + table))
+
+
+@pytest.mark.unit
+def test_repeat_stack_and_list_reads_hit_the_cache(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    stax_db.create_list(stack_id, "L")
+    selects = _count_selects(stax_db)
+
+    for _ in range(3):
+        assert [s["name"] for s in stax_db.get_all_stacks()] == ["S"]
+        assert stax_db.get_stack_by_id(stack_id)["path"] == "/tmp/S"
+        assert [l["name"] for l in stax_db.get_lists_by_stack(stack_id)] == ["L"]
+    assert selects("stacks") == 1
+    assert selects("lists") == 1
+
+
+@pytest.mark.unit
+def test_writes_invalidate_and_callers_cannot_corrupt_the_cache(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    stax_db.get_all_stacks()[0]["name"] = "mutated"
+    assert stax_db.get_stack_by_id(stack_id)["name"] == "S"
+
+    stax_db.get_lists_by_stack(stack_id)
+    list_id = stax_db.create_list(stack_id, "L")
+    assert [l["list_id"] for l in stax_db.get_lists_by_stack(stack_id)] == [list_id]
+
+    stax_db.delete_stack(stack_id)
+    assert stax_db.get_all_stacks() == []
+    assert stax_db.get_lists_by_stack(stack_id) == []
+
+
+@pytest.mark.unit
+def test_cache_expires_after_ttl(stax_db, monkeypatch):
+    import db_manager
+
+    clock = [1000.0]
+    monkeypatch.setattr(db_manager.time, "monotonic", lambda: clock[0])
+    stax_db.get_all_stacks()
+    with stax_db.get_connection() as conn:   # e.g. another machine's write
+        conn.execute("INSERT INTO stacks (name, path) VALUES ('X', '/tmp/X')")
+    assert stax_db.get_all_stacks() == []
+
+    clock[0] += stax_db._TREE_CACHE_TTL + 0.1
+    assert [s["name"] for s in stax_db.get_all_stacks()] == ["X"]
+
+
+@pytest.mark.unit
+def test_list_hierarchy_is_cached_until_lists_change(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    top = stax_db.create_list(stack_id, "FX")
+    leaf = stax_db.create_list(stack_id, "Fire", parent_list_id=top)
+    statements = []
+    with stax_db.get_connection(write=False) as conn:
+        conn.set_trace_callback(statements.append)
+
+    for _ in range(3):
+        assert [h["list_id"] for h in stax_db.get_list_hierarchy(leaf)] == [top, leaf]
+    stax_db.get_list_hierarchy(leaf)[0]["name"] = "mutated"
+    assert stax_db.get_list_hierarchy(leaf)[0]["name"] == "FX"
+    assert len([s for s in statements if "lists" in s]) == 1
+
+    stax_db.delete_list(top)
+    assert stax_db.get_list_hierarchy(leaf) == []
+
+
+@pytest.mark.unit
+def test_all_tags_are_cached_until_a_tag_write(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    list_id = stax_db.create_list(stack_id, "L")
+    element_id = stax_db.create_element(list_id, "e", "2D", tags="fire")
+    assert stax_db.get_all_tags() == ["fire"]
+    statements = []
+    with stax_db.get_connection(write=False) as conn:
+        conn.set_trace_callback(statements.append)
+
+    assert stax_db.get_all_tags() == ["fire"]
+    assert statements == []
+
+    stax_db.add_tag_to_element(element_id, "smoke")
+    assert stax_db.get_all_tags() == ["fire", "smoke"]
+    stax_db.update_element(element_id, tags="rain")
+    assert stax_db.get_all_tags() == ["rain"]
+    stax_db.delete_element(element_id)
+    assert stax_db.get_all_tags() == []
+
+
+@pytest.mark.unit
+def test_transaction_reads_bypass_the_cache_and_invalidate_on_commit(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    assert stax_db.get_lists_by_stack(stack_id) == []
+
+    with stax_db.transaction():
+        list_id = stax_db.create_list(stack_id, "L")
+        assert [l["list_id"] for l in stax_db.get_lists_by_stack(stack_id)] == [list_id]
+        assert stax_db._lists_cache[(stack_id, None)][1] == []   # not refilled pre-commit
+    assert [l["list_id"] for l in stax_db.get_lists_by_stack(stack_id)] == [list_id]
+
+    with pytest.raises(RuntimeError):
+        with stax_db.transaction():
+            stax_db.create_list(stack_id, "rolled back")
+            stax_db.get_lists_by_stack(stack_id)
+            raise RuntimeError("abort")
+    assert [l["name"] for l in stax_db.get_lists_by_stack(stack_id)] == ["L"]
+
+
+@pytest.mark.unit
+def test_read_racing_an_invalidation_is_not_cached(stax_db):
+    stack_id = stax_db.create_stack("S", "/tmp/S")
+    real_get_connection = stax_db.get_connection
+
+    def _write_lands_mid_read(write=True):
+        stax_db._invalidate_tree_cache()   # another thread's commit
+        return real_get_connection(write=write)
+    stax_db.get_connection = _write_lands_mid_read
+    try:
+        stax_db.get_lists_by_stack(stack_id)
+    finally:
+        del stax_db.get_connection
+    assert (stack_id, None) not in stax_db._lists_cache
+
+
+@pytest.mark.unit
+def test_stack_by_id_misses_fall_back_to_the_table(stax_db):
+    assert stax_db.get_all_stacks() == []
+    with stax_db.get_connection() as conn:   # another client, within the TTL
+        stack_id = conn.execute(
+            "INSERT INTO stacks (name, path) VALUES ('X', '/tmp/X')").lastrowid
+
+    assert stax_db.get_stack_by_id(stack_id)["name"] == "X"
+    assert [s["name"] for s in stax_db.get_all_stacks()] == ["X"]   # cache dropped
+    assert stax_db.get_stack_by_id(stack_id + 1) is None
@@ -50,3 +50,21 @@ def test_newer_bundle_updates(stax_db, tmp_path):
     assert res == {"added": 0, "updated": 1, "skipped": 0}
     dst_el = [e for e in stax_db.get_elements_by_list(dst) if e["name"] == "plate_a"][0]
     assert dst_el["comment"] == "v2"
+
+
+@pytest.mark.unit
+def test_imported_tags_are_indexed_and_listed(stax_db, tmp_path):
+    src = _seed_source(stax_db)
+    dst = _make_target_list(stax_db)
+    stax_db.update_element(1, tags="fire, smoke")
+    from sync.metadata_bundle import export_list_bundle, import_bundle
+    bundle = str(tmp_path / "b.staxbundle")
+    export_list_bundle(stax_db, src, bundle)
+    stax_db.delete_element(1)
+    assert stax_db.get_all_tags() == []          # cached before the import
+
+    import_bundle(stax_db, bundle, dst)
+
+    with stax_db.get_connection(write=False) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM element_tags_pending").fetchone()[0] == 0
+    assert stax_db.get_all_tags() == ["fire", "smoke"]
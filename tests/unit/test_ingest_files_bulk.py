@@ -0,0 +1,99 @@
+import pytest
+
+from ingestion_core import IngestionCore
+
+
+def _make_files(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / "asset_{}.txt".format(chr(ord("a") + i))
+        path.write_text("x")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def bulk_core(stax_db, tmp_path):
+    cfg = {"previews_path": str(tmp_path / "prev"), "generate_previews": False, "dedup_enabled": False}
+    return IngestionCore(stax_db, cfg)
+
+
+@pytest.mark.unit
+def test_bulk_ingest_commits_once_per_batch(stax_db, bulk_core, tmp_path, monkeypatch):
+    stack_id = stax_db.create_stack("S", str(tmp_path))
+    list_id = stax_db.create_list(stack_id, "L")
+    files = _make_files(tmp_path, 5)
+
+    opened = []
+    real_transaction = stax_db.transaction
+    monkeypatch.setattr(stax_db, "transaction",
+                        lambda: opened.append(1) or real_transaction())
+    seen = []
+    results = list(bulk_core.ingest_files_bulk(
+        files, list_id, batch_size=2,
+        progress_cb=lambda i, total, path: seen.append((i, total))))
+
+    assert [r["success"] for r in results] == [True] * 5
+    assert [r["source_path"] for r in results] == files
+    assert len(opened) == 3
+    assert seen == [(i, 5) for i in range(5)]
+    assert stax_db.get_elements_count(list_id) == 5
+
+
+@pytest.mark.unit
+def test_bulk_ingest_stops_when_progress_cb_returns_false(stax_db, bulk_core, tmp_path):
+    stack_id = stax_db.create_stack("S", str(tmp_path))
+    list_id = stax_db.create_list(stack_id, "L")
+    files = _make_files(tmp_path, 4)
+
+    results = list(bulk_core.ingest_files_bulk(
+        files, list_id, batch_size=10,
+        progress_cb=lambda i, total, path: i < 2))
+
+    assert len(results) == 2
+    assert stax_db.get_elements_count(list_id) == 2
+
+
+@pytest.mark.unit
+def test_bulk_ingest_copies_files_outside_the_transaction(stax_db, bulk_core, tmp_path, monkeypatch):
+    stack_id = stax_db.create_stack("S", str(tmp_path / "repo"))
+    list_id = stax_db.create_list(stack_id, "L")
+    files = _make_files(tmp_path, 3)
+
+    events = []
+    real_transaction = stax_db.transaction
+
+    class _Tracked(object):
+        def __enter__(self):
+            events.append("begin")
+            self._tx = real_transaction()
+            return self._tx.__enter__()
+
+        def __exit__(self, *exc):
+            events.append("commit")
+            return self._tx.__exit__(*exc)
+
+    real_copy = bulk_core._copy_files
+    monkeypatch.setattr(stax_db, "transaction", _Tracked)
+    monkeypatch.setattr(bulk_core, "_copy_files",
+                        lambda src, dst: events.append("copy") or real_copy(src, dst))
+
+    results = list(bulk_core.ingest_files_bulk(files, list_id, batch_size=3,
+                                               copy_policy="hard"))
+
+    assert [r["success"] for r in results] == [True] * 3
+    assert events == ["copy", "copy", "copy", "begin", "commit"]
+
+
+@pytest.mark.unit
+def test_bulk_ingest_runs_post_hook_after_commit(stax_db, bulk_core, tmp_path):
+    stack_id = stax_db.create_stack("S", str(tmp_path))
+    list_id = stax_db.create_list(stack_id, "L")
+    files = _make_files(tmp_path, 2)
+
+    seen = []
+    post_hook = lambda info: seen.append((info["element_id"], stax_db._in_transaction()))
+    results = list(bulk_core.ingest_files_bulk(files, list_id, batch_size=2,
+                                               post_hook=post_hook))
+
+    assert seen == [(r["element_id"], False) for r in results]
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from ingestion_core import IngestionCore
+
+
+class _NoDB(object):
+    pass
+
+
+def _frames(tmp_path, count):
+    src = tmp_path / "src"
+    src.mkdir()
+    paths = []
+    for i in range(count):
+        path = src / "shot.{:04d}.exr".format(1001 + i)
+        path.write_bytes(b"frame%d" % i)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("workers", [1, 4])
+def test_copy_files_copies_every_frame(tmp_path, workers):
+    core = IngestionCore(_NoDB(), {"previews_path": str(tmp_path / "prev"),
+                                   "copy_workers": workers})
+    frames = _frames(tmp_path, 6)
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    core._copy_files(frames, str(dest))
+
+    assert sorted(os.listdir(str(dest))) == sorted(os.path.basename(f) for f in frames)
+    assert (dest / "shot.1003.exr").read_bytes() == b"frame2"
+
+
+@pytest.mark.unit
+def test_copy_files_reraises_copy_errors(tmp_path):
+    core = IngestionCore(_NoDB(), {"previews_path": str(tmp_path / "prev")})
+    frames = _frames(tmp_path, 3) + [str(tmp_path / "missing.exr")]
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    with pytest.raises(IOError):
+        core._copy_files(frames, str(dest))
@@ -35,3 +35,31 @@ def test_verify_password_accepts_legacy_hash():
     legacy = hashlib.sha256("admin".encode("utf-8")).hexdigest()
     assert verify_password(legacy, "admin") is True
     assert verify_password(legacy, "wrong") is False
+
+
+@pytest.mark.unit
+def test_needs_rehash_flags_legacy_and_weaker_hashes():
+    import hashlib
+    from db_manager import needs_rehash, _PBKDF2_ITERATIONS
+
+    assert needs_rehash(hashlib.sha256(b"admin").hexdigest()) is True
+    assert needs_rehash(hash_password("admin", iterations=1000)) is True
+    assert needs_rehash(hash_password("admin", iterations=_PBKDF2_ITERATIONS)) is False
+    assert needs_rehash("garbage") is False
+
+
+@pytest.mark.unit
+def test_login_upgrades_a_low_iteration_hash(stax_db):
+    from db_manager import needs_rehash
+
+    stax_db.create_user("alice", "pw")
+    with stax_db.get_connection() as conn:
+        conn.execute("UPDATE users SET password_hash = ? WHERE username = 'alice'",
+                     (hash_password("pw", iterations=1000),))
+
+    assert stax_db.authenticate_user("alice", "pw") is not None
+    with stax_db.get_connection() as conn:
+        stored = conn.execute(
+            "SELECT password_hash FROM users WHERE username = 'alice'").fetchone()[0]
+    assert needs_rehash(stored) is False
+    assert stax_db.authenticate_user("alice", "pw") is not None
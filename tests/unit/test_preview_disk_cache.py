@@ -0,0 +1,66 @@
+"""
+Tests for the on-disk preview cache (src/preview_disk_cache.py).
+"""
+
+import os
+
+import pytest
+
+from src import preview_disk_cache as pdc
+
+
+def _write(path, data):
+    with open(path, 'wb') as handle:
+        handle.write(data)
+    return path
+
+
+@pytest.mark.unit
+def test_content_key_stable_and_param_sensitive(tmp_path):
+    src = _write(str(tmp_path / 'a.exr'), b'x' * 2048)
+    copy = _write(str(tmp_path / 'b.exr'), b'x' * 2048)
+
+    key = pdc.content_key(src, 'thumbnail', 512)
+    assert key == pdc.content_key(src, 'thumbnail', 512)
+    assert key == pdc.content_key(copy, 'thumbnail', 512)
+    assert key != pdc.content_key(src, 'thumbnail', 256)
+    assert pdc.content_key(str(tmp_path / 'missing.exr'), 'thumbnail') is None
+
+
+@pytest.mark.unit
+def test_store_then_fetch_round_trip(tmp_path):
+    cache_dir = pdc.cache_dir_for(str(tmp_path))
+    produced = _write(str(tmp_path / 'thumb.png'), b'png-bytes')
+    key = pdc.content_key(produced, 'thumbnail')
+
+    dest = str(tmp_path / 'other_thumb.png')
+    assert pdc.fetch(cache_dir, key, dest) is False
+
+    pdc.store(cache_dir, key, produced)
+    assert pdc.fetch(cache_dir, key, dest) is True
+    with open(dest, 'rb') as handle:
+        assert handle.read() == b'png-bytes'
+    assert pdc.fetch(cache_dir, None, dest) is False
+
+
+@pytest.mark.unit
+def test_evict_removes_least_recently_used(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    os.makedirs(cache_dir)
+    megabyte = b'\0' * (1024 * 1024)
+    for age, name in enumerate(['new.png', 'mid.png', 'old.png']):
+        path = _write(os.path.join(cache_dir, name), megabyte)
+        os.utime(path, (1000 - age * 100, 1000 - age * 100))
+
+    pdc.evict(cache_dir, 2)
+
+    assert sorted(os.listdir(cache_dir)) == ['mid.png', 'new.png']
+
+
+@pytest.mark.unit
+def test_store_reports_bytes_added(tmp_path):
+    cache_dir = pdc.cache_dir_for(str(tmp_path))
+    produced = _write(str(tmp_path / 'thumb.png'), b'12345')
+    assert pdc.store(cache_dir, 'k', produced) == 5
+    assert pdc.store(cache_dir, None, produced) == 0
+    assert pdc.store(cache_dir, 'k', str(tmp_path / 'missing.png')) == 0
@@ -82,3 +82,36 @@ def test_single_image_thumbnail_routes_through_ffmpeg_not_pil(monkeypatch):
     )
     worker._process(job)
     assert any(c[0] == "thumb" and c[1] == "/imgs/pic.dpx" for c in fake.calls)
+
+
+@pytest.mark.unit
+def test_disk_cache_hit_is_not_stored_again_and_stores_retrim(monkeypatch, tmp_path):
+    from src import preview_disk_cache
+
+    fake = _FakeFFmpeg()
+    monkeypatch.setattr(preview_worker, "get_ffmpeg", lambda: fake, raising=False)
+    hits = []
+    stored = []
+    evicted = []
+    monkeypatch.setattr(preview_disk_cache, "content_key", lambda *a: "key")
+    monkeypatch.setattr(preview_disk_cache, "fetch", lambda d, k, dest: bool(hits.pop()))
+    monkeypatch.setattr(preview_disk_cache, "store",
+                        lambda d, k, path: stored.append(path) or 60 * 1024)
+    monkeypatch.setattr(preview_disk_cache, "evict", lambda d, mb: evicted.append(mb))
+
+    worker = PreviewWorker()
+    job = PreviewJob(
+        element_id=1,
+        source_path="/imgs/pic.dpx",
+        output_dir=str(tmp_path),
+        asset_type="3D",
+        config={"generate_previews": True, "preview_disk_cache_mb": 1},
+        thumb_path=str(tmp_path / "1_x.png"),
+        is_sequence=False,
+    )
+    hits[:] = [True, False, False]          # popped from the end: miss, miss, hit
+    for _ in range(3):
+        worker._process(job)
+
+    assert len(stored) == 2                  # the hit did not write back
+    assert evicted == [1, 1]                 # first use, then after 100 KB (1/10 of 1 MB)
@@ -11,6 +11,7 @@ import os
 
 import pytest
 
+import qss_loader
 from qss_loader import icons_dir, read_stylesheet, resolve_icon_urls
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -39,7 +40,9 @@ def test_every_icon_referenced_by_the_stylesheet_ships_with_the_app():
     assert not missing, "style.qss references missing icons: {}".format(missing)
 
 
-def test_read_stylesheet_resolves_everything_and_decodes_utf8():
+def test_read_stylesheet_resolves_everything_and_decodes_utf8(monkeypatch):
+    monkeypatch.setattr(qss_loader, "_ICONS_COMPILED", False)
+    monkeypatch.setattr(qss_loader, "_STYLESHEET_CACHE", {})
     qss = read_stylesheet(STYLE_QSS)
     # style.qss's section comments are UTF-8 box drawing; a cp1252 read raises.
     assert "─" in qss or "═" in qss
@@ -57,3 +60,30 @@ def test_read_stylesheet_resolves_everything_and_decodes_utf8():
 )
 def test_new_chrome_icons_exist(icon):
     assert os.path.exists(os.path.join(icons_dir(), icon))
+
+
+def test_read_stylesheet_is_cached_until_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(qss_loader, "_ICONS_COMPILED", False)
+    qss = tmp_path / "style.qss"
+    qss.write_text("QX { image: url(:/icons/chevron_down.svg); }", encoding="utf-8")
+
+    first = read_stylesheet(str(qss))
+    assert read_stylesheet(str(qss)) is first
+
+    qss.write_text("QY { color: red; }", encoding="utf-8")
+    stat = os.stat(str(qss))
+    os.utime(str(qss), (stat.st_atime, stat.st_mtime + 5))
+    assert read_stylesheet(str(qss)) == "QY { color: red; }"
+
+
+def test_read_stylesheet_keeps_resource_urls_when_icons_are_compiled(monkeypatch):
+    monkeypatch.setattr(qss_loader, "_ICONS_COMPILED", True)
+    monkeypatch.setattr(qss_loader, "_STYLESHEET_CACHE", {})
+    assert ":/icons/" in read_stylesheet(STYLE_QSS)
+
+
+def test_qrc_lists_every_shipped_icon():
+    with open(os.path.join(PROJECT_ROOT, "resources", "stax.qrc"), "r", encoding="utf-8") as handle:
+        qrc = handle.read()
+    missing = [n for n in os.listdir(icons_dir()) if "<file>icons/{}</file>".format(n) not in qrc]
+    assert not missing, "resources/stax.qrc is missing: {}".format(missing)
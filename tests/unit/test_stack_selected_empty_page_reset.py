@@ -90,6 +90,9 @@ class _FakeDBStackGone(object):
     def get_elements_by_list(self, list_id):
         return []
 
+    def get_elements_by_lists(self, list_ids):
+        return {list_id: [] for list_id in list_ids}
+
     def get_stack_by_id(self, stack_id):
         return None
 
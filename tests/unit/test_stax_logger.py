@@ -64,3 +64,20 @@ def test_forwards_variadic_logging_args(monkeypatch, tmp_path):
         h.flush()
     text = (tmp_path / "stax.log").read_text(encoding="utf-8")
     assert "item=shot count=7" in text
+
+
+@pytest.mark.unit
+def test_log_forwards_exc_info(monkeypatch, tmp_path):
+    # nuke_launcher._log passes exc_info= through on its error paths.
+    monkeypatch.setattr(stax_logger, "get_log_dir", lambda: str(tmp_path))
+    log = stax_logger.init_logger()
+    log.log(logging.DEBUG, "quiet", exc_info=False)
+    try:
+        raise ValueError("panel boom")
+    except ValueError:
+        log.log(logging.ERROR, "Failed to open panel", exc_info=True)
+    for h in logging.getLogger("stax").handlers:
+        h.flush()
+    text = (tmp_path / "stax.log").read_text(encoding="utf-8")
+    assert "Failed to open panel" in text
+    assert "ValueError: panel boom" in text
@@ -206,6 +206,16 @@ if (-not (Test-Path $setup_freeze)) {
     Exit-WithCode 1
 }
 
+# Compile resources/stax.qrc so style.qss icons are served from memory.
+$rcc_exe = "$stax_root\.venv\Scripts\pyside2-rcc.exe"
+if (Test-Path $rcc_exe) {
+    Write-Color -Text ">>> ", "Compiling Qt icon resources ..." -Color Green, White
+    & $rcc_exe "$stax_root\resources\stax.qrc" -o "$stax_root\src\stax_resources_rc.py"
+} else {
+    Write-Color -Text "--- ", "pyside2-rcc not found; stylesheet icons will load from resources\icons" `
+                -Color Gray, Yellow
+}
+
 Write-Color -Text ">>> ", "Building StaX with cx_Freeze ..." -Color Green, White
 $startTime = [int][double]::Parse((Get-Date -UFormat %s))
 
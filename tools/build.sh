@@ -54,6 +54,14 @@ build_out="$stax_root/build/StaX-$version"
 rm -rf "$build_out"
 mkdir -p "$build_out"
 
+rcc_bin="$stax_root/.venv/bin/pyside2-rcc"
+if [ -x "$rcc_bin" ]; then
+	echo ">>> Compiling Qt icon resources ..."
+	"$rcc_bin" resources/stax.qrc -o src/stax_resources_rc.py
+else
+	echo "--- pyside2-rcc not found; stylesheet icons will load from resources/icons"
+fi
+
 echo ">>> Building StaX with cx_Freeze ..."
 STAX_BUILD_OUT="$build_out" "$python_bin" setup_freeze.py build_exe
 